@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication
+
+EVENT_TICKET_SALT = 'accounts.authentication.event-ticket'
+
+
+def issue_event_ticket(user):
+    """Signed ticket naming the user, accepted by EventTicketAuthentication for EVENTS_TICKET_MAX_AGE seconds"""
+    return signing.dumps({'user': user.pk}, salt=EVENT_TICKET_SALT)
+
+
+class EventTicketAuthentication(BaseAuthentication):
+    """Short-lived ``ticket`` query parameter, for clients such as EventSource that cannot set headers
+
+    Only the event stream accepts it, so a ticket leaked through a URL in a log
+    cannot call the rest of the API and expires within a minute.
+    """
+
+    def authenticate(self, request):
+        ticket = request.query_params.get('ticket')
+        if not ticket:
+            return None
+        try:
+            payload = signing.loads(ticket, salt=EVENT_TICKET_SALT, max_age=settings.EVENTS_TICKET_MAX_AGE)
+        except signing.SignatureExpired:
+            raise exceptions.AuthenticationFailed('Event stream ticket expired')
+        except signing.BadSignature:
+            raise exceptions.AuthenticationFailed('Invalid event stream ticket')
+        user = get_user_model().objects.filter(pk=payload['user'], is_active=True).first()
+        if user is None:
+            raise exceptions.AuthenticationFailed('User not found')
+        return user, None
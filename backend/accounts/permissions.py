@@ -0,0 +1,14 @@
+from rest_framework import permissions
+
+
+def has_organization_access(user):
+    """Managers and admins may see assessments across the whole organization"""
+    return user.role in ('admin', 'manager') or user.is_staff
+
+
+class IsAdminRole(permissions.BasePermission):
+    """Allow access to users with the admin role or Django staff status"""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.role == 'admin' or user.is_staff))
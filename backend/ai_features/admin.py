@@ -1,4 +1,7 @@
+from django.conf import settings
 from django.contrib import admin
+
+from automation_ai.pagination import EstimatedCountPaginator
 from .models import ProcessAnalysis, MLModel
 
 
@@ -6,7 +9,10 @@ from .models import ProcessAnalysis, MLModel
 class ProcessAnalysisAdmin(admin.ModelAdmin):
     list_display = ['process_name', 'analysis_type', 'confidence_score', 'analyzed_by', 'created_at']
     list_filter = ['analysis_type', 'created_at']
+    list_select_related = ['analyzed_by']
     search_fields = ['process_name', 'analyzed_by__username']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = not settings.ADMIN_PERFORMANCE_MODE
 
 
 @admin.register(MLModel)
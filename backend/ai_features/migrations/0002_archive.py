@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('ai_features', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProcessAnalysis',
+            fields=[
+                ('process_name', models.CharField(max_length=200)),
+                ('analysis_type', models.CharField(choices=[('similarity', 'Similarity Analysis'), ('optimization', 'Optimization Suggestions'), ('prediction', 'Automation Success Prediction')], max_length=50)),
+                ('input_data', models.JSONField()),
+                ('analysis_results', models.JSONField()),
+                ('confidence_score', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='processanalysis',
+            index=models.Index(fields=['created_at'], name='ai_analysis_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedprocessanalysis',
+            name='analyzed_by',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedprocessanalysis',
+            index=models.Index(fields=['analyzed_by', 'created_at'], name='ai_archive_user_created_idx'),
+        ),
+    ]
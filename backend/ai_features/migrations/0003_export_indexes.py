@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_features', '0002_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedprocessanalysis',
+            index=models.Index(fields=['created_at', 'id'], name='ai_archive_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processanalysis',
+            index=models.Index(fields=['analyzed_by', 'created_at', 'id'], name='ai_analysis_user_export_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+"""
+Numerical helpers for the AI features.
+
+numpy and scikit-learn are imported at module load, so views import this
+module lazily on first use instead of at URL resolution time.
+"""
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import StandardScaler
+
+
+def cluster_score_vectors(data, max_clusters=3, random_state=42):
+    """Scale score vectors and group them with KMeans, returning one cluster id per row"""
+    scaled_data = StandardScaler().fit_transform(np.asarray(data, dtype=float))
+    
+    n_clusters = min(max_clusters, len(data) // 2)  # Reasonable number of clusters
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state)
+    clusters = kmeans.fit_predict(scaled_data)
+    
+    return [int(cluster) for cluster in clusters]
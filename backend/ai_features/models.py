@@ -4,8 +4,8 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
-class ProcessAnalysis(models.Model):
-    """AI analysis results for processes"""
+class AnalysisFields(models.Model):
+    """Columns shared by live and archived process analyses"""
     process_name = models.CharField(max_length=200)
     analysis_type = models.CharField(max_length=50, choices=[
         ('similarity', 'Similarity Analysis'),
@@ -20,10 +20,39 @@ class ProcessAnalysis(models.Model):
     analyzed_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        abstract = True
+    
     def __str__(self):
         return f"{self.analysis_type} for {self.process_name}"
 
 
+class ProcessAnalysis(AnalysisFields):
+    """AI analysis results for processes"""
+    
+    class Meta:
+        indexes = [
+            # Finds the rows past the archive horizon without scanning the table
+            models.Index(fields=['created_at'], name='ai_analysis_created_idx'),
+            # Keyset order of a user's NDJSON export
+            models.Index(fields=['analyzed_by', 'created_at', 'id'], name='ai_analysis_user_export_idx'),
+        ]
+
+
+class ArchivedProcessAnalysis(AnalysisFields):
+    """Analysis moved out of the live table by archive_old_records, under its original id"""
+    id = models.BigIntegerField(primary_key=True)
+    # No database constraint, so the table can be partitioned on MySQL
+    analyzed_by = models.ForeignKey(User, on_delete=models.CASCADE, db_constraint=False, related_name='+')
+    archived_at = models.DateTimeField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['analyzed_by', 'created_at'], name='ai_archive_user_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='ai_archive_created_idx'),
+        ]
+
+
 class MLModel(models.Model):
     """Machine learning model metadata"""
     name = models.CharField(max_length=100)
@@ -0,0 +1,148 @@
+"""
+Bounded execution for CPU-heavy ML work.
+
+KMeans and the BLAS routines under numpy default to one thread per core. When
+several gunicorn workers fit models at the same time, that oversubscribes the
+CPU and every endpoint slows down. ML functions are therefore called by
+dotted path through ``run_ml_task``:
+
+- At most ML_MAX_CONCURRENCY tasks run at once on the host. Each slot is a lock
+  file under ML_SLOT_DIR held with flock, so the limit covers every gunicorn
+  worker. Without flock (Windows) the limit is per process.
+- A task waits up to ML_QUEUE_TIMEOUT seconds for a free slot. After that
+  ``MLPoolBusy`` is raised, which views turn into a 429 response.
+- Each task uses at most ML_THREADS_PER_TASK OpenMP/BLAS threads. With
+  ML_EXECUTOR='process' tasks run in a per-worker pool of spawned processes
+  that start with those limits. With 'inline' they run in the calling thread
+  under threadpoolctl limits, which suits Celery workers and tests.
+"""
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from monitoring.metrics import REGISTRY
+
+ML_POOL_REJECTIONS = REGISTRY.counter(
+    'ml_pool_rejections_total', 'ML tasks rejected because every compute slot stayed busy',
+    ['operation']
+)
+
+THREAD_LIMIT_VARIABLES = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS']
+SLOT_POLL_INTERVAL = 0.05
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_local_slots = None
+
+
+class MLPoolBusy(Exception):
+    """Every ML compute slot stayed busy for ML_QUEUE_TIMEOUT seconds"""
+
+
+def _limit_threads(threads):
+    # Runs in each pool process before numpy or scikit-learn is imported
+    for variable in THREAD_LIMIT_VARIABLES:
+        os.environ[variable] = str(threads)
+
+
+def _call(path, args, kwargs):
+    # Resolved where it runs, so web workers need not import numpy or scikit-learn
+    return import_string(path)(*args, **kwargs)
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    with _executor_lock:
+        # A pool inherited through fork belongs to the parent and cannot be used
+        if _executor is None or _executor_pid != os.getpid():
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.ML_MAX_CONCURRENCY,
+                # Forking a threaded server process is unsafe; spawned processes start clean
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_limit_threads,
+                initargs=(settings.ML_THREADS_PER_TASK,),
+            )
+            _executor_pid = os.getpid()
+            atexit.register(_reset_executor)
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _try_file_slot(slot_dir):
+    for index in range(settings.ML_MAX_CONCURRENCY):
+        handle = open(slot_dir / f'slot-{index}.lock', 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            continue
+        return handle
+    return None
+
+
+def _acquire_slot(timeout):
+    """Wait for a compute slot; returns a release callable or None on timeout"""
+    global _local_slots
+    if fcntl is None or not settings.ML_SLOT_DIR:
+        with _executor_lock:
+            if _local_slots is None:
+                _local_slots = threading.BoundedSemaphore(settings.ML_MAX_CONCURRENCY)
+        return _local_slots.release if _local_slots.acquire(timeout=timeout) else None
+
+    slot_dir = Path(settings.ML_SLOT_DIR)
+    slot_dir.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        handle = _try_file_slot(slot_dir)
+        if handle is not None:
+            # Closing the file releases the lock, also when the process dies
+            return handle.close
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(SLOT_POLL_INTERVAL)
+
+
+def run_ml_task(operation, path, *args, **kwargs):
+    """Call the function at dotted ``path`` within the host's ML concurrency and thread limits"""
+    release = _acquire_slot(settings.ML_QUEUE_TIMEOUT)
+    if release is None:
+        ML_POOL_REJECTIONS.inc(operation=operation)
+        raise MLPoolBusy(operation)
+    try:
+        if settings.ML_EXECUTOR == 'process':
+            from concurrent.futures.process import BrokenProcessPool
+
+            try:
+                return _get_executor().submit(_call, path, args, kwargs).result()
+            except BrokenProcessPool:
+                # A pool process died (e.g. killed for memory); start a fresh pool next time
+                _reset_executor()
+                raise
+
+        from threadpoolctl import threadpool_limits
+
+        with threadpool_limits(limits=settings.ML_THREADS_PER_TASK):
+            return _call(path, args, kwargs)
+    finally:
+        release()
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from automation_ai.fieldsets import SparseFieldsetMixin
+from .models import ProcessAnalysis
+
+
+class ProcessAnalysisSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Every column of an analysis, for exports"""
+    
+    class Meta:
+        model = ProcessAnalysis
+        fields = [
+            'id', 'process_name', 'analysis_type', 'input_data', 'analysis_results',
+            'confidence_score', 'analyzed_by', 'created_at'
+        ]
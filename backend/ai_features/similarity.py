@@ -0,0 +1,106 @@
+"""
+Similarity clustering of a user's assessments.
+
+Each similarity analysis stores the fingerprint of the assessments it
+clustered in its ``input_data``. While those assessments are unchanged, the
+analysis endpoint returns the stored analysis instead of clustering again, and
+the nightly precompute job only re-clusters users whose assessments changed.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from automation_ai.precompute import contents_fingerprint, precompute_run
+from monitoring.metrics import ML_FIT_SECONDS
+from tasks.models import ProcessAssessment
+from tasks.scoring import SCORE_FIELDS
+from .models import ProcessAnalysis
+from .pool import run_ml_task
+
+MIN_ASSESSMENTS = 3
+
+
+def stored_similarity_analysis(user, digest):
+    """The user's latest similarity analysis of assessments with this fingerprint, or None"""
+    return (
+        ProcessAnalysis.objects.filter(analyzed_by=user, analysis_type='similarity', input_data__fingerprint=digest)
+        .order_by('-created_at', '-id').first()
+    )
+
+
+def similarity_response(analysis):
+    """Response body of the similarity endpoint for a saved analysis"""
+    return {
+        'analysis_id': analysis.id,
+        'insights': analysis.analysis_results['insights'],
+        'cluster_groups': analysis.analysis_results['clusters'],
+    }
+
+
+def build_similarity_analysis(user, assessments, digest, progress=None):
+    """Cluster ``assessments`` by their factor scores and save the analysis under ``digest``"""
+    rows = list(assessments.values_list('process_name', *SCORE_FIELDS))
+    process_names = [row[0] for row in rows]
+    data = [list(row[1:]) for row in rows]
+    if progress:
+        progress(1, 3, stage='clustering')
+
+    # Perform clustering within the bounded ML compute pool
+    with ML_FIT_SECONDS.time(operation='kmeans_similarity'):
+        clusters = run_ml_task('kmeans_similarity', 'ai_features.ml.cluster_score_vectors', data)
+
+    # Organize results
+    cluster_groups = {}
+    for i, (process_name, cluster_id) in enumerate(zip(process_names, clusters)):
+        if cluster_id not in cluster_groups:
+            cluster_groups[cluster_id] = []
+        cluster_groups[cluster_id].append({
+            'process_name': process_name,
+            'scores': data[i],
+            'total_score': sum(data[i])
+        })
+
+    # Generate insights
+    insights = []
+    for cluster_id, processes in cluster_groups.items():
+        if len(processes) > 1:
+            avg_score = sum(p['total_score'] for p in processes) / len(processes)
+            insights.append({
+                'cluster_id': int(cluster_id),
+                'processes': [p['process_name'] for p in processes],
+                'average_score': round(avg_score, 1),
+                'insight': f"These {len(processes)} processes have similar automation characteristics"
+            })
+
+    if progress:
+        progress(2, 3, stage='saving', force=True)
+    return ProcessAnalysis.objects.create(
+        process_name="Similarity Analysis",
+        analysis_type='similarity',
+        input_data={'processes_analyzed': process_names, 'fingerprint': digest},
+        analysis_results={'clusters': cluster_groups, 'insights': insights},
+        confidence_score=0.8,  # Static confidence for demo
+        analyzed_by=user
+    )
+
+
+def precompute_similarity_clusters():
+    """Re-cluster users who ran a similarity analysis within PRECOMPUTE_ACTIVE_DAYS and whose assessments changed"""
+    since = timezone.now() - timedelta(days=settings.PRECOMPUTE_ACTIVE_DAYS)
+    user_ids = (
+        ProcessAnalysis.objects.filter(analysis_type='similarity', created_at__gte=since)
+        .order_by().values_list('analyzed_by', flat=True).distinct()
+    )
+
+    with precompute_run('similarity_clusters') as run:
+        for user in get_user_model().objects.filter(id__in=user_ids).order_by('id'):
+            assessments = ProcessAssessment.objects.filter(assessed_by=user)
+            count, digest = contents_fingerprint(assessments)
+            if count < MIN_ASSESSMENTS or stored_similarity_analysis(user, digest) is not None:
+                run.record('skipped')
+                continue
+            with run.item(f'user {user.id}'):
+                build_similarity_analysis(user, assessments, digest)
+    return run.counts
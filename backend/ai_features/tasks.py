@@ -0,0 +1,8 @@
+from automation_ai.celery import app
+from .similarity import precompute_similarity_clusters
+
+
+@app.task
+def precompute_similarity_clusters_task():
+    """Re-cluster the assessments of recent similarity analysis users whose assessments changed"""
+    return precompute_similarity_clusters()
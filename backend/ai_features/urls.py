@@ -6,4 +6,5 @@ urlpatterns = [
     path('predict-success/', views.predict_automation_success, name='predict-success'),
     path('optimization-suggestions/', views.generate_optimization_suggestions, name='optimization-suggestions'),
     path('analysis-history/', views.get_analysis_history, name='analysis-history'),
+    path('analysis-history/export/', views.export_analysis_history, name='export-analyses'),
 ]
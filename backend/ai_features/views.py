@@ -1,25 +1,35 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Avg
-import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-import pandas as pd
 import json
+import sys
 
+from accounts.permissions import has_organization_access
+from automation_ai.archival import as_instances, include_archived, with_archived
+from automation_ai.events import track_job
+from automation_ai.exports import export_serializer, export_state, stream_export
+from automation_ai.precompute import contents_fingerprint
+from automation_ai.renderers import FastJSONRenderer, NDJSONRenderer
+from automation_ai.singleflight import single_flight
 from tasks.models import ProcessAssessment
-from .models import ProcessAnalysis
+from tasks.scoring import get_active_rules
+from .models import ArchivedProcessAnalysis, ProcessAnalysis
+from .pool import MLPoolBusy
+from .serializers import ProcessAnalysisSerializer
+from .similarity import MIN_ASSESSMENTS, build_similarity_analysis, similarity_response, stored_similarity_analysis
 
 
 def convert_numpy_types(obj):
     """Convert numpy types to Python native types for JSON serialization"""
-    if isinstance(obj, np.integer):
+    # numpy is loaded lazily; if it was never imported there are no numpy values to convert
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(obj, np.integer):
         return int(obj)
-    elif isinstance(obj, np.floating):
+    elif np is not None and isinstance(obj, np.floating):
         return float(obj)
-    elif isinstance(obj, np.ndarray):
+    elif np is not None and isinstance(obj, np.ndarray):
         return obj.tolist()
     elif isinstance(obj, dict):
         return {key: convert_numpy_types(value) for key, value in obj.items()}
@@ -28,6 +38,14 @@ def convert_numpy_types(obj):
     return obj
 
 
+def _run_similarity_analysis(user, user_assessments, digest):
+    """Cluster the user's assessments, save the analysis and return the response data"""
+    with track_job(user.id, 'similarity_analysis') as job:
+        analysis = build_similarity_analysis(user, user_assessments, digest, progress=job.progress)
+        job.result = {'analysis_id': analysis.id, 'processes': len(analysis.input_data['processes_analyzed'])}
+        return similarity_response(analysis)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def analyze_process_similarity(request):
@@ -35,77 +53,32 @@ def analyze_process_similarity(request):
     try:
         user_assessments = ProcessAssessment.objects.filter(assessed_by=request.user)
         
-        if user_assessments.count() < 3:
+        # One query both checks the minimum and identifies the input
+        count, digest = contents_fingerprint(user_assessments)
+        if count < MIN_ASSESSMENTS:
             return Response({
                 'error': 'Need at least 3 assessments for similarity analysis'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Prepare data for clustering
-        data = []
-        process_names = []
-        
-        for assessment in user_assessments:
-            data.append([
-                assessment.repetitiveness_score,
-                assessment.rule_based_score,
-                assessment.complexity_score,
-                assessment.volume_score,
-                assessment.standardization_score,
-                assessment.current_errors_score
-            ])
-            process_names.append(assessment.process_name)
-        
-        # Perform clustering
-        scaler = StandardScaler()
-        scaled_data = scaler.fit_transform(data)
-        
-        n_clusters = min(3, len(data) // 2)  # Reasonable number of clusters
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-        clusters = kmeans.fit_predict(scaled_data)
+        # Unchanged assessments were already clustered, by an earlier request or the nightly precompute
+        analysis = stored_similarity_analysis(request.user, digest)
+        if analysis is not None:
+            return Response(similarity_response(analysis))
         
-        # Organize results
-        cluster_groups = {}
-        for i, (process_name, cluster) in enumerate(zip(process_names, clusters)):
-            cluster_id = int(cluster)  # Convert numpy int to Python int
-            if cluster_id not in cluster_groups:
-                cluster_groups[cluster_id] = []
-            cluster_groups[cluster_id].append({
-                'process_name': process_name,
-                'scores': data[i],
-                'total_score': sum(data[i])
-            })
-        
-        # Generate insights
-        insights = []
-        for cluster_id, processes in cluster_groups.items():
-            if len(processes) > 1:
-                avg_score = float(np.mean([p['total_score'] for p in processes]))
-                insights.append({
-                    'cluster_id': int(cluster_id),
-                    'processes': [p['process_name'] for p in processes],
-                    'average_score': round(avg_score, 1),
-                    'insight': f"These {len(processes)} processes have similar automation characteristics"
-                })
-        
-        # Save analysis
-        analysis = ProcessAnalysis.objects.create(
-            process_name="Similarity Analysis",
-            analysis_type='similarity',
-            input_data={'processes_analyzed': process_names},
-            analysis_results={'clusters': cluster_groups, 'insights': insights},
-            confidence_score=0.8,  # Static confidence for demo
-            analyzed_by=request.user
+        # Identical concurrent requests (double-clicks, several tabs) share one analysis
+        response_data = single_flight(
+            'similarity',
+            (request.user.id, digest),
+            lambda: _run_similarity_analysis(request.user, user_assessments, digest)
         )
         
-        # Convert numpy types before returning
-        response_data = convert_numpy_types({
-            'analysis_id': analysis.id,
-            'insights': insights,
-            'cluster_groups': cluster_groups
-        })
-        
         return Response(response_data)
     
+    except MLPoolBusy:
+        return Response({
+            'error': 'Analysis capacity is busy, please retry shortly'
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': '5'})
+    
     except Exception as e:
         return Response({
             'error': f'Analysis failed: {str(e)}'
@@ -123,15 +96,8 @@ def predict_automation_success(request):
             'error': 'Process scores required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Simple ML-like prediction based on weighted factors
-    weights = {
-        'repetitiveness_score': 0.2,
-        'rule_based_score': 0.25,
-        'complexity_score': 0.15,
-        'volume_score': 0.15,
-        'standardization_score': 0.15,
-        'current_errors_score': 0.1
-    }
+    # Simple ML-like prediction based on the active rule set's weighted factors
+    weights = get_active_rules()['success_weights']
     
     weighted_score = sum(scores.get(factor, 0) * weight for factor, weight in weights.items())
     
@@ -252,6 +218,10 @@ def generate_optimization_suggestions(request):
 def get_analysis_history(request):
     """Get user's analysis history"""
     analyses = ProcessAnalysis.objects.filter(analyzed_by=request.user)
+    if include_archived(request):
+        archived = ArchivedProcessAnalysis.objects.filter(analyzed_by=request.user)
+        fields = ['id', 'process_name', 'analysis_type', 'confidence_score', 'created_at', 'analysis_results']
+        analyses = as_instances(ProcessAnalysis, with_archived(analyses, archived, fields).order_by('created_at', 'id'))
     
     history = []
     for analysis in analyses:
@@ -261,7 +231,29 @@ def get_analysis_history(request):
             'analysis_type': analysis.get_analysis_type_display(),
             'confidence_score': analysis.confidence_score,
             'created_at': analysis.created_at,
-            'results_summary': analysis.analysis_results
+            'results_summary': analysis.analysis_results,
+            'archived': getattr(analysis, 'archived', False),
         })
     
     return Response(history)
+
+
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, NDJSONRenderer])
+@permission_classes([IsAuthenticated])
+def export_analysis_history(request):
+    """NDJSON stream of analyses by (created_at, id), filtered by ?updated_since= and resumable with ?cursor="""
+    state = export_state(request, 'analyses')
+    if state['scope'] == 'organization' and not has_organization_access(request.user):
+        return Response(
+            {'error': 'Only managers and admins can export the organization'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    # Analyses never change, so updated_since and the cursor follow created_at
+    live, archived = ProcessAnalysis.objects.all(), ArchivedProcessAnalysis.objects.all()
+    if state['scope'] == 'mine':
+        live, archived = live.filter(analyzed_by=request.user), archived.filter(analyzed_by=request.user)
+    sources = [(live, False)] + ([(archived, True)] if state['archived'] else [])
+    serializer = export_serializer(ProcessAnalysisSerializer, request, state)
+    return stream_export('analyses', sources, serializer, 'created_at', state)
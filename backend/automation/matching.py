@@ -0,0 +1,156 @@
+"""
+In-memory index for suggesting automation templates while an assessment is drafted.
+
+Each process builds the index once from a single query: the templates'
+default score vectors as a NumPy matrix, their display fields, and an inverted
+index from name/category words to template positions. The word list is kept
+sorted so a partly typed keyword matches by prefix with a binary search.
+Suggestions are then ranked without touching the database.
+
+Saving or deleting a template bumps a version number in the cache, and every
+process rebuilds when it sees a new version. The index is also rebuilt after
+TEMPLATE_INDEX_MAX_AGE seconds. That catches bulk writes, which skip
+save()/delete(), and per-process (locmem) caches that cannot see another
+worker's version bump.
+"""
+import bisect
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import AutomationTemplate
+
+# Assessment score field -> template default field
+SCORE_FIELD_DEFAULTS = {
+    'repetitiveness_score': 'default_repetitiveness',
+    'rule_based_score': 'default_rule_based',
+    'complexity_score': 'default_complexity',
+    'volume_score': 'default_volume',
+    'standardization_score': 'default_standardization',
+    'current_errors_score': 'default_current_errors',
+}
+DISPLAY_FIELDS = ['id', 'name', 'category', 'description', 'guidance_text']
+
+INDEX_VERSION_KEY = 'automation:template-index-version'
+SCORE_RANGE = 4  # scores run from 1 to 5
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+_index = None
+_lock = threading.Lock()
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def invalidate_template_index():
+    """Make every process rebuild its template index on the next suggestion"""
+    try:
+        cache.incr(INDEX_VERSION_KEY)
+    except ValueError:
+        cache.set(INDEX_VERSION_KEY, 1, None)
+
+
+class TemplateIndex:
+    def __init__(self, rows, version):
+        import numpy as np  # imported lazily to keep startup fast
+
+        self.version = version
+        self.built_at = time.monotonic()
+        self.templates = [
+            {field: row[field] for field in DISPLAY_FIELDS + list(SCORE_FIELD_DEFAULTS.values())}
+            for row in rows
+        ]
+        self.scores = np.array(
+            [[row[field] for field in SCORE_FIELD_DEFAULTS.values()] for row in rows], dtype=np.float32
+        ).reshape(len(rows), len(SCORE_FIELD_DEFAULTS))
+        self.ids = np.array([row['id'] for row in rows], dtype=np.int64)
+        self.categories = np.array([row['category'].lower() for row in rows], dtype=object)
+
+        postings = {}
+        for position, row in enumerate(rows):
+            for token in set(tokenize(f"{row['name']} {row['category']}")):
+                postings.setdefault(token, []).append(position)
+        self.vocabulary = sorted(postings)
+        self.postings = [np.array(postings[token], dtype=np.int64) for token in self.vocabulary]
+
+    def keyword_match(self, query):
+        """Fraction of the query's words that prefix a word of each template's name or category"""
+        import numpy as np
+
+        words = tokenize(query)
+        matched = np.zeros(len(self.templates), dtype=np.float32)
+        for word in words:
+            start = bisect.bisect_left(self.vocabulary, word)
+            end = bisect.bisect_left(self.vocabulary, word + '\uffff')
+            hits = np.zeros(len(self.templates), dtype=bool)
+            for position in range(start, end):
+                hits[self.postings[position]] = True
+            matched += hits
+        return matched / len(words) if words else matched
+
+    def score_similarity(self, scores):
+        """1 for identical default scores, 0 for the largest possible distance, over the given fields"""
+        import numpy as np
+
+        columns = [index for index, field in enumerate(SCORE_FIELD_DEFAULTS) if field in scores]
+        draft = np.array([scores[field] for field in SCORE_FIELD_DEFAULTS if field in scores], dtype=np.float32)
+        distance = np.sqrt(((self.scores[:, columns] - draft) ** 2).sum(axis=1))
+        return 1 - distance / (SCORE_RANGE * np.sqrt(len(columns)))
+
+    def suggest(self, scores=None, query='', category=None, limit=5):
+        """The best matching templates with their similarity, keyword match and combined score"""
+        import numpy as np
+
+        size = len(self.templates)
+        similarity = self.score_similarity(scores) if scores else None
+        keyword = self.keyword_match(query) if tokenize(query) else None
+
+        if similarity is not None and keyword is not None:
+            weight = settings.TEMPLATE_KEYWORD_WEIGHT
+            combined = (1 - weight) * similarity + weight * keyword
+        else:
+            combined = similarity if similarity is not None else keyword
+        if combined is None:
+            combined = np.zeros(size, dtype=np.float32)
+
+        candidates = np.arange(size)
+        if category:
+            candidates = candidates[self.categories == category.lower()]
+        if keyword is not None:
+            candidates = candidates[keyword[candidates] > 0]
+        # Best first, ties by template id for a stable order
+        candidates = candidates[np.lexsort((self.ids[candidates], -combined[candidates]))[:limit]].tolist()
+
+        return [
+            {
+                **self.templates[position],
+                'score_similarity': round(float(similarity[position]), 4) if similarity is not None else None,
+                'keyword_match': round(float(keyword[position]), 4) if keyword is not None else None,
+                'match_score': round(float(combined[position]), 4),
+            }
+            for position in candidates
+        ]
+
+
+def get_template_index():
+    """This process's template index, rebuilt when templates changed or it is older than the max age"""
+    global _index
+    version = cache.get(INDEX_VERSION_KEY, 0)
+    index = _index
+    if (
+        index is not None and index.version == version
+        and time.monotonic() - index.built_at < settings.TEMPLATE_INDEX_MAX_AGE
+    ):
+        return index
+
+    with _lock:
+        if _index is None or _index is index:
+            rows = list(AutomationTemplate.objects.order_by('id').values(
+                *DISPLAY_FIELDS, *SCORE_FIELD_DEFAULTS.values()
+            ))
+            _index = TemplateIndex(rows, version)
+        return _index
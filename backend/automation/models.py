@@ -25,6 +25,17 @@ class AutomationTemplate(models.Model):
     
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .matching import invalidate_template_index
+        invalidate_template_index()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        from .matching import invalidate_template_index
+        invalidate_template_index()
+        return result
 
 
 class AutomationRecommendation(models.Model):
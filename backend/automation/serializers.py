@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .matching import SCORE_FIELD_DEFAULTS
 from .models import AutomationTemplate, AutomationRecommendation
 
 
@@ -13,3 +14,22 @@ class AutomationRecommendationSerializer(serializers.ModelSerializer):
         model = AutomationRecommendation
         fields = '__all__'
         read_only_fields = ['generated_for', 'generated_at']
+
+
+class TemplateSuggestionQuerySerializer(serializers.Serializer):
+    """Query parameters of the template suggestion endpoint"""
+    q = serializers.CharField(required=False, allow_blank=True, default='')
+    category = serializers.CharField(required=False)
+    repetitiveness_score = serializers.IntegerField(required=False, min_value=1, max_value=5)
+    rule_based_score = serializers.IntegerField(required=False, min_value=1, max_value=5)
+    complexity_score = serializers.IntegerField(required=False, min_value=1, max_value=5)
+    volume_score = serializers.IntegerField(required=False, min_value=1, max_value=5)
+    standardization_score = serializers.IntegerField(required=False, min_value=1, max_value=5)
+    current_errors_score = serializers.IntegerField(required=False, min_value=1, max_value=5)
+    limit = serializers.IntegerField(default=5, min_value=1, max_value=50)
+    
+    def validate(self, attrs):
+        attrs['scores'] = {field: attrs.pop(field) for field in SCORE_FIELD_DEFAULTS if field in attrs}
+        if not attrs['scores'] and not attrs['q'].strip() and not attrs.get('category'):
+            raise serializers.ValidationError('Provide draft scores, a keyword (q) or a category')
+        return attrs
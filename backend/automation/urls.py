@@ -3,5 +3,6 @@ from . import views
 
 urlpatterns = [
     path('templates/', views.AutomationTemplateListView.as_view(), name='template-list'),
+    path('templates/suggest/', views.suggest_templates, name='template-suggest'),
     path('recommendations/', views.generate_recommendation, name='generate-recommendation'),
 ]
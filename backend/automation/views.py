@@ -1,8 +1,11 @@
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from .models import AutomationTemplate, AutomationRecommendation
-from .serializers import AutomationTemplateSerializer, AutomationRecommendationSerializer
+from .matching import get_template_index
+from .serializers import (
+    AutomationTemplateSerializer, AutomationRecommendationSerializer, TemplateSuggestionQuerySerializer
+)
 
 
 class AutomationTemplateListView(generics.ListAPIView):
@@ -12,6 +15,21 @@ class AutomationTemplateListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def suggest_templates(request):
+    """Templates closest to a draft assessment's scores and keywords, served from an in-memory index"""
+    query = TemplateSuggestionQuerySerializer(data=request.query_params)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    params = query.validated_data
+    results = get_template_index().suggest(
+        scores=params['scores'], query=params['q'], category=params.get('category'), limit=params['limit']
+    )
+    return Response({'results': results})
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def generate_recommendation(request):
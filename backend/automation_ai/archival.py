@@ -0,0 +1,98 @@
+"""
+Time-based archival of assessments and AI analyses.
+
+Every AI call adds a ProcessAnalysis row and assessments are never removed,
+so list queries over the live tables keep getting slower. ``archive_old_records``
+moves rows older than a horizon into archive tables with the same columns:
+
+- analyses created more than ARCHIVE_ANALYSIS_DAYS ago, and
+- assessments not updated for ARCHIVE_ASSESSMENT_DAYS, unless a report
+  still includes them.
+
+Each batch of ARCHIVE_BATCH_SIZE rows is copied with one INSERT ... SELECT
+and deleted from the live table in the same transaction, under its original
+id. A horizon of 0 disables archiving for that table.
+
+Archived rows stay readable: list endpoints that accept ``include_archived``
+query both tables through ``with_archived``, a UNION of the two.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, Value
+from django.utils import timezone
+
+TRUE_VALUES = {'1', 'true', 'yes'}
+
+
+def include_archived(request):
+    """Whether the request asked for archived rows with ?include_archived=true"""
+    return request.query_params.get('include_archived', '').lower() in TRUE_VALUES
+
+
+def with_archived(queryset, archived_queryset, fields):
+    """Rows of both querysets as dicts of ``fields``, with an ``archived`` flag; order the result by name"""
+    live = queryset.order_by().values(*fields, archived=Value(False, output_field=BooleanField()))
+    archived = archived_queryset.order_by().values(*fields, archived=Value(True, output_field=BooleanField()))
+    return live.union(archived, all=True)
+
+
+def as_instances(model, rows):
+    """Unsaved ``model`` instances for rows of ``with_archived``, each with its ``archived`` flag"""
+    instances = []
+    for row in rows:
+        archived = row.pop('archived')
+        instance = model(**row)
+        instance.archived = archived
+        instances.append(instance)
+    return instances
+
+
+def archive_queryset(queryset, archive_model, batch_size=None):
+    """Move the rows of ``queryset`` into ``archive_model`` in batches; returns how many were moved"""
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    model = queryset.model
+    quote = connection.ops.quote_name
+    fields = list(model._meta.concrete_fields)
+    insert = 'INSERT INTO {} ({}, {}) SELECT {}.*, %s FROM'.format(
+        quote(archive_model._meta.db_table),
+        ', '.join(quote(archive_model._meta.get_field(field.name).column) for field in fields),
+        quote(archive_model._meta.get_field('archived_at').column),
+        quote('archived_rows'),
+    )
+
+    moved = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return moved
+            rows = model.objects.filter(pk__in=ids).order_by().values(*[field.attname for field in fields])
+            select_sql, params = rows.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'{insert} ({select_sql}) {quote("archived_rows")}', (timezone.now(), *params))
+            model.objects.filter(pk__in=ids).delete()
+        moved += len(ids)
+
+
+def archive_old_records(batch_size=None):
+    """Archive analyses and assessments past their horizons; returns the number moved per table"""
+    from ai_features.models import ArchivedProcessAnalysis, ProcessAnalysis
+    from tasks.models import ArchivedProcessAssessment, AssessmentReport, ProcessAssessment
+
+    now = timezone.now()
+    result = {'analyses': 0, 'assessments': 0}
+    if settings.ARCHIVE_ANALYSIS_DAYS:
+        cutoff = now - timedelta(days=settings.ARCHIVE_ANALYSIS_DAYS)
+        result['analyses'] = archive_queryset(
+            ProcessAnalysis.objects.filter(created_at__lt=cutoff), ArchivedProcessAnalysis, batch_size
+        )
+    if settings.ARCHIVE_ASSESSMENT_DAYS:
+        cutoff = now - timedelta(days=settings.ARCHIVE_ASSESSMENT_DAYS)
+        # Reports keep pointing at their assessments, so those stay live
+        stale = ProcessAssessment.objects.filter(updated_at__lt=cutoff).exclude(
+            id__in=AssessmentReport.assessments.through.objects.values('processassessment_id')
+        )
+        result['assessments'] = archive_queryset(stale, ArchivedProcessAssessment, batch_size)
+    return result
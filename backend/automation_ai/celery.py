@@ -16,6 +16,37 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+# Record task durations for the /metrics endpoint
+from monitoring.metrics import instrument_celery  # noqa: E402
+instrument_celery()
+
+
+def beat_schedule(schedules):
+    """Celery beat entries for {task name: crontab expression}, skipping empty expressions"""
+    from celery.schedules import crontab
+    from django.core.exceptions import ImproperlyConfigured
+    entries = {}
+    for task, expression in schedules.items():
+        if not expression.strip():
+            continue
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ImproperlyConfigured(f'Schedule for {task} needs five crontab fields, got {expression!r}')
+        minute, hour, day_of_month, month_of_year, day_of_week = fields
+        entries[task] = {
+            'task': task,
+            'schedule': crontab(
+                minute=minute, hour=hour, day_of_month=day_of_month,
+                month_of_year=month_of_year, day_of_week=day_of_week,
+            ),
+        }
+    return entries
+
+
+# Scheduled precomputation (see automation_ai.precompute)
+from django.conf import settings  # noqa: E402
+app.conf.beat_schedule = beat_schedule(settings.PRECOMPUTE_SCHEDULES)
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -0,0 +1,134 @@
+"""
+Compression of large API responses.
+
+List pages, analysis histories and report exports are repetitive JSON or CSV
+that shrinks several times over. ``CompressionMiddleware`` encodes responses
+of at least COMPRESSION_MIN_SIZE bytes with brotli when the client accepts it
+and the ``brotli`` package is installed, and with gzip otherwise. A body is
+only replaced when the encoded version is smaller.
+
+NDJSON exports are streamed, and each chunk is compressed and flushed as it
+is produced, so the stream stays incremental and memory stays flat.
+
+It leaves alone:
+
+- other streaming responses, so Server-Sent Events are delivered as they
+  happen;
+- responses that are already encoded, or whose type does not compress (PDF);
+- paths under COMPRESSION_EXCLUDE_PATHS. Compressing a response that echoes
+  request input next to a secret, such as the tokens of /api/auth/, exposes
+  the secret to BREACH-style attacks.
+
+Small responses are not worth the CPU: below about a kilobyte the headers
+dominate and the saving is a few hundred bytes at best.
+"""
+import gzip
+import re
+import zlib
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/|application/(json|x-ndjson|javascript|xml)|application/[\w.+-]+\+json)', re.IGNORECASE
+)
+
+
+def accepted_encodings(request):
+    """Content codings the client accepts, ignoring those it refuses with q=0 or gives a malformed q-value"""
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = re.search(r'q\s*=\s*([0-9.]+)', params)
+        try:
+            refused = quality is not None and float(quality.group(1)) == 0
+        except ValueError:
+            # e.g. "q=." or "q=1.0.0"; sending that coding uncompressed is always safe
+            refused = True
+        if coding and not refused:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 keeps identical bodies byte-identical, so caches and ETags stay stable
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+# Streaming responses compressed chunk by chunk; every other stream is sent as it is
+STREAMED_TYPES = re.compile(r'^application/x-ndjson', re.IGNORECASE)
+
+
+def compress_stream(chunks, encoding):
+    """Compress ``chunks`` as one stream, flushing after each so the client receives them as they come"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+    # wbits 31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+class CompressionMiddleware:
+    """Brotli or gzip for large, compressible responses"""
+
+    def __init__(self, get_response):
+        if not settings.COMPRESSION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.should_compress(request, response):
+            return response
+
+        # The response depends on Accept-Encoding whether or not this one ends up encoded
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(request)
+        if brotli is not None and 'br' in accepted:
+            encoding = 'br'
+        elif 'gzip' in accepted or '*' in accepted:
+            encoding = 'gzip'
+        else:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        # The encoded body differs byte for byte, so a strong ETag no longer applies
+        etag = response.headers.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+    def should_compress(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return False
+        if response.streaming:
+            if not STREAMED_TYPES.match(response.get('Content-Type', '')):
+                return False
+        elif (
+            len(response.content) < settings.COMPRESSION_MIN_SIZE
+            or not COMPRESSIBLE_TYPES.match(response.get('Content-Type', ''))
+        ):
+            return False
+        return not any(request.path.startswith(prefix) for prefix in settings.COMPRESSION_EXCLUDE_PATHS)
@@ -0,0 +1,235 @@
+"""
+Per-user job events for the Server-Sent Events stream.
+
+Long operations publish ``job.started``, ``job.progress``, ``job.completed``
+and ``job.failed`` events through ``track_job``. The /api/events/ stream
+forwards them to the user's open connections, so clients can drop their
+polling loops.
+
+Events go through a small broker chosen by EVENTS_BACKEND:
+
+- ``memory`` keeps subscribers in this process. That is enough for
+  runserver and tests, but events published by other workers or by Celery
+  are not seen.
+- ``redis`` publishes on a per-user channel of EVENTS_REDIS_URL, so events
+  from any web or Celery worker reach every stream.
+
+Each user's last EVENTS_REPLAY_SIZE events are kept as well. A client that
+reconnects with ``Last-Event-ID`` receives what it missed. Publishing never
+raises, so an unavailable broker cannot fail the job that reports through it.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Milliseconds browsers wait before reconnecting a dropped stream
+RETRY_MILLISECONDS = 3000
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+class MemoryBroker:
+    """Subscribers and replay history held in this process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = {}
+        # user id -> (time of the last event, recent events), least recently published first
+        self.history = OrderedDict()
+
+    def _expire_history(self, now):
+        """Drop the history of users with no event for EVENTS_REPLAY_TTL, as Redis expires it"""
+        while self.history:
+            user_id, (published, _) = next(iter(self.history.items()))
+            if now - published < settings.EVENTS_REPLAY_TTL:
+                break
+            del self.history[user_id]
+
+    def publish(self, user_id, event):
+        now = time.monotonic()
+        with self.lock:
+            self._expire_history(now)
+            entry = self.history.pop(user_id, None)
+            history = entry[1] if entry else deque(maxlen=settings.EVENTS_REPLAY_SIZE)
+            history.append(event)
+            self.history[user_id] = (now, history)
+            for subscriber in self.subscribers.get(user_id, ()):
+                subscriber.put(event)
+
+    @contextmanager
+    def subscribe(self, user_id, last_event_id=None):
+        inbox = queue.SimpleQueue()
+        with self.lock:
+            self.subscribers.setdefault(user_id, set()).add(inbox)
+            self._expire_history(time.monotonic())
+            _, history = self.history.get(user_id, (None, ()))
+            backlog = [
+                event for event in history
+                if last_event_id is not None and event['id'] > last_event_id
+            ]
+
+        def receive(timeout):
+            try:
+                return inbox.get(timeout=timeout)
+            except queue.Empty:
+                return None
+
+        try:
+            yield backlog, receive
+        finally:
+            with self.lock:
+                subscribers = self.subscribers.get(user_id, set())
+                subscribers.discard(inbox)
+                if not subscribers:
+                    self.subscribers.pop(user_id, None)
+
+
+class RedisBroker:
+    """Redis pub/sub per user, with the replay history in a capped list"""
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _keys(user_id):
+        return f'events:user:{user_id}', f'events:history:{user_id}'
+
+    def publish(self, user_id, event):
+        channel, history = self._keys(user_id)
+        payload = json.dumps(event)
+        pipeline = self.client.pipeline()
+        pipeline.rpush(history, payload)
+        pipeline.ltrim(history, -settings.EVENTS_REPLAY_SIZE, -1)
+        pipeline.expire(history, settings.EVENTS_REPLAY_TTL)
+        pipeline.publish(channel, payload)
+        pipeline.execute()
+
+    @contextmanager
+    def subscribe(self, user_id, last_event_id=None):
+        channel, history = self._keys(user_id)
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        # Subscribe before reading the history so nothing falls in between
+        pubsub.subscribe(channel)
+        backlog = []
+        if last_event_id is not None:
+            backlog = [
+                event for event in map(json.loads, self.client.lrange(history, 0, -1))
+                if event['id'] > last_event_id
+            ]
+
+        def receive(timeout):
+            message = pubsub.get_message(timeout=timeout)
+            return json.loads(message['data']) if message else None
+
+        try:
+            yield backlog, receive
+        finally:
+            pubsub.close()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            if settings.EVENTS_BACKEND == 'redis':
+                _broker = RedisBroker(settings.EVENTS_REDIS_URL)
+            else:
+                _broker = MemoryBroker()
+        return _broker
+
+
+def publish(user_id, event, data):
+    """Send an event to the user's streams; failures are logged, never raised"""
+    try:
+        # Nanosecond timestamps order events from every process without coordination
+        get_broker().publish(user_id, {'id': time.time_ns(), 'event': event, 'data': data})
+    except Exception:
+        logger.warning('Could not publish %s event for user %s', event, user_id, exc_info=True)
+
+
+class JobTracker:
+    """Publishes the events of one job; ``result`` is added to the completion event"""
+
+    def __init__(self, user_id, job, job_id=None, **details):
+        self.user_id = user_id
+        self.job = job
+        self.job_id = job_id or uuid.uuid4().hex
+        self.details = details
+        self.result = {}
+        self.started = time.monotonic()
+        self._last_progress = None
+
+    def publish(self, state, **data):
+        publish(self.user_id, f'job.{state}', {
+            'job': self.job, 'job_id': self.job_id, **self.details, **data
+        })
+
+    def progress(self, done, total=None, stage=None, force=False):
+        """Report progress, at most once per EVENTS_PROGRESS_INTERVAL unless forced"""
+        now = time.monotonic()
+        if (
+            not force and self._last_progress is not None
+            and now - self._last_progress < settings.EVENTS_PROGRESS_INTERVAL
+        ):
+            return
+        self._last_progress = now
+        self.publish(
+            'progress', done=done, total=total, stage=stage,
+            percent=round(100 * done / total, 1) if total else None,
+        )
+
+    def elapsed(self):
+        return round(time.monotonic() - self.started, 3)
+
+
+@contextmanager
+def track_job(user_id, job, job_id=None, **details):
+    """Publish started, then completed or failed, around a block of work"""
+    tracker = JobTracker(user_id, job, job_id, **details)
+    tracker.publish('started')
+    try:
+        yield tracker
+    except Exception as error:
+        tracker.publish('failed', error=str(error) or error.__class__.__name__, seconds=tracker.elapsed())
+        raise
+    tracker.publish('completed', seconds=tracker.elapsed(), **tracker.result)
+
+
+def format_event(event):
+    data = json.dumps(event['data'], default=str)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n"
+
+
+def stream_events(user_id, last_event_id=None):
+    """SSE text for the user's events, with keep-alive comments, ending after EVENTS_STREAM_MAX_SECONDS"""
+    deadline = time.monotonic() + settings.EVENTS_STREAM_MAX_SECONDS
+    yield f'retry: {RETRY_MILLISECONDS}\n\n'
+    with get_broker().subscribe(user_id, last_event_id) as (backlog, receive):
+        last_sent = last_event_id or 0
+        for event in backlog:
+            last_sent = event['id']
+            yield format_event(event)
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # The client reconnects with Last-Event-ID; recycling keeps workers from being held forever
+                return
+            event = receive(min(settings.EVENTS_KEEPALIVE_SECONDS, remaining))
+            if event is None:
+                yield ': keepalive\n\n'
+            elif event['id'] > last_sent:
+                last_sent = event['id']
+                yield format_event(event)
@@ -0,0 +1,177 @@
+"""
+Sparse fieldsets and expansion control for API responses.
+
+GET requests can narrow what a serializer returns:
+
+- ``?fields=id,process_name`` keeps only the listed fields;
+- ``?omit=description,recommendation`` drops fields;
+- ``?expand=assessments`` names the relations rendered as nested objects.
+  Relations in a serializer's ``Meta.expandable_fields`` are expanded by
+  default. Once ``expand`` is given, those it does not name are rendered as
+  primary keys, so ``?expand=`` returns a report with assessment ids only.
+
+Nested fields are addressed with dots, as in
+``?fields=title,assessments.process_name``. Unknown names are a 400. A
+``fieldset`` in the serializer context, as returned by ``requested_fieldset``,
+takes the place of the request's parameters.
+
+``SparseFieldsetViewMixin`` pushes the selection down to the queryset. Only
+the columns read by the remaining fields are loaded with ``.only()``, forward
+relations they follow are joined, and many-valued ones are prefetched with
+their own narrowed querysets. Computed fields declare the columns they read in
+``Meta.field_dependencies``. A field whose source cannot be worked out leaves
+the columns unrestricted, rather than risking a query per row for a deferred
+column.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+SAFE_METHODS = ('GET', 'HEAD')
+PARAMS = ('fields', 'omit', 'expand')
+
+
+def requested_fieldset(request):
+    """The fields/omit/expand parameters of a GET request as lists of dotted paths; absent ones are left out"""
+    if request is None or request.method not in SAFE_METHODS:
+        return {}
+    return {
+        param: [name.strip() for name in request.query_params[param].split(',') if name.strip()]
+        for param in PARAMS if param in request.query_params
+    }
+
+
+def _relative(paths, prefix):
+    """``paths`` below ``prefix``, relative to it"""
+    if not prefix:
+        return paths
+    start = prefix + '.'
+    return [path[len(start):] for path in paths if path.startswith(start)]
+
+
+def _check_known(param, names, fields):
+    unknown = sorted(set(names) - set(fields))
+    if unknown:
+        raise serializers.ValidationError({param: [f"Unknown field: {name}" for name in unknown]})
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin applying ?fields=, ?omit= and ?expand= to its fields, nested serializers included"""
+
+    def fieldset_path(self):
+        """Dotted path of this serializer from the root, '' for the root itself"""
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(names))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get('fieldset')
+        if fieldset is None:
+            fieldset = requested_fieldset(self.context.get('request'))
+        if not fieldset:
+            return fields
+        prefix = self.fieldset_path()
+
+        selected = _relative(fieldset.get('fields', []), prefix)
+        if selected:
+            keep = {path.split('.')[0] for path in selected}
+            _check_known('fields', keep, fields)
+            fields = {name: field for name, field in fields.items() if name in keep}
+
+        omitted = [path for path in _relative(fieldset.get('omit', []), prefix) if '.' not in path]
+        _check_known('omit', omitted, fields)
+        for name in omitted:
+            fields.pop(name, None)
+
+        if 'expand' in fieldset:
+            expandable = getattr(getattr(self, 'Meta', None), 'expandable_fields', [])
+            expanded = {path.split('.')[0] for path in _relative(fieldset['expand'], prefix)}
+            _check_known('expand', expanded, expandable)
+            for name in expandable:
+                if name in fields and name not in expanded:
+                    fields[name] = self.collapse_field(fields[name])
+        return fields
+
+    def collapse_field(self, field):
+        """The primary keys of a nested serializer's objects, in place of the objects"""
+        kwargs = {'source': field.source} if field.source else {}
+        many = isinstance(field, serializers.ListSerializer)
+        return serializers.PrimaryKeyRelatedField(read_only=True, many=many, **kwargs)
+
+
+def _plan(model, serializer):
+    """(columns or None for all, select_related paths, prefetches) needed to render ``serializer``"""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    dependencies = getattr(getattr(serializer, 'Meta', None), 'field_dependencies', {})
+    columns, related, prefetches = {model._meta.pk.name}, [], []
+    restricted = True
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in dependencies:
+            columns.update(dependencies[name])
+            continue
+        attr = field.source.split('.')[0]
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            restricted = False
+            continue
+
+        if model_field.many_to_many or model_field.one_to_many:
+            queryset = model_field.related_model._default_manager.all()
+            if isinstance(field, serializers.ListSerializer):
+                queryset = optimize_queryset(queryset, field)
+            else:
+                queryset = queryset.only(model_field.related_model._meta.pk.name)
+            prefetches.append(Prefetch(attr, queryset=queryset))
+            continue
+
+        columns.add(attr)
+        if isinstance(field, serializers.BaseSerializer):
+            nested_columns, nested_related, nested_prefetches = _plan(model_field.related_model, field)
+            related.append(attr)
+            related.extend(f'{attr}__{path}' for path in nested_related)
+            if nested_columns is not None:
+                columns.update(f'{attr}__{column}' for column in nested_columns)
+            prefetches.extend(
+                Prefetch(f'{attr}__{prefetch.prefetch_through}', queryset=prefetch.queryset)
+                for prefetch in nested_prefetches
+            )
+        elif model_field.is_relation and '.' in field.source:
+            related.append(attr)
+
+    return (columns if restricted else None), related, prefetches
+
+
+def optimize_queryset(queryset, serializer):
+    """``queryset`` loading only the columns and relations ``serializer`` renders"""
+    columns, related, prefetches = _plan(queryset.model, serializer)
+    if related:
+        queryset = queryset.select_related(*related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if columns is not None:
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+class SparseFieldsetViewMixin:
+    """Generic-view mixin that loads only what the (possibly narrowed) serializer renders"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Unions and values() querysets already select their columns
+        if (
+            self.request.method not in SAFE_METHODS
+            or queryset.query.combinator or queryset.query.values_select
+        ):
+            return queryset
+        return optimize_queryset(queryset, self.get_serializer())
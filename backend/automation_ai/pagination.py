@@ -0,0 +1,59 @@
+"""
+Pagination helpers shared across the project.
+"""
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+
+def estimate_table_rows(model, using='default'):
+    """Return the planner's row estimate for a model's table, or None if unavailable"""
+    connection = connections[using]
+    table = model._meta.db_table
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table]
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+        else:
+            # SQLite keeps no cheap row statistics
+            return None
+        row = cursor.fetchone()
+
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses table statistics instead of COUNT(*) for large unfiltered querysets"""
+
+    @cached_property
+    def count(self):
+        object_list = self.object_list
+        if (
+            settings.ADMIN_PERFORMANCE_MODE
+            and isinstance(object_list, QuerySet)
+            and not object_list.query.where
+        ):
+            estimate = estimate_table_rows(object_list.model, using=object_list.db)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class LargePagePagination(PageNumberPagination):
+    """PAGE_SIZE rows by default; clients may ask for up to LIST_MAX_PAGE_SIZE with ?page_size="""
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return settings.LIST_MAX_PAGE_SIZE
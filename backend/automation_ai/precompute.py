@@ -0,0 +1,86 @@
+"""
+Scheduled precomputation of expensive artifacts.
+
+Similarity clusters, dashboard statistics, department summaries and report
+PDFs are rebuilt by Celery beat jobs (PRECOMPUTE_SCHEDULES) outside working
+hours, so daytime requests read stored results instead of computing them.
+
+Each artifact is stored together with a fingerprint of its inputs, a digest
+of the row count, highest id and latest ``updated_at`` of the assessments it
+was built from. Jobs compare fingerprints first and only rebuild what
+changed. Requests compute the same fingerprint with one indexed aggregate and
+use the stored artifact only when it matches, so a precomputed result is never
+served stale; on a mismatch they compute and store it as before.
+
+Every run is timed and its artifacts counted as refreshed, skipped or failed
+in the ``precompute_*`` metrics on /metrics. Celery task durations are
+recorded separately in ``celery_task_duration_seconds``.
+"""
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+
+from django.db.models import Count, Max
+
+from monitoring.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+PRECOMPUTE_SECONDS = REGISTRY.histogram(
+    'precompute_run_duration_seconds', 'Scheduled precompute job run time',
+    ['job']
+)
+PRECOMPUTE_ITEMS = REGISTRY.counter(
+    'precompute_items_total', 'Artifacts checked by scheduled precompute jobs',
+    ['job', 'outcome']
+)
+
+
+def fingerprint(*parts):
+    """Digest of the values identifying an artifact's inputs"""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def contents_fingerprint(queryset):
+    """(row count, fingerprint) of a queryset's rows; changes when a row is added, updated or deleted"""
+    contents = queryset.aggregate(count=Count('id'), last_id=Max('id'), updated=Max('updated_at'))
+    return contents['count'], fingerprint(contents['count'], contents['last_id'], contents['updated'])
+
+
+class PrecomputeRun:
+    """Outcome counts of one job run"""
+
+    def __init__(self, job):
+        self.job = job
+        self.counts = {'refreshed': 0, 'skipped': 0, 'failed': 0}
+
+    def record(self, outcome, amount=1):
+        if amount:
+            self.counts[outcome] += amount
+            PRECOMPUTE_ITEMS.inc(amount, job=self.job, outcome=outcome)
+
+    @contextmanager
+    def item(self, label):
+        """Record one artifact's rebuild as refreshed, or as failed without stopping the run"""
+        try:
+            yield
+        except Exception:
+            logger.exception('Precompute job %s failed for %s', self.job, label)
+            self.record('failed')
+        else:
+            self.record('refreshed')
+
+
+@contextmanager
+def precompute_run(job):
+    """Time a job run and log its outcome counts"""
+    run = PrecomputeRun(job)
+    start = time.perf_counter()
+    try:
+        yield run
+    finally:
+        elapsed = time.perf_counter() - start
+        PRECOMPUTE_SECONDS.observe(elapsed, job=job)
+        REGISTRY.maybe_flush()
+        logger.info('Precompute job %s finished in %.2fs: %s', job, elapsed, run.counts)
@@ -0,0 +1,20 @@
+"""
+Optional preloading of heavy libraries.
+
+Views import numpy, scikit-learn and ReportLab lazily so that workers,
+management commands and test runs start quickly. Under gunicorn the master
+process can import them once before forking so every worker shares the
+loaded modules instead of paying for the import on its first request.
+"""
+import importlib
+
+HEAVY_MODULES = [
+    'ai_features.ml',
+    'tasks.pdf',
+]
+
+
+def preload_heavy_modules():
+    """Import the lazily loaded ML and PDF modules into the current process"""
+    for module in HEAVY_MODULES:
+        importlib.import_module(module)
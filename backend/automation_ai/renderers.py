@@ -0,0 +1,115 @@
+"""
+orjson-backed JSON rendering and parsing for the API.
+
+Large list and history responses spend much of their time in ``json.dumps``.
+``FastJSONRenderer`` produces JSON that parses to the same values as DRF's
+``JSONRenderer`` with orjson, which is several times faster:
+
+- datetimes, dates, times, numpy values and nested dicts/lists are encoded
+  natively, with UTC written as ``Z`` like DRF does;
+- everything else (Decimal as a number, lazy strings, UUIDs, querysets,
+  timedeltas...) goes through DRF's own encoder;
+- U+2028/U+2029 are escaped as DRF does.
+
+The output is not byte-identical: some floats are spelled differently
+(``1e-05`` is written ``0.00001``, ``1e+20`` as ``1e20``), which parses to the
+same values. orjson writes NaN and infinity as ``null``, silently turning a bad
+number into a missing one. A rendering that contains ``null`` is therefore
+checked for non-finite floats, and if there are any it is redone by DRF, whose
+strict mode raises an error as before. Payloads without ``null`` skip the check.
+
+Indented output (the browsable API and ``; indent=`` media types), integers
+beyond 64 bits and a missing orjson all fall back to DRF's implementation, as
+does everything when FAST_JSON_ENABLED is off.
+"""
+import codecs
+import math
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_default = JSONEncoder().default
+# Types that cannot hold a float, skipped quickly by _non_finite
+_SCALARS = frozenset({str, int, bool, type(None)})
+OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def _non_finite(data):
+    """Whether ``data`` holds a NaN or infinite float, numpy values included, which orjson writes as null"""
+    containers = [(data,)]
+    while containers:
+        container = containers.pop()
+        for value in (container.values() if isinstance(container, dict) else container):
+            if type(value) in _SCALARS:
+                continue
+            if isinstance(value, float):
+                if not math.isfinite(value):
+                    return True
+            elif isinstance(value, (dict, list, tuple)):
+                containers.append(value)
+            elif type(value).__module__ == 'numpy' and value.dtype.kind in 'fc':
+                import numpy
+                if not numpy.isfinite(value).all():
+                    return True
+    return False
+
+
+def fast_json_enabled():
+    return orjson is not None and settings.FAST_JSON_ENABLED
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer's output up to float spelling, encoded with orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if not fast_json_enabled() or indent or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            rendered = orjson.dumps(data, default=_default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the standard library handles
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'null' in rendered and _non_finite(data):
+            # DRF rejects NaN and infinity instead of writing null
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, so the output stays a strict JavaScript subset
+        if b'\xe2\x80' in rendered:
+            rendered = rendered.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return rendered
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Lets DRF accept ``Accept: application/x-ndjson``; renders a response's data as a single line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return FastJSONRenderer().render(data) + b'\n'
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes UTF-8 request bodies with orjson"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not fast_json_enabled() or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -3,8 +3,9 @@ Django settings for automation_ai project.
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -37,9 +38,12 @@ INSTALLED_APPS = [
     'tasks',
     'automation',
     'ai_features',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    'monitoring.metrics.MetricsMiddleware',
+    'automation_ai.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -48,6 +52,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'monitoring.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'automation_ai.urls'
@@ -108,12 +113,187 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='automation-ai'),
+    }
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
+# Admin performance settings
+# Use planner estimates instead of COUNT(*) for large unfiltered changelists
+ADMIN_PERFORMANCE_MODE = config('ADMIN_PERFORMANCE_MODE', default=True, cast=bool)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+ADMIN_FACET_CACHE_TIMEOUT = config('ADMIN_FACET_CACHE_TIMEOUT', default=300, cast=int)
+
+# Startup performance
+# Budget enforced by `manage.py benchmark_startup`
+STARTUP_BUDGET_SECONDS = config('STARTUP_BUDGET_SECONDS', default=1.5, cast=float)
+
+# Scoring simulation
+# Score matrices kept in memory per worker process for what-if simulations
+SIMULATION_CACHE_SIZE = config('SIMULATION_CACHE_SIZE', default=4, cast=int)
+
+# Portfolio optimizer
+# Weeks of implementation capacity consumed by each implementation_effort tier
+PORTFOLIO_EFFORT_WEEKS = {
+    'low': config('PORTFOLIO_LOW_EFFORT_WEEKS', default=2, cast=int),
+    'medium': config('PORTFOLIO_MEDIUM_EFFORT_WEEKS', default=8, cast=int),
+    'high': config('PORTFOLIO_HIGH_EFFORT_WEEKS', default=13, cast=int),
+}
+PORTFOLIO_EXACT_GRID_LIMIT = config('PORTFOLIO_EXACT_GRID_LIMIT', default=25000000, cast=int)
+# Larger candidate sets must be optimized in the background
+PORTFOLIO_SYNC_MAX_CANDIDATES = config('PORTFOLIO_SYNC_MAX_CANDIDATES', default=20000, cast=int)
+PORTFOLIO_JOB_TIMEOUT = config('PORTFOLIO_JOB_TIMEOUT', default=86400, cast=int)
+
+# Duplicate detection
+# MinHash signature length and LSH bands; DEDUP_NUM_PERM must be a multiple of DEDUP_BANDS
+DEDUP_NUM_PERM = config('DEDUP_NUM_PERM', default=128, cast=int)
+DEDUP_BANDS = config('DEDUP_BANDS', default=32, cast=int)
+DEDUP_SIMILARITY_THRESHOLD = config('DEDUP_SIMILARITY_THRESHOLD', default=0.5, cast=float)
+DEDUP_MAX_SCORE_DISTANCE = config('DEDUP_MAX_SCORE_DISTANCE', default=4, cast=int)
+DEDUP_MAX_BUCKET_SIZE = config('DEDUP_MAX_BUCKET_SIZE', default=50, cast=int)
+
+# ML compute pool
+# 'process' runs ML work in a pool of spawned processes per worker, 'inline' in the calling thread
+ML_EXECUTOR = config('ML_EXECUTOR', default='process')
+# Host-wide limit on concurrent ML tasks, shared by every worker through lock files in ML_SLOT_DIR
+ML_MAX_CONCURRENCY = config('ML_MAX_CONCURRENCY', default=max(1, (os.cpu_count() or 2) // 2), cast=int)
+ML_THREADS_PER_TASK = config('ML_THREADS_PER_TASK', default=1, cast=int)
+ML_SLOT_DIR = config('ML_SLOT_DIR', default=os.path.join(tempfile.gettempdir(), 'automation-ai-ml-slots'))
+# Seconds a request waits for a free slot before it is answered with 429
+ML_QUEUE_TIMEOUT = config('ML_QUEUE_TIMEOUT', default=5, cast=float)
+
+# Request coalescing
+# Identical concurrent analyses and exports share one computation; across workers this needs a shared cache
+SINGLEFLIGHT_ENABLED = config('SINGLEFLIGHT_ENABLED', default=True, cast=bool)
+# How long a finished result stays available to identical requests from other workers
+SINGLEFLIGHT_RESULT_TTL = config('SINGLEFLIGHT_RESULT_TTL', default=5, cast=int)
+# Upper bound on one computation; the cross-worker lock expires after this
+SINGLEFLIGHT_LOCK_TIMEOUT = config('SINGLEFLIGHT_LOCK_TIMEOUT', default=120, cast=int)
+# How long other workers wait for the leader before computing themselves
+SINGLEFLIGHT_WAIT_TIMEOUT = config('SINGLEFLIGHT_WAIT_TIMEOUT', default=60, cast=float)
+
+# Template suggestions
+# Share of the match score given to keyword matches when draft scores are also provided
+TEMPLATE_KEYWORD_WEIGHT = config('TEMPLATE_KEYWORD_WEIGHT', default=0.5, cast=float)
+# Seconds before a worker rebuilds its template index even without a change notification
+TEMPLATE_INDEX_MAX_AGE = config('TEMPLATE_INDEX_MAX_AGE', default=300, cast=int)
+
+# Job events (Server-Sent Events)
+# 'memory' only reaches streams in the same process; use 'redis' with several workers or Celery
+EVENTS_BACKEND = config('EVENTS_BACKEND', default='memory')
+EVENTS_REDIS_URL = config('EVENTS_REDIS_URL', default=config('REDIS_URL', default='redis://localhost:6379/0'))
+# Events kept per user so reconnecting clients can catch up with Last-Event-ID
+EVENTS_REPLAY_SIZE = config('EVENTS_REPLAY_SIZE', default=50, cast=int)
+EVENTS_REPLAY_TTL = config('EVENTS_REPLAY_TTL', default=600, cast=int)
+EVENTS_KEEPALIVE_SECONDS = config('EVENTS_KEEPALIVE_SECONDS', default=15, cast=float)
+# Streams are closed after this long and the browser reconnects, so workers are not held indefinitely
+EVENTS_STREAM_MAX_SECONDS = config('EVENTS_STREAM_MAX_SECONDS', default=300, cast=float)
+EVENTS_PROGRESS_INTERVAL = config('EVENTS_PROGRESS_INTERVAL', default=0.5, cast=float)
+# Seconds a ?ticket= from /api/events/ticket/ can be used to open a stream
+EVENTS_TICKET_MAX_AGE = config('EVENTS_TICKET_MAX_AGE', default=60, cast=int)
+
+# Organization dashboards
+# Department summaries older than this are rebuilt on the next organization dashboard request
+ORGANIZATION_SUMMARY_MAX_AGE = config('ORGANIZATION_SUMMARY_MAX_AGE', default=300, cast=int)
+ORGANIZATION_TOP_PROCESSES = config('ORGANIZATION_TOP_PROCESSES', default=5, cast=int)
+
+# Archival
+# Rows past these horizons are moved to archive tables by archive_old_records; 0 keeps them live
+ARCHIVE_ANALYSIS_DAYS = config('ARCHIVE_ANALYSIS_DAYS', default=90, cast=int)
+ARCHIVE_ASSESSMENT_DAYS = config('ARCHIVE_ASSESSMENT_DAYS', default=730, cast=int)
+# Rows copied and deleted per transaction
+ARCHIVE_BATCH_SIZE = config('ARCHIVE_BATCH_SIZE', default=5000, cast=int)
+
+# Rate limiting
+# Token buckets per user (or client IP) and for the whole deployment; limits hold across workers with a shared cache
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+RATE_LIMIT_USER_CAPACITY = config('RATE_LIMIT_USER_CAPACITY', default=120, cast=float)
+# Tokens added per second
+RATE_LIMIT_USER_REFILL = config('RATE_LIMIT_USER_REFILL', default=2, cast=float)
+# A hard cap for the whole deployment, shared fairly between clients under contention; size it to what
+# the servers can take before enabling it, or every client is held to a share of a guess
+RATE_LIMIT_GLOBAL_ENABLED = config('RATE_LIMIT_GLOBAL_ENABLED', default=False, cast=bool)
+RATE_LIMIT_GLOBAL_CAPACITY = config('RATE_LIMIT_GLOBAL_CAPACITY', default=2000, cast=float)
+RATE_LIMIT_GLOBAL_REFILL = config('RATE_LIMIT_GLOBAL_REFILL', default=100, cast=float)
+RATE_LIMIT_DEFAULT_COST = config('RATE_LIMIT_DEFAULT_COST', default=1, cast=float)
+# Tokens per request by URL name, for CPU-heavy endpoints; 0 exempts an endpoint
+RATE_LIMIT_COSTS = {
+    'similarity-analysis': 10,
+    'predict-success': 2,
+    'optimization-suggestions': 2,
+    'download-report-pdf': 20,
+    'download-report-csv': 5,
+    'bulk-assessment': 10,
+    'optimize-portfolio': 10,
+    'simulate-scoring-rules': 5,
+    'detect-duplicates': 10,
+    'export-assessments': 20,
+    'export-analyses': 20,
+}
+
+# Response encoding
+# JSON is rendered and parsed with orjson when it is installed; off uses DRF's encoder
+FAST_JSON_ENABLED = config('FAST_JSON_ENABLED', default=True, cast=bool)
+# Assessment list pages are built from values_list() rows instead of model instances; off uses the serializer
+FAST_LIST_ENABLED = config('FAST_LIST_ENABLED', default=True, cast=bool)
+# Largest ?page_size= accepted by the assessment list
+LIST_MAX_PAGE_SIZE = config('LIST_MAX_PAGE_SIZE', default=1000, cast=int)
+# Responses of at least COMPRESSION_MIN_SIZE bytes are sent with brotli (when installed) or gzip
+COMPRESSION_ENABLED = config('COMPRESSION_ENABLED', default=True, cast=bool)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=4, cast=int)
+# Path prefixes never compressed: responses mixing secrets with request input are open to BREACH
+COMPRESSION_EXCLUDE_PATHS = config('COMPRESSION_EXCLUDE_PATHS', default='/api/auth/', cast=Csv())
+
+# Exports
+# Rows read per query by the NDJSON export endpoints; memory use scales with this, not with the export
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=1000, cast=int)
+
+# Scheduled precomputation
+# Celery beat crontab schedules (minute hour day-of-month month day-of-week) in TIME_ZONE; an empty schedule disables a job
+PRECOMPUTE_SCHEDULES = {
+    'ai_features.tasks.precompute_similarity_clusters_task': config('SCHEDULE_SIMILARITY_CLUSTERS', default='0 2 * * *'),
+    'tasks.tasks.precompute_dashboard_stats_task': config('SCHEDULE_DASHBOARD_STATS', default='30 2 * * *'),
+    'tasks.tasks.precompute_report_pdfs_task': config('SCHEDULE_REPORT_PDFS', default='0 3 * * *'),
+    'tasks.tasks.refresh_report_conclusions_task': config('SCHEDULE_REPORT_CONCLUSIONS', default='30 3 * * *'),
+    'tasks.tasks.archive_old_records_task': config('SCHEDULE_ARCHIVE_OLD_RECORDS', default='0 4 * * 0'),
+    'tasks.tasks.refresh_department_summaries_task': config('SCHEDULE_DEPARTMENT_SUMMARIES', default='*/5 * * * *'),
+}
+# Similarity clusters are precomputed for users who ran an analysis within this many days
+PRECOMPUTE_ACTIVE_DAYS = config('PRECOMPUTE_ACTIVE_DAYS', default=30, cast=int)
+# PDFs are precomputed for reports created within this many days
+PRECOMPUTE_REPORT_PDF_DAYS = config('PRECOMPUTE_REPORT_PDF_DAYS', default=30, cast=int)
+# Rendered report PDFs; keep this outside MEDIA_ROOT and shared by the web and Celery workers
+# (an empty value must not fall back to MEDIA_ROOT, as FileSystemStorage would)
+REPORT_PDF_ROOT = config('REPORT_PDF_ROOT', default='') or str(BASE_DIR / 'report_pdfs')
+# Seconds precomputed dashboard statistics stay cached; longer than the schedule so entries survive until the next run
+PRECOMPUTE_CACHE_TTL = config('PRECOMPUTE_CACHE_TTL', default=172800, cast=int)
+
+# Request profiling
+# The profiling middleware is removed at startup unless PROFILING_ENABLED is set
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_TOKEN = config('PROFILING_TOKEN', default='')
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_MAX_FILES = config('PROFILING_MAX_FILES', default=200, cast=int)
+
+# Metrics
+# Processes sharing METRICS_DIR are aggregated by the /metrics endpoint
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5.0, cast=float)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -123,6 +303,18 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'automation_ai.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'automation_ai.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'automation_ai.throttling.TokenBucketThrottle',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -0,0 +1,103 @@
+"""
+Request coalescing (single-flight) for expensive computations.
+
+Double-clicks and dashboards polling from several tabs send identical
+requests at the same moment. ``single_flight`` runs the computation once per
+key and hands the result to every caller that asked for it meanwhile:
+
+- Within a process, concurrent callers with the same key wait for the first
+  one (the leader) and share its result or exception.
+- Across workers, the leader holds a lock added to the cache, and finishes by
+  storing its result for SINGLEFLIGHT_RESULT_TTL seconds. Other workers poll
+  for that result instead of starting their own computation. When the lock
+  disappears without a result (the leader failed) or nothing arrives within
+  SINGLEFLIGHT_WAIT_TIMEOUT seconds, they compute it themselves.
+
+Cross-worker coalescing needs a shared cache backend (Redis, Memcached, or the
+file-based cache for a single host). With the default locmem cache it only
+applies within a process.
+"""
+import hashlib
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from monitoring.metrics import REGISTRY
+
+SINGLEFLIGHT_SHARED = REGISTRY.counter(
+    'singleflight_shared_total', 'Requests answered with the result of an identical in-flight computation',
+    ['operation', 'scope']
+)
+
+POLL_INTERVAL = 0.05
+_MISSING = object()
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def flight_key(operation, *parts):
+    """Cache key for an operation and the values that identify its input"""
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'singleflight:{operation}:{digest}'
+
+
+def _run_across_workers(key, operation, compute):
+    result_key, lock_key = f'{key}:result', f'{key}:lock'
+    deadline = time.monotonic() + settings.SINGLEFLIGHT_WAIT_TIMEOUT
+    while True:
+        result = cache.get(result_key, _MISSING)
+        if result is not _MISSING:
+            SINGLEFLIGHT_SHARED.inc(operation=operation, scope='cache')
+            return result
+        if cache.add(lock_key, os.getpid(), settings.SINGLEFLIGHT_LOCK_TIMEOUT):
+            try:
+                result = compute()
+                cache.set(result_key, result, settings.SINGLEFLIGHT_RESULT_TTL)
+                return result
+            finally:
+                cache.delete(lock_key)
+        if time.monotonic() >= deadline:
+            return compute()
+        time.sleep(POLL_INTERVAL)
+
+
+def single_flight(operation, parts, compute):
+    """Return ``compute()``, sharing one run among concurrent callers with the same operation and parts"""
+    if not settings.SINGLEFLIGHT_ENABLED:
+        return compute()
+
+    key = flight_key(operation, *parts)
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        flight.done.wait()
+        SINGLEFLIGHT_SHARED.inc(operation=operation, scope='process')
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = _run_across_workers(key, operation, compute)
+        return flight.result
+    except Exception as error:
+        flight.error = error
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
@@ -0,0 +1,223 @@
+"""
+Cost-weighted token-bucket rate limiting for the API.
+
+Every DRF request spends tokens from its client's bucket (the user, or the
+client IP when anonymous) kept in the cache. A request costs
+RATE_LIMIT_COSTS[url name] tokens, 1 by default, so a PDF export drains a
+bucket far faster than a list page. Buckets refill continuously at their
+*_REFILL rate up to their *_CAPACITY. A client's request is let through when
+its bucket holds at least one token (or its cost, if smaller) and is then
+charged in full, which may leave the bucket in debt until it refills. A
+client's expensive request therefore cannot be starved by its own stream of
+cheap ones, and its bucket is overspent by at most one request.
+
+With RATE_LIMIT_GLOBAL_ENABLED, requests also spend from a bucket shared by
+everybody. That bucket is a hard cap: it must hold a request's full cost and
+is never overspent. While it is below half full, each client is also held to
+an equal share of it, the global refill divided by the clients that sent a
+request in the last ACTIVE_WINDOW seconds or so. Shares are counted in
+tokens, so under contention a client sending PDF exports gets the same
+tokens per second as one sending list requests, not twenty times more;
+uncontended, the shares are not checked and any client may use the spare
+capacity. Otherwise the request gets 429 with a Retry-After header saying
+when the bucket will be usable again.
+
+Each bucket is stored as the time at which it will be full again, so an update
+is a single read and write. Each bucket is updated under a short lock taken
+with ``cache.add``, which keeps concurrent requests from overspending it,
+across workers as well when the cache is shared. A shared cache such as Redis
+is needed for limits to hold across workers; with the default locmem cache
+each process enforces its own buckets. A bucket whose lock cannot be taken in
+time is updated without it, and when the cache fails altogether requests are
+let through: the limiter protects CPU, it should not become an outage itself.
+
+``manage.py benchmark_rate_limits`` drives the limiter from concurrent
+clients and checks that no client and no bucket exceeds its budget, and that
+clients get the same share of tokens whatever their requests cost.
+"""
+import logging
+import math
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from monitoring.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_REJECTIONS = REGISTRY.counter(
+    'rate_limit_rejections_total', 'Requests rejected by the token-bucket rate limiter', ['endpoint', 'bucket']
+)
+
+# Seconds before a lock left by a crashed worker expires, and before a waiting request stops waiting
+LOCK_TIMEOUT = 1
+LOCK_WAIT = 0.05
+LOCK_RETRY_INTERVAL = 0.001
+# Seconds per window in which active clients are counted for the global fair share
+ACTIVE_WINDOW = 1
+
+
+def request_cost(url_name):
+    return settings.RATE_LIMIT_COSTS.get(url_name, settings.RATE_LIMIT_DEFAULT_COST)
+
+
+class TokenBucket:
+    """A bucket's parameters and its state key; the state is the time the bucket is full again
+
+    With ``overdraft`` a request needs one token and may leave the bucket in
+    debt; without it, the bucket must hold the request's full cost.
+    """
+
+    def __init__(self, name, key, capacity, refill, overdraft=True):
+        self.name = name
+        self.key = key
+        self.capacity = capacity
+        self.refill = refill
+        self.overdraft = overdraft
+
+    def applies(self, states, now):
+        """Whether requests spend from this bucket, given the states of all buckets"""
+        return True
+
+    def tokens(self, full_at, now):
+        """Tokens left, negative while the bucket is in debt"""
+        if full_at is None or full_at <= now:
+            return self.capacity
+        return self.capacity - (full_at - now) * self.refill
+
+    def spend(self, full_at, now, cost):
+        """New state after spending ``cost``, or the seconds to wait when too few tokens are left"""
+        available = self.tokens(full_at, now)
+        required = min(cost, 1) if self.overdraft else cost
+        if available >= required:
+            return now + (self.capacity - available + cost) / self.refill, 0.0
+        return full_at, (required - available) / self.refill
+
+
+class FairShareBucket(TokenBucket):
+    """A client's equal share of the global bucket, spent from only while the global bucket is below half full"""
+
+    def __init__(self, key, global_bucket, clients):
+        super().__init__('share', key, global_bucket.capacity / clients, global_bucket.refill / clients)
+        self.global_bucket = global_bucket
+
+    def applies(self, states, now):
+        return self.global_bucket.tokens(states.get(self.global_bucket.key), now) < self.global_bucket.capacity / 2
+
+
+def active_clients(prefix, client, now=None):
+    """Clients that sent a request in this window or the previous one, counting ``client``"""
+    window = int((time.time() if now is None else now) // ACTIVE_WINDOW)
+    key = f'{prefix}:active:{window}'
+    if cache.add(f'{key}:{client}', 1, ACTIVE_WINDOW * 2):
+        cache.add(key, 0, ACTIVE_WINDOW * 2)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The window's count expired in between; the next window counts again
+            pass
+    counts = cache.get_many([key, f'{prefix}:active:{window - 1}'])
+    return max(1, *counts.values())
+
+
+# Threads of this process queue on a blocking lock, so only one of them at a time polls the cache lock
+_local_locks = [threading.Lock() for _ in range(64)]
+
+
+@contextmanager
+def _locked(buckets):
+    """Hold the locks of ``buckets`` in order; after LOCK_WAIT without a lock the update goes ahead unlocked"""
+    local_held, cache_held = [], []
+    try:
+        for bucket in buckets:
+            local = _local_locks[zlib.crc32(bucket.key.encode()) % len(_local_locks)]
+            if local not in local_held and local.acquire(timeout=LOCK_WAIT):
+                local_held.append(local)
+            deadline = time.monotonic() + LOCK_WAIT
+            while True:
+                if cache.add(f'{bucket.key}:lock', 1, LOCK_TIMEOUT):
+                    cache_held.append(f'{bucket.key}:lock')
+                    break
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(LOCK_RETRY_INTERVAL)
+        yield
+    finally:
+        if cache_held:
+            cache.delete_many(cache_held)
+        for local in reversed(local_held):
+            local.release()
+
+
+def consume(buckets, cost, now=None):
+    """Spend ``cost`` from every bucket, or from none; returns (allowed, seconds to wait, limiting bucket)"""
+    with _locked(buckets):
+        now = time.time() if now is None else now
+        states = cache.get_many([bucket.key for bucket in buckets])
+        updates = {}
+        for bucket in buckets:
+            if not bucket.applies(states, now):
+                continue
+            full_at, wait = bucket.spend(states.get(bucket.key), now, cost)
+            if wait:
+                return False, wait, bucket
+            updates[bucket.key] = full_at
+        # Once full a bucket needs no state, so it expires when it is full again
+        cache.set_many(updates, max(1, math.ceil(max(updates.values()) - now)))
+        return True, 0.0, None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Per-client and optional global token buckets, spending RATE_LIMIT_COSTS tokens per request"""
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_buckets(self, request):
+        if request.user and request.user.is_authenticated:
+            client = f'user:{request.user.pk}'
+        else:
+            client = f'ip:{self.get_ident(request)}'
+        buckets = [
+            TokenBucket(
+                'client', f'ratelimit:{client}',
+                settings.RATE_LIMIT_USER_CAPACITY, settings.RATE_LIMIT_USER_REFILL,
+            ),
+        ]
+        if settings.RATE_LIMIT_GLOBAL_ENABLED:
+            global_bucket = TokenBucket(
+                'global', 'ratelimit:global',
+                settings.RATE_LIMIT_GLOBAL_CAPACITY, settings.RATE_LIMIT_GLOBAL_REFILL, overdraft=False,
+            )
+            # The share is checked against the global bucket's state, so it comes before it
+            share = FairShareBucket(
+                f'ratelimit:{client}:share', global_bucket, active_clients('ratelimit', client)
+            )
+            buckets += [share, global_bucket]
+        return buckets
+
+    def allow_request(self, request, view):
+        if not settings.RATE_LIMIT_ENABLED:
+            return True
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        cost = request_cost(url_name)
+        if cost <= 0:
+            return True
+
+        try:
+            allowed, wait, bucket = consume(self.get_buckets(request), cost)
+        except Exception:
+            logger.warning('Rate limiter unavailable; letting the request through', exc_info=True)
+            return True
+        if not allowed:
+            self.retry_after = wait
+            RATE_LIMIT_REJECTIONS.inc(endpoint=url_name or 'unknown', bucket=bucket.name)
+        return allowed
+
+    def wait(self):
+        return self.retry_after
@@ -6,6 +6,9 @@ from django.conf.urls.static import static
 from django.http import JsonResponse
 from django.shortcuts import redirect, render
 
+from monitoring.views import metrics
+from .views import event_stream, event_ticket
+
 def api_root(request):
     """API root endpoint with information about available endpoints"""
     # Check if request accepts HTML (browser) or JSON (API client)
@@ -28,6 +31,7 @@ def api_root(request):
             'tasks_and_reports': f'{base_url}/api/tasks/',
             'automation_templates': f'{base_url}/api/automation/',
             'ai_features': f'{base_url}/api/ai/',
+            'events': f'{base_url}/api/events/',
         },
         'frontend_application': 'http://localhost:3000',
         'key_features': [
@@ -63,6 +67,10 @@ urlpatterns = [
     path('api/tasks/', include('tasks.urls')),
     path('api/automation/', include('automation.urls')),
     path('api/ai/', include('ai_features.urls')),
+    path('api/monitoring/', include('monitoring.urls')),
+    path('api/events/', event_stream, name='event-stream'),
+    path('api/events/ticket/', event_ticket, name='event-ticket'),
+    path('metrics', metrics, name='metrics'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,50 @@
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.authentication import EventTicketAuthentication, issue_event_ticket
+from .events import stream_events
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF accept ``Accept: text/event-stream``; only error responses are rendered through it"""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode()
+
+
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication, EventTicketAuthentication, SessionAuthentication])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+@permission_classes([IsAuthenticated])
+def event_stream(request):
+    """Server-Sent Events stream of the user's job progress and completion events"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    response = StreamingHttpResponse(
+        stream_events(request.user.id, last_event_id), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def event_ticket(request):
+    """Short-lived ticket for opening the event stream with ?ticket=, instead of putting the JWT in the URL"""
+    return Response({'ticket': issue_event_ticket(request.user), 'expires_in': settings.EVENTS_TICKET_MAX_AGE})
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for automation_ai project.
+"""
+from pathlib import Path
+
+# Module-level names are read as Gunicorn settings, and `config` is one of them
+import decouple
+
+# Each open /api/events/ stream holds a thread for up to EVENTS_STREAM_MAX_SECONDS, so workers are threaded;
+# more than one worker needs EVENTS_BACKEND=redis for events to reach every stream
+worker_class = 'gthread'
+workers = decouple.config('GUNICORN_WORKERS', default=1, cast=int)
+threads = decouple.config('GUNICORN_THREADS', default=16, cast=int)
+
+# Load the Django application in the master so workers are forked with it in memory
+preload_app = decouple.config('PRELOAD_HEAVY_MODULES', default=False, cast=bool)
+
+
+def on_starting(server):
+    """Reset per-worker metric snapshots and optionally preload heavy libraries"""
+    metrics_dir = decouple.config('METRICS_DIR', default='')
+    if metrics_dir:
+        for snapshot in Path(metrics_dir).glob('metrics-*.json'):
+            snapshot.unlink(missing_ok=True)
+    
+    # Import heavy ML and PDF libraries once in the master process
+    if preload_app:
+        from automation_ai.preload import preload_heavy_modules
+        preload_heavy_modules()
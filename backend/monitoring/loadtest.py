@@ -0,0 +1,331 @@
+"""
+Synthetic data and endpoint scenarios for the API load benchmark.
+
+Used by `manage.py benchmark_api`, which runs every scenario through Django's
+test client against a throwaway test database.
+"""
+import math
+import random
+import time
+import tracemalloc
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User, UserProfile
+from ai_features.models import ProcessAnalysis
+from automation.matching import invalidate_template_index
+from automation.models import AutomationTemplate
+from tasks.models import AssessmentReport, DuplicateCandidate, ProcessAssessment
+
+DEPARTMENTS = ['Finance', 'HR', 'IT', 'Operations', 'Sales', 'Procurement', 'Legal', 'Support']
+SCORE_FIELDS = [
+    'repetitiveness_score', 'rule_based_score', 'complexity_score',
+    'volume_score', 'standardization_score', 'current_errors_score',
+]
+EFFORT_CHOICES = ['low', 'medium', 'high', '']
+
+
+def random_scores(rng):
+    return {field: rng.randint(1, 5) for field in SCORE_FIELDS}
+
+
+def assessment_payload(rng, index):
+    """Request body for creating one assessment"""
+    payload = {
+        'process_name': f'Benchmark process {index}',
+        'description': 'Synthetic process created by the API benchmark',
+        'department': rng.choice(DEPARTMENTS),
+        'process_owner': 'Benchmark',
+        'estimated_cost_savings': f'{rng.uniform(1000, 250000):.2f}',
+        'estimated_time_savings': f'{rng.uniform(1, 40):.2f}',
+        'implementation_effort': rng.choice(EFFORT_CHOICES),
+    }
+    payload.update(random_scores(rng))
+    return payload
+
+
+def seed_dataset(users, assessments, seed=42, batch_size=1000):
+    """Create `users` users sharing `assessments` assessments plus reports, analyses, templates and duplicates"""
+    rng = random.Random(seed)
+    password = make_password('benchmark-password')
+
+    # The first user drives the scenarios, and managers can also reach the organization-wide endpoints
+    User.objects.bulk_create([
+        User(
+            email=f'bench{i}@example.com', username=f'bench{i}',
+            first_name='Bench', last_name=f'User{i}', password=password,
+            role='manager' if i == 0 else 'user',
+        )
+        for i in range(users)
+    ])
+    user_objects = list(User.objects.filter(email__startswith='bench').order_by('id'))
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in user_objects])
+
+    rows = []
+    for index in range(assessments):
+        assessment = ProcessAssessment(
+            assessed_by=user_objects[index % users], **assessment_payload(rng, index)
+        )
+        assessment.calculate_scores()
+        assessment.calculate_savings_per_effort()
+        rows.append(assessment)
+    ProcessAssessment.objects.bulk_create(rows, batch_size=batch_size)
+
+    Membership = AssessmentReport.assessments.through
+    memberships = []
+    for user in user_objects:
+        ids = list(ProcessAssessment.objects.filter(assessed_by=user).values_list('id', flat=True))
+        for number in range(2):
+            report = AssessmentReport.objects.create(
+                title=f'Benchmark report {number}', generated_by=user
+            )
+            sample = rng.sample(ids, min(len(ids), 50))
+            memberships.extend(
+                Membership(assessmentreport_id=report.id, processassessment_id=assessment_id)
+                for assessment_id in sample
+            )
+    Membership.objects.bulk_create(memberships, batch_size=batch_size)
+
+    ProcessAnalysis.objects.bulk_create([
+        ProcessAnalysis(
+            process_name=f'Benchmark analysis {i}',
+            analysis_type=rng.choice(['similarity', 'optimization', 'prediction']),
+            input_data=random_scores(rng),
+            analysis_results={'success_probability': rng.uniform(0, 100)},
+            confidence_score=0.85,
+            analyzed_by=user_objects[i % users],
+        )
+        for i in range(users * 10)
+    ], batch_size=batch_size)
+
+    AutomationTemplate.objects.bulk_create([
+        AutomationTemplate(
+            name=f'Template {i}', description='Synthetic template',
+            category=rng.choice(DEPARTMENTS),
+        )
+        for i in range(25)
+    ])
+    # bulk_create skips AutomationTemplate.save(), which normally invalidates the suggestion index
+    invalidate_template_index()
+
+    ids = list(ProcessAssessment.objects.order_by('id').values_list('id', flat=True))
+    DuplicateCandidate.objects.bulk_create([
+        DuplicateCandidate(
+            assessment_id=ids[i], duplicate_id=ids[i + 1],
+            similarity=rng.uniform(0.8, 1), score_distance=rng.randint(0, 3),
+        )
+        for i in range(0, len(ids) - 1, 20)
+    ], batch_size=batch_size)
+
+    return user_objects
+
+
+class BenchmarkContext:
+    """State shared by the scenarios of one benchmark run"""
+
+    def __init__(self, user, seed):
+        self.user = user
+        self.rng = random.Random(seed)
+        self.counter = 0
+
+    def next_index(self):
+        self.counter += 1
+        return self.counter
+
+    def assessment_id(self):
+        return ProcessAssessment.objects.filter(assessed_by=self.user).values_list('id', flat=True).first()
+
+    def report_id(self):
+        return AssessmentReport.objects.filter(generated_by=self.user).values_list('id', flat=True).first()
+
+    def disposable_assessment_id(self):
+        assessment = ProcessAssessment(
+            assessed_by=self.user, **assessment_payload(self.rng, self.next_index())
+        )
+        assessment.save()
+        return assessment.id
+
+
+class Scenario:
+    """One endpoint call; `build(ctx)` returns (path, data) and may do untimed setup"""
+
+    def __init__(self, name, method, build):
+        self.name = name
+        self.method = method
+        self.build = build
+
+
+def _scores_payload(ctx):
+    return {'process_name': 'Benchmark prediction', 'scores': random_scores(ctx.rng)}
+
+
+def _report_payload(ctx):
+    ids = list(ProcessAssessment.objects.filter(assessed_by=ctx.user).values_list('id', flat=True)[:25])
+    return {'title': f'Benchmark report {ctx.next_index()}', 'assessment_ids': ids}
+
+
+def _simulation_payload(ctx):
+    return {'weights': {field: ctx.rng.uniform(0.5, 2) for field in SCORE_FIELDS}}
+
+
+def _register_payload(ctx):
+    index = ctx.next_index()
+    return {
+        'email': f'register{index}@example.com', 'username': f'register{index}',
+        'first_name': 'Load', 'last_name': 'Test',
+        'password': 'benchmark-password', 'password_confirm': 'benchmark-password',
+    }
+
+
+SCENARIOS = [
+    # accounts
+    Scenario('accounts.register', 'post', lambda ctx: ('/api/auth/register/', _register_payload(ctx))),
+    Scenario('accounts.login', 'post', lambda ctx: (
+        '/api/auth/login/', {'email': ctx.user.email, 'password': 'benchmark-password'}
+    )),
+    Scenario('accounts.profile', 'get', lambda ctx: ('/api/auth/profile/', None)),
+    Scenario('accounts.profile_update', 'patch', lambda ctx: ('/api/auth/profile/update/', {'department': 'IT'})),
+    Scenario('accounts.users', 'get', lambda ctx: ('/api/auth/users/', None)),
+
+    # tasks
+    Scenario('tasks.assessment_list', 'get', lambda ctx: ('/api/tasks/assessments/', None)),
+    Scenario('tasks.assessment_create', 'post', lambda ctx: (
+        '/api/tasks/assessments/', assessment_payload(ctx.rng, ctx.next_index())
+    )),
+    Scenario('tasks.assessment_detail', 'get', lambda ctx: (f'/api/tasks/assessments/{ctx.assessment_id()}/', None)),
+    Scenario('tasks.assessment_update', 'patch', lambda ctx: (
+        f'/api/tasks/assessments/{ctx.assessment_id()}/', random_scores(ctx.rng)
+    )),
+    Scenario('tasks.assessment_delete', 'delete', lambda ctx: (
+        f'/api/tasks/assessments/{ctx.disposable_assessment_id()}/', None
+    )),
+    Scenario('tasks.assessment_bulk', 'post', lambda ctx: (
+        '/api/tasks/assessments/bulk/',
+        {'processes': [assessment_payload(ctx.rng, ctx.next_index()) for _ in range(10)]}
+    )),
+    Scenario('tasks.report_list', 'get', lambda ctx: ('/api/tasks/reports/', None)),
+    Scenario('tasks.report_create', 'post', lambda ctx: ('/api/tasks/reports/', _report_payload(ctx))),
+    Scenario('tasks.report_detail', 'get', lambda ctx: (f'/api/tasks/reports/{ctx.report_id()}/', None)),
+    Scenario('tasks.report_ai_conclusion', 'post', lambda ctx: (
+        f'/api/tasks/reports/{ctx.report_id()}/ai-conclusion/', None
+    )),
+    Scenario('tasks.report_csv', 'get', lambda ctx: (f'/api/tasks/reports/{ctx.report_id()}/download/csv/', None)),
+    Scenario('tasks.report_pdf', 'get', lambda ctx: (f'/api/tasks/reports/{ctx.report_id()}/download/pdf/', None)),
+    Scenario('tasks.assessment_ranking', 'get', lambda ctx: ('/api/tasks/assessments/ranking/', None)),
+    Scenario('tasks.assessment_ranking_org', 'get', lambda ctx: (
+        '/api/tasks/assessments/ranking/', {'scope': 'organization', 'sort': 'savings_per_effort_week'}
+    )),
+    Scenario('tasks.assessment_export', 'get', lambda ctx: ('/api/tasks/assessments/export/', None)),
+    Scenario('tasks.assessment_export_org', 'get', lambda ctx: (
+        '/api/tasks/assessments/export/', {'scope': 'organization'}
+    )),
+    Scenario('tasks.dashboard_stats', 'get', lambda ctx: ('/api/tasks/dashboard/stats/', None)),
+    Scenario('tasks.dashboard_organization', 'get', lambda ctx: ('/api/tasks/dashboard/organization/', None)),
+    Scenario('tasks.dashboard_department', 'get', lambda ctx: (
+        '/api/tasks/dashboard/department/', {'department': ctx.rng.choice(DEPARTMENTS)}
+    )),
+    Scenario('tasks.scoring_simulate', 'post', lambda ctx: (
+        '/api/tasks/scoring-rules/simulate/', _simulation_payload(ctx)
+    )),
+    Scenario('tasks.scoring_simulate_org', 'post', lambda ctx: (
+        '/api/tasks/scoring-rules/simulate/', {**_simulation_payload(ctx), 'scope': 'organization'}
+    )),
+    Scenario('tasks.portfolio_optimize', 'post', lambda ctx: (
+        '/api/tasks/portfolio/optimize/', {'budget_weeks': ctx.rng.randint(10, 200)}
+    )),
+    Scenario('tasks.portfolio_optimize_org', 'post', lambda ctx: (
+        '/api/tasks/portfolio/optimize/', {'budget_weeks': ctx.rng.randint(100, 2000), 'scope': 'organization'}
+    )),
+    Scenario('tasks.duplicate_list', 'get', lambda ctx: ('/api/tasks/duplicates/', None)),
+    Scenario('tasks.category_list', 'get', lambda ctx: ('/api/tasks/categories/', None)),
+    Scenario('tasks.category_create', 'post', lambda ctx: (
+        '/api/tasks/categories/', {'name': f'Category {ctx.next_index()}'}
+    )),
+
+    # automation
+    Scenario('automation.template_list', 'get', lambda ctx: ('/api/automation/templates/', None)),
+    Scenario('automation.template_suggest', 'get', lambda ctx: (
+        '/api/automation/templates/suggest/', {'q': 'benchmark', **random_scores(ctx.rng)}
+    )),
+    Scenario('automation.recommendation', 'post', lambda ctx: (
+        '/api/automation/recommendations/',
+        {'process_name': 'Benchmark', 'current_score': ctx.rng.randint(6, 30), 'factor_scores': random_scores(ctx.rng)}
+    )),
+
+    # ai_features
+    Scenario('ai.similarity_analysis', 'post', lambda ctx: ('/api/ai/similarity-analysis/', None)),
+    Scenario('ai.predict_success', 'post', lambda ctx: ('/api/ai/predict-success/', _scores_payload(ctx))),
+    Scenario('ai.optimization_suggestions', 'post', lambda ctx: (
+        '/api/ai/optimization-suggestions/', _scores_payload(ctx)
+    )),
+    Scenario('ai.analysis_history', 'get', lambda ctx: ('/api/ai/analysis-history/', None)),
+    Scenario('ai.analysis_export', 'get', lambda ctx: ('/api/ai/analysis-history/export/', None)),
+
+    # events
+    Scenario('events.ticket', 'post', lambda ctx: ('/api/events/ticket/', None)),
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _send(client, scenario, path, data):
+    method = getattr(client, scenario.method)
+    if data is None:
+        response = method(path)
+    elif scenario.method == 'get':
+        response = method(path, data)
+    else:
+        response = method(path, data, content_type='application/json')
+    # Streamed bodies (exports, files) are only produced while they are read
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def run_scenario(client, scenario, ctx, iterations, warmup=1):
+    """Drive one scenario and return latency percentiles, query counts and peak memory"""
+    for _ in range(warmup):
+        _send(client, scenario, *scenario.build(ctx))
+
+    latencies = []
+    query_counts = []
+    statuses = set()
+    for _ in range(iterations):
+        path, data = scenario.build(ctx)
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = _send(client, scenario, path, data)
+            latencies.append((time.perf_counter() - start) * 1000)
+        query_counts.append(len(queries))
+        statuses.add(response.status_code)
+
+    # Memory is sampled in a separate call because tracemalloc slows everything it traces
+    path, data = scenario.build(ctx)
+    tracemalloc.start()
+    try:
+        _send(client, scenario, path, data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'method': scenario.method.upper(),
+        'statuses': sorted(statuses),
+        'requests': iterations,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'max_ms': round(latencies[-1], 3),
+        'queries_per_request': round(sum(query_counts) / len(query_counts), 2),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
@@ -0,0 +1,121 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from monitoring.loadtest import SCENARIOS, BenchmarkContext, run_scenario, seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Run every API endpoint against a throwaway database and record latency, queries and memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Number of synthetic users to seed')
+        parser.add_argument('--assessments', type=int, default=2000, help='Number of synthetic assessments to seed')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for data and payloads')
+        parser.add_argument('--only', action='append', default=[], help='Only run scenarios containing this text')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument('--compare', help='Baseline JSON file from a previous --output run')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1')
+
+        scenarios = [
+            scenario for scenario in SCENARIOS
+            if not options['only'] or any(text in scenario.name for text in options['only'])
+        ]
+        if not scenarios:
+            raise CommandError('No scenarios matched --only')
+
+        # Run against a test database so the configured database is never touched
+        setup_test_environment()
+        settings.ALLOWED_HOSTS = ['*']
+        # Every scenario is driven by one user far beyond its rate limit budget
+        settings.RATE_LIMIT_ENABLED = False
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = self._run(scenarios, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {'meta': self._meta(options), 'scenarios': results}
+        self._print_table(results, options['compare'])
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def _run(self, scenarios, options):
+        self.stdout.write(
+            f"Seeding {options['users']} users and {options['assessments']} assessments..."
+        )
+        users = seed_dataset(options['users'], options['assessments'], seed=options['seed'])
+        user = users[0]
+        token = RefreshToken.for_user(user).access_token
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+        ctx = BenchmarkContext(user, options['seed'])
+
+        results = {}
+        for scenario in scenarios:
+            self.stdout.write(f'  {scenario.name}')
+            results[scenario.name] = run_scenario(
+                client, scenario, ctx, options['iterations'], warmup=options['warmup']
+            )
+        return results
+
+    def _meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': commit,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'users': options['users'],
+            'assessments': options['assessments'],
+            'iterations': options['iterations'],
+            'seed': options['seed'],
+        }
+
+    def _print_table(self, results, compare_path):
+        baseline = {}
+        if compare_path:
+            with open(compare_path) as fh:
+                baseline = json.load(fh).get('scenarios', {})
+
+        header = f"{'scenario':<34}{'status':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'peak KB':>10}"
+        if baseline:
+            header += f"{'p50 diff':>10}{'query diff':>11}"
+        self.stdout.write(header)
+
+        for name, result in results.items():
+            statuses = ','.join(str(code) for code in result['statuses'])
+            line = (
+                f"{name:<34}{statuses:>10}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                f"{result['p99_ms']:>10.2f}{result['queries_per_request']:>9.1f}{result['peak_memory_kb']:>10.1f}"
+            )
+            previous = baseline.get(name)
+            if previous:
+                p50_change = (result['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100 if previous['p50_ms'] else 0
+                query_change = result['queries_per_request'] - previous['queries_per_request']
+                line += f"{p50_change:>+9.1f}%{query_change:>+11.1f}"
+            self.stdout.write(line)
@@ -0,0 +1,86 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+
+from automation_ai.fieldsets import optimize_queryset
+from automation_ai.rows import RowSerializer
+from monitoring.loadtest import seed_dataset
+from tasks.models import ProcessAssessment
+from tasks.serializers import ProcessAssessmentListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare assessment list serialization from model instances and from values_list() rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--assessments', type=int, default=5000, help='Number of synthetic assessments to seed')
+        parser.add_argument(
+            '--page-size', type=int, action='append', default=[], help='Rows per page (default 20, 500 and 2000)'
+        )
+        parser.add_argument('--iterations', type=int, default=20, help='Timed runs per page size and mode')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for data')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+
+    def handle(self, *args, **options):
+        page_sizes = options['page_size'] or [20, 500, 2000]
+        if min(page_sizes) < 1:
+            raise CommandError('--page-size must be at least 1')
+
+        # Run against a test database so the configured database is never touched
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f"Seeding {options['assessments']} assessments...")
+            seed_dataset(1, options['assessments'], seed=options['seed'])
+            results = {size: self._measure(size, options['iterations']) for size in page_sizes}
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'rows':>6}{'instances ms':>14}{'rows ms':>10}{'speedup':>9}{'identical':>11}")
+        for size, result in results.items():
+            self.stdout.write(
+                f"{result['rows']:>6}{result['instances_ms']:>14.2f}{result['rows_ms']:>10.2f}"
+                f"{result['speedup']:>8.1f}x{'yes' if result['identical'] else 'NO':>11}"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'assessments': options['assessments'], 'page_sizes': results}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        if not all(result['identical'] for result in results.values()):
+            raise CommandError('Row serialization differs from the serializer output')
+
+    def _measure(self, size, iterations):
+        serializer = ProcessAssessmentListSerializer()
+        rows = RowSerializer.compile(serializer)
+        queryset = ProcessAssessment.objects.all()
+        # The list view loads instances through the same narrowed, joined queryset
+        instances = optimize_queryset(queryset, serializer)
+
+        def from_instances():
+            return ProcessAssessmentListSerializer(list(instances[:size]), many=True).data
+
+        def from_rows():
+            return rows.serialize(rows.rows(queryset)[:size])
+
+        expected, actual = from_instances(), from_rows()
+        timings = {}
+        for name, func in [('instances', from_instances), ('rows', from_rows)]:
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                func()
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[name] = statistics.median(samples)
+        return {
+            'rows': len(actual),
+            'instances_ms': round(timings['instances'], 3),
+            'rows_ms': round(timings['rows'], 3),
+            'speedup': round(timings['instances'] / timings['rows'], 2),
+            'identical': JSONRenderer().render(expected) == JSONRenderer().render(actual),
+        }
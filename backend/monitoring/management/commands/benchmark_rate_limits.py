@@ -0,0 +1,144 @@
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from automation_ai.throttling import FairShareBucket, TokenBucket, active_clients, consume
+
+
+def fairness_index(values):
+    """Jain's fairness index: 1 when every value is equal, 1/n when one client gets everything"""
+    total = sum(values)
+    squares = sum(value * value for value in values)
+    return total * total / (len(values) * squares) if squares else 1.0
+
+
+class Command(BaseCommand):
+    help = 'Drive the token-bucket rate limiter from concurrent clients and check budgets and fairness'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8, help='Clients sending cheap requests')
+        parser.add_argument('--heavy-clients', type=int, default=2, help='Clients sending expensive requests')
+        parser.add_argument('--threads', type=int, default=4, help='Concurrent threads per client')
+        parser.add_argument('--seconds', type=float, default=10, help='How long the clients send requests')
+        parser.add_argument(
+            '--warmup', type=float, default=1,
+            help='Seconds before fairness is measured, so the initial full buckets do not count'
+        )
+        parser.add_argument('--heavy-cost', type=float, default=20, help='Tokens per expensive request')
+        parser.add_argument('--client-capacity', type=float, default=40)
+        parser.add_argument('--client-refill', type=float, default=20, help='Client tokens per second')
+        parser.add_argument('--global-capacity', type=float, default=100)
+        parser.add_argument('--global-refill', type=float, default=100, help='Global tokens per second')
+        parser.add_argument(
+            '--min-fairness', type=float, default=0.9,
+            help="Fail if Jain's index over clients with the same demand, or over all clients, is below this"
+        )
+
+    def handle(self, *args, **options):
+        if options['clients'] + options['heavy_clients'] < 1 or options['threads'] < 1:
+            raise CommandError('Need at least one client and one thread per client')
+        if options['warmup'] >= options['seconds']:
+            raise CommandError('--warmup must be shorter than --seconds')
+
+        # A fresh key prefix, so real buckets and earlier runs are never touched
+        prefix = f'ratelimit:benchmark:{uuid.uuid4().hex}'
+        global_bucket = TokenBucket(
+            'global', f'{prefix}:global', options['global_capacity'], options['global_refill'], overdraft=False
+        )
+        clients = [
+            {'name': f'light-{index}', 'cost': 1.0} for index in range(options['clients'])
+        ] + [
+            {'name': f'heavy-{index}', 'cost': options['heavy_cost']} for index in range(options['heavy_clients'])
+        ]
+        for client in clients:
+            client.update(granted=0, rejected=0, tokens=0.0, steady_tokens=0.0, lock=threading.Lock())
+            client['bucket'] = TokenBucket(
+                'client', f"{prefix}:{client['name']}", options['client_capacity'], options['client_refill']
+            )
+
+        threads_total = (options['clients'] + options['heavy_clients']) * options['threads']
+        # Every thread starts sending at the same moment, so nobody gets the initial burst for being started first
+        ready = threading.Barrier(threads_total + 1)
+        timing = {}
+
+        def send(client):
+            ready.wait()
+            while time.time() < timing['deadline']:
+                share = FairShareBucket(
+                    f"{client['bucket'].key}:share", global_bucket, active_clients(prefix, client['name'])
+                )
+                allowed, wait, _ = consume([client['bucket'], share, global_bucket], client['cost'])
+                with client['lock']:
+                    if allowed:
+                        client['granted'] += 1
+                        client['tokens'] += client['cost']
+                        if time.time() >= timing['steady']:
+                            client['steady_tokens'] += client['cost']
+                    else:
+                        client['rejected'] += 1
+                if not allowed:
+                    # Clients that ignore Retry-After: retry almost immediately
+                    time.sleep(min(wait, 0.005))
+
+        threads = [
+            threading.Thread(target=send, args=(client,))
+            for client in clients for _ in range(options['threads'])
+        ]
+        for thread in threads:
+            thread.start()
+        start = time.time()
+        timing['steady'] = start + options['warmup']
+        timing['deadline'] = start + options['seconds']
+        ready.wait()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+
+        self._report(clients, global_bucket, elapsed, options)
+
+    def _report(self, clients, global_bucket, elapsed, options):
+        # A client bucket may be overspent by one request, charged in full once a token is left;
+        # the global bucket is a hard cap
+        client_budget = options['client_capacity'] + options['client_refill'] * elapsed
+        global_budget = global_bucket.capacity + global_bucket.refill * elapsed
+
+        self.stdout.write(
+            f"{'client':<12}{'cost':>6}{'granted':>10}{'rejected':>10}{'tokens':>10}{'budget':>10}{'steady':>10}"
+        )
+        for client in clients:
+            self.stdout.write(
+                f"{client['name']:<12}{client['cost']:>6.0f}{client['granted']:>10}{client['rejected']:>10}"
+                f"{client['tokens']:>10.0f}{client_budget:>10.0f}{client['steady_tokens']:>10.0f}"
+            )
+
+        failures = []
+        over_budget = [
+            client['name'] for client in clients if client['tokens'] > client_budget + client['cost'] - 1
+        ]
+        if over_budget:
+            failures.append(f"clients over their budget: {', '.join(over_budget)}")
+
+        total = sum(client['tokens'] for client in clients)
+        self.stdout.write(f'Global: {total:.0f} tokens granted, budget {global_budget:.0f} over {elapsed:.2f}s')
+        if total > global_budget:
+            failures.append('global budget exceeded')
+
+        for cost in sorted({client['cost'] for client in clients}):
+            group = [client['steady_tokens'] for client in clients if client['cost'] == cost]
+            index = fairness_index(group)
+            self.stdout.write(f"Fairness among cost-{cost:.0f} clients after warm-up: {index:.3f}")
+            if len(group) > 1 and index < options['min_fairness']:
+                failures.append(f'cost-{cost:.0f} clients below the fairness threshold')
+
+        # Every client asks for more than the global bucket can give each of them, so under contention
+        # they should get about the same tokens whatever their requests cost
+        index = fairness_index([client['steady_tokens'] for client in clients])
+        self.stdout.write(f'Fairness across all clients after warm-up: {index:.3f}')
+        if len({client['cost'] for client in clients}) > 1 and index < options['min_fairness']:
+            failures.append('clients with different request costs below the fairness threshold')
+
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS('Rate limits held under concurrent load'))
@@ -0,0 +1,128 @@
+import io
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from automation_ai import compression, renderers
+from monitoring.loadtest import SCENARIOS, BenchmarkContext, _send, seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF and orjson rendering CPU, and response bytes raw, gzipped and brotli-compressed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Number of synthetic users to seed')
+        parser.add_argument('--assessments', type=int, default=2000, help='Number of synthetic assessments to seed')
+        parser.add_argument('--iterations', type=int, default=200, help='Renders and compressions timed per payload')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for data')
+        parser.add_argument('--only', action='append', default=[], help='Only run scenarios containing this text')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            raise CommandError('orjson is not installed; there is no fast renderer to compare')
+        scenarios = [
+            scenario for scenario in SCENARIOS
+            if scenario.method == 'get'
+            and (not options['only'] or any(text in scenario.name for text in options['only']))
+        ]
+        if not scenarios:
+            raise CommandError('No scenarios matched --only')
+
+        # Run against a test database so the configured database is never touched
+        setup_test_environment()
+        settings.ALLOWED_HOSTS = ['*']
+        settings.RATE_LIMIT_ENABLED = False
+        settings.FAST_JSON_ENABLED = True
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = self._run(scenarios, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self._print_table(results)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'brotli': compression.brotli is not None, 'scenarios': results}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def _run(self, scenarios, options):
+        self.stdout.write(f"Seeding {options['users']} users and {options['assessments']} assessments...")
+        users = seed_dataset(options['users'], options['assessments'], seed=options['seed'])
+        token = RefreshToken.for_user(users[0]).access_token
+        # No Accept-Encoding, so responses come back uncompressed
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+        ctx = BenchmarkContext(users[0], options['seed'])
+
+        results = {}
+        for scenario in scenarios:
+            response = _send(client, scenario, *scenario.build(ctx))
+            if response.streaming or response.status_code != 200:
+                continue
+            result = {'content_type': response.get('Content-Type', '').split(';')[0]}
+            if hasattr(response, 'data'):
+                result.update(self._measure_json(response.data, options['iterations']))
+            result.update(self._measure_bytes(response.content, options['iterations']))
+            results[scenario.name] = result
+        return results
+
+    def _cpu_us(self, func, iterations):
+        start = time.process_time()
+        for _ in range(iterations):
+            func()
+        return round((time.process_time() - start) / iterations * 1_000_000, 1)
+
+    def _measure_json(self, data, iterations):
+        drf, fast = JSONRenderer(), renderers.FastJSONRenderer()
+        expected, rendered = drf.render(data), fast.render(data)
+        parsers = {'drf_parse_us': JSONParser(), 'orjson_parse_us': renderers.FastJSONParser()}
+        return {
+            'drf_render_us': self._cpu_us(lambda: drf.render(data), iterations),
+            'orjson_render_us': self._cpu_us(lambda: fast.render(data), iterations),
+            **{
+                name: self._cpu_us(lambda parser=parser: parser.parse(io.BytesIO(rendered)), iterations)
+                for name, parser in parsers.items()
+            },
+            'identical': rendered == expected,
+            'equivalent': json.loads(rendered) == json.loads(expected),
+        }
+
+    def _measure_bytes(self, content, iterations):
+        result = {'bytes': len(content)}
+        encodings = ['gzip'] + (['br'] if compression.brotli is not None else [])
+        for encoding in encodings:
+            result[f'{encoding}_bytes'] = len(compression.compress(content, encoding))
+            result[f'{encoding}_us'] = self._cpu_us(lambda: compression.compress(content, encoding), iterations)
+        return result
+
+    def _print_table(self, results):
+        header = (
+            f"{'scenario':<28}{'bytes':>9}{'gzip':>8}{'br':>8}{'gzip us':>9}{'br us':>8}"
+            f"{'drf us':>9}{'orjson us':>10}{'speedup':>9}{'parse x':>9}{'same':>6}"
+        )
+        self.stdout.write(header)
+        for name, result in results.items():
+            line = (
+                f"{name:<28}{result['bytes']:>9}{result['gzip_bytes']:>8}{result.get('br_bytes', '-'):>8}"
+                f"{result['gzip_us']:>9.0f}{result.get('br_us', '-'):>8}"
+            )
+            if 'drf_render_us' in result:
+                speedup = result['drf_render_us'] / max(result['orjson_render_us'], 0.1)
+                parse_speedup = result['drf_parse_us'] / max(result['orjson_parse_us'], 0.1)
+                same = 'yes' if result['identical'] else ('~' if result['equivalent'] else 'NO')
+                line += (
+                    f"{result['drf_render_us']:>9.0f}{result['orjson_render_us']:>10.0f}"
+                    f"{speedup:>8.1f}x{parse_speedup:>8.1f}x{same:>6}"
+                )
+            self.stdout.write(line)
+        if any(result.get('equivalent') is False for result in results.values()):
+            raise CommandError('orjson output differs from DRF for at least one payload')
@@ -0,0 +1,96 @@
+import json
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Modules that must not be imported just by loading settings and resolving URLs
+HEAVY_MODULES = ['numpy', 'pandas', 'sklearn', 'reportlab']
+
+STARTUP_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'automation_ai.settings')
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'seconds': elapsed,
+    'heavy_modules': [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Measure cold startup time (django.setup() plus URL resolution) and fail on regressions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreter runs')
+        parser.add_argument(
+            '--max-seconds', type=float, default=settings.STARTUP_BUDGET_SECONDS,
+            help='Fail if the median startup time exceeds this budget'
+        )
+        parser.add_argument('--baseline', help='JSON file from a previous --save run to compare against')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help='Allowed relative slowdown against --baseline (0.25 = 25%%)'
+        )
+        parser.add_argument('--save', help='Write the measurement to this JSON file')
+
+    def handle(self, *args, **options):
+        samples = []
+        heavy_modules = set()
+        for _ in range(options['runs']):
+            result = self._measure_once()
+            samples.append(result['seconds'])
+            heavy_modules.update(result['heavy_modules'])
+
+        measurement = {
+            'median_seconds': round(statistics.median(samples), 4),
+            'min_seconds': round(min(samples), 4),
+            'max_seconds': round(max(samples), 4),
+            'runs': len(samples),
+            'heavy_modules': sorted(heavy_modules),
+        }
+        self.stdout.write(json.dumps(measurement, indent=2))
+
+        if options['save']:
+            with open(options['save'], 'w') as fh:
+                json.dump(measurement, fh, indent=2)
+
+        failures = []
+        if heavy_modules:
+            failures.append(f"heavy modules imported at startup: {', '.join(sorted(heavy_modules))}")
+        if measurement['median_seconds'] > options['max_seconds']:
+            failures.append(
+                f"median startup {measurement['median_seconds']}s exceeds budget {options['max_seconds']}s"
+            )
+        if options['baseline']:
+            with open(options['baseline']) as fh:
+                baseline = json.load(fh)
+            limit = baseline['median_seconds'] * (1 + options['tolerance'])
+            if measurement['median_seconds'] > limit:
+                failures.append(
+                    f"median startup {measurement['median_seconds']}s regressed past "
+                    f"{limit:.4f}s (baseline {baseline['median_seconds']}s)"
+                )
+
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS('Startup time within budget'))
+
+    def _measure_once(self):
+        completed = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT % (HEAVY_MODULES,)],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise CommandError(f'Startup run failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
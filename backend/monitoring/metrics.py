@@ -0,0 +1,286 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Each process keeps its own counters and histograms. When METRICS_DIR is set,
+every process periodically writes a snapshot to ``METRICS_DIR/metrics-<pid>.json``
+and the /metrics endpoint merges all snapshots, so the numbers cover every
+gunicorn and Celery worker on the host rather than whichever worker happened
+to serve the scrape.
+"""
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, '')) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def snapshot(self):
+        # Snapshots are stored as JSON, so label tuples become JSON-encoded keys
+        return {json.dumps(key): value for key, value in self.values.items()}
+
+    @staticmethod
+    def merge(total, other):
+        for key, value in other.items():
+            total[key] = total.get(key, 0) + value
+
+    def render(self, samples):
+        for key, value in sorted(samples.items()):
+            labels = _format_labels(self.labelnames, json.loads(key))
+            yield f'{self.name}{labels} {value}'
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.registry.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = {'buckets': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            state['buckets'][index] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the wrapped block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        return {
+            json.dumps(key): {'buckets': list(state['buckets']), 'sum': state['sum'], 'count': state['count']}
+            for key, state in self.values.items()
+        }
+
+    @staticmethod
+    def merge(total, other):
+        for key, state in other.items():
+            current = total.get(key)
+            if current is None:
+                total[key] = {'buckets': list(state['buckets']), 'sum': state['sum'], 'count': state['count']}
+                continue
+            current['buckets'] = [a + b for a, b in zip(current['buckets'], state['buckets'])]
+            current['sum'] += state['sum']
+            current['count'] += state['count']
+
+    def render(self, samples):
+        for key, state in sorted(samples.items()):
+            label_values = json.loads(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state['buckets']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                labels = _format_labels(self.labelnames, label_values, ('le', le))
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _format_labels(self.labelnames, label_values)
+            yield f'{self.name}_sum{labels} {state["sum"]}'
+            yield f'{self.name}_count{labels} {state["count"]}'
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self._last_flush = 0.0
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self):
+        with self.lock:
+            return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def _snapshot_path(self):
+        directory = getattr(settings, 'METRICS_DIR', '')
+        return Path(directory) / f'metrics-{os.getpid()}.json' if directory else None
+
+    def flush(self):
+        """Write this process's snapshot to METRICS_DIR (no-op when unset)"""
+        path = self._snapshot_path()
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(tmp_path, path)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        if time.monotonic() - self._last_flush >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def collect(self):
+        """Merged snapshot of every process that shares METRICS_DIR"""
+        path = self._snapshot_path()
+        if path is None:
+            return self.snapshot()
+        self.flush()
+        merged = {name: {} for name in self.metrics}
+        for snapshot_path in path.parent.glob('metrics-*.json'):
+            try:
+                with open(snapshot_path) as fh:
+                    snapshot = json.load(fh)
+            except (OSError, ValueError):
+                continue
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is not None:
+                    metric.merge(merged[name], samples)
+        return merged
+
+    def render(self):
+        """Prometheus text exposition format for all processes"""
+        collected = self.collect()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            lines.extend(metric.render(collected.get(name, {})))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.flush)
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Request latency by URL name',
+    ['view', 'method', 'status']
+)
+DB_QUERIES = REGISTRY.histogram(
+    'db_queries_per_request', 'Number of SQL queries per request',
+    ['view'], buckets=QUERY_COUNT_BUCKETS
+)
+DB_TIME = REGISTRY.histogram(
+    'db_query_seconds_per_request', 'Total SQL time per request',
+    ['view']
+)
+ML_FIT_SECONDS = REGISTRY.histogram(
+    'ml_fit_duration_seconds', 'Time spent fitting ML models',
+    ['operation']
+)
+EXPORT_SECONDS = REGISTRY.histogram(
+    'report_export_duration_seconds', 'Time spent rendering report exports',
+    ['format']
+)
+CELERY_TASK_SECONDS = REGISTRY.histogram(
+    'celery_task_duration_seconds', 'Celery task run time',
+    ['task', 'state']
+)
+
+
+class MetricsMiddleware:
+    """Record latency and SQL usage per URL name"""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        db_stats = {'count': 0, 'seconds': 0.0}
+
+        def count_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db_stats['count'] += 1
+                db_stats['seconds'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or 'unresolved'
+        REQUEST_LATENCY.observe(elapsed, view=view, method=request.method, status=response.status_code)
+        DB_QUERIES.observe(db_stats['count'], view=view)
+        DB_TIME.observe(db_stats['seconds'], view=view)
+        REGISTRY.maybe_flush()
+        return response
+
+
+_celery_started = {}
+
+
+def _task_prerun(task_id=None, **kwargs):
+    _celery_started[task_id] = time.perf_counter()
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    start = _celery_started.pop(task_id, None)
+    if start is not None:
+        CELERY_TASK_SECONDS.observe(time.perf_counter() - start, task=task.name, state=state or 'UNKNOWN')
+        REGISTRY.maybe_flush()
+
+
+def instrument_celery():
+    """Record Celery task durations in this registry"""
+    from celery.signals import task_prerun, task_postrun
+    task_prerun.connect(_task_prerun, weak=False)
+    task_postrun.connect(_task_postrun, weak=False)
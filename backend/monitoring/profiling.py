@@ -0,0 +1,169 @@
+"""
+On-demand per-request profiling.
+
+When PROFILING_ENABLED is off the middleware removes itself at startup, so
+requests pay nothing. When it is on, a request is profiled if it carries the
+PROFILING_TOKEN (``X-Profile-Token`` header or ``_profile`` query parameter),
+if a staff user asks with ``?_profile=1``, or if it falls into the
+PROFILING_SAMPLE_RATE sample. Each capture stores a cProfile dump plus a JSON
+summary with the SQL queries and their timings in PROFILING_DIR.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+PROFILE_ID_RE = re.compile(r'^[0-9A-Za-z-]+$')
+MAX_RECORDED_QUERIES = 500
+# Query parameters holding credentials, left out of recorded paths
+SECRET_PARAMS = ('token', 'ticket', '_profile')
+
+# Only one cProfile profiler can be active per process at a time
+_profiler_lock = threading.Lock()
+
+
+def profile_dir():
+    return Path(settings.PROFILING_DIR)
+
+
+def profile_paths(profile_id):
+    """Return the (.prof, .json) paths for a capture, or None for a malformed id"""
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    directory = profile_dir()
+    return directory / f'{profile_id}.prof', directory / f'{profile_id}.json'
+
+
+def list_profiles():
+    """Summaries of stored captures, newest first"""
+    summaries = []
+    for path in sorted(profile_dir().glob('*.json'), reverse=True):
+        try:
+            with open(path) as fh:
+                summary = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        summary.pop('queries', None)
+        summary.pop('top_functions', None)
+        summaries.append(summary)
+    return summaries
+
+
+def _prune_profiles():
+    captures = sorted(profile_dir().glob('*.json'))
+    for path in captures[:max(0, len(captures) - settings.PROFILING_MAX_FILES)]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def _recorded_path(request):
+    """The request path and query string without credential parameters"""
+    query = request.GET.copy()
+    for name in SECRET_PARAMS:
+        query.pop(name, None)
+    return f'{request.path}?{query.urlencode()}' if query else request.path
+
+
+def _top_functions(profiler, limit=25):
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
+
+
+class ProfilingMiddleware:
+    """Capture cProfile and SQL timings for authorized or sampled requests"""
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        profile_dir().mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None or not _profiler_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self._profile(request, trigger)
+        finally:
+            _profiler_lock.release()
+
+    def _trigger(self, request):
+        token = settings.PROFILING_TOKEN
+        supplied = request.headers.get('X-Profile-Token') or request.GET.get('_profile')
+        if supplied:
+            if token and constant_time_compare(supplied, token):
+                return 'token'
+            if supplied == '1' and getattr(request, 'user', None) and request.user.is_staff:
+                return 'staff'
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return 'sample'
+        return None
+
+    def _profile(self, request, trigger):
+        queries = []
+
+        def record_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                if len(queries) < MAX_RECORDED_QUERIES:
+                    queries.append({
+                        'alias': context['connection'].alias,
+                        'sql': sql,
+                        'many': many,
+                        'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                    })
+
+        profiler = cProfile.Profile()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(record_query))
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - start
+
+        profile_id = f"{timezone.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        prof_path, json_path = profile_paths(profile_id)
+        profiler.dump_stats(prof_path)
+        summary = {
+            'id': profile_id,
+            'created_at': timezone.now().isoformat(),
+            'trigger': trigger,
+            'method': request.method,
+            'path': _recorded_path(request),
+            'status_code': response.status_code,
+            'duration_ms': round(duration * 1000, 3),
+            'query_count': len(queries),
+            'query_time_ms': round(sum(query['duration_ms'] for query in queries), 3),
+            'queries': queries,
+            'top_functions': _top_functions(profiler),
+        }
+        tmp_path = json_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as fh:
+            json.dump(summary, fh)
+        os.replace(tmp_path, json_path)
+        _prune_profiles()
+
+        response['X-Profile-Id'] = profile_id
+        return response
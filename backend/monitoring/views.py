@@ -0,0 +1,43 @@
+import json
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from accounts.permissions import IsAdminRole
+from .metrics import REGISTRY
+from .profiling import list_profiles, profile_paths
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminRole])
+def profile_list(request):
+    """List captured request profiles, newest first"""
+    return Response(list_profiles())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminRole])
+def profile_detail(request, profile_id):
+    """Return a capture's summary, or the raw cProfile dump with ?download=prof"""
+    paths = profile_paths(profile_id)
+    if paths is None or not paths[1].exists():
+        return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    prof_path, json_path = paths
+    
+    if request.query_params.get('download') == 'prof':
+        return FileResponse(open(prof_path, 'rb'), as_attachment=True, filename=prof_path.name)
+    
+    with open(json_path) as fh:
+        return Response(json.load(fh))
+
+
+def metrics(request):
+    """Prometheus metrics for every process sharing METRICS_DIR"""
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden('Forbidden\n', content_type='text/plain')
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
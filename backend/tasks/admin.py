@@ -1,5 +1,36 @@
-from django.contrib import admin
-from .models import ProcessAssessment, AssessmentReport, ProcessCategory
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.cache import cache
+from django.db.models import Count
+
+from automation_ai.pagination import EstimatedCountPaginator
+from .models import ProcessAssessment, AssessmentReport, ProcessCategory, ScoringRuleSet, DuplicateCandidate
+
+
+DEPARTMENT_FACET_CACHE_KEY = 'tasks:admin:department-facet'
+
+
+class DepartmentListFilter(admin.SimpleListFilter):
+    """Department filter served from a cached list instead of a DISTINCT scan per page view"""
+    title = 'department'
+    parameter_name = 'department'
+
+    def lookups(self, request, model_admin):
+        departments = cache.get(DEPARTMENT_FACET_CACHE_KEY)
+        if departments is None:
+            departments = list(
+                ProcessAssessment.objects.exclude(department='')
+                .order_by('department')
+                .values_list('department', flat=True)
+                .distinct()
+            )
+            cache.set(DEPARTMENT_FACET_CACHE_KEY, departments, settings.ADMIN_FACET_CACHE_TIMEOUT)
+        return [(department, department) for department in departments]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(department=self.value())
+        return queryset
 
 
 @admin.register(ProcessAssessment)
@@ -9,11 +40,14 @@ class ProcessAssessmentAdmin(admin.ModelAdmin):
         'priority', 'assessed_by', 'created_at'
     ]
     list_filter = [
-        'automation_suitability', 'priority', 'department', 
+        'automation_suitability', 'priority', DepartmentListFilter,
         'implementation_effort', 'created_at'
     ]
+    list_select_related = ['assessed_by']
     search_fields = ['process_name', 'description', 'department', 'process_owner']
     readonly_fields = ['total_score', 'automation_suitability', 'priority']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = not settings.ADMIN_PERFORMANCE_MODE
     
     fieldsets = (
         ('Basic Information', {
@@ -45,19 +79,34 @@ class ProcessAssessmentAdmin(admin.ModelAdmin):
         if obj:  # editing an existing object
             readonly_fields.extend(['assessed_by', 'created_at', 'updated_at'])
         return readonly_fields
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        cache.delete(DEPARTMENT_FACET_CACHE_KEY)
+    
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        cache.delete(DEPARTMENT_FACET_CACHE_KEY)
 
 
 @admin.register(AssessmentReport)
 class AssessmentReportAdmin(admin.ModelAdmin):
     list_display = ['title', 'generated_by', 'assessment_count', 'created_at']
     list_filter = ['created_at', 'generated_by']
+    list_select_related = ['generated_by']
     search_fields = ['title', 'description']
-    filter_horizontal = ['assessments']
+    autocomplete_fields = ['assessments']
     readonly_fields = ['created_at']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = not settings.ADMIN_PERFORMANCE_MODE
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_assessment_count=Count('assessments'))
     
     def assessment_count(self, obj):
-        return obj.assessments.count()
+        return obj._assessment_count
     assessment_count.short_description = 'Number of Assessments'
+    assessment_count.admin_order_field = '_assessment_count'
 
 
 @admin.register(ProcessCategory)
@@ -65,3 +114,36 @@ class ProcessCategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'description', 'color', 'created_at']
     search_fields = ['name', 'description']
     list_filter = ['created_at']
+
+
+@admin.register(ScoringRuleSet)
+class ScoringRuleSetAdmin(admin.ModelAdmin):
+    list_display = [
+        'version', 'name', 'not_suitable_max_score', 'possibly_automatable_max_score',
+        'is_active', 'activated_at', 'created_at'
+    ]
+    list_filter = ['is_active']
+    readonly_fields = ['is_active', 'activated_at', 'created_at']
+    actions = ['activate_rule_set']
+    
+    def get_readonly_fields(self, request, obj=None):
+        if obj is not None and obj.activated_at is not None:
+            return [*self.readonly_fields, *ScoringRuleSet.RULE_FIELDS]
+        return self.readonly_fields
+    
+    @admin.action(description='Activate and re-score all assessments')
+    def activate_rule_set(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, 'Select exactly one rule set to activate.', messages.ERROR)
+            return
+        rule_set = queryset.get()
+        updated = rule_set.activate()
+        self.message_user(request, f'Activated {rule_set}; re-scored {updated} assessments.', messages.SUCCESS)
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    list_display = ['assessment', 'duplicate', 'similarity', 'score_distance', 'status', 'detected_at']
+    list_filter = ['status']
+    list_select_related = ['assessment', 'duplicate']
+    raw_id_fields = ['assessment', 'duplicate', 'resolved_by']
@@ -0,0 +1,100 @@
+"""
+AI conclusions for assessment reports.
+
+A conclusion depends only on how many of a report's assessments fall into
+each suitability class. Those counts come from one grouped query over the
+report membership table, for one report or a whole batch, and are stored
+with the conclusion as its fingerprint. A conclusion is only rebuilt and
+written when the fingerprint changes, i.e. when membership or the members'
+classification has changed since the last run.
+"""
+from django.db.models import Count
+
+from .models import AssessmentReport
+
+# Bump when the conclusion text changes so stored conclusions are rebuilt
+CONCLUSION_VERSION = 1
+REFRESH_CHUNK_SIZE = 1000
+
+SUITABILITY_CLASSES = ['highly_automatable', 'possibly_automatable', 'not_suitable']
+
+Membership = AssessmentReport.assessments.through
+
+
+def suitability_counts(report_ids):
+    """Per report id, the number of member assessments in each suitability class"""
+    counts = {report_id: dict.fromkeys(SUITABILITY_CLASSES, 0) for report_id in report_ids}
+    rows = (
+        Membership.objects.filter(assessmentreport_id__in=list(report_ids))
+        .values_list('assessmentreport_id', 'processassessment__automation_suitability')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for report_id, suitability, count in rows:
+        counts[report_id][suitability] = count
+    return counts
+
+
+def conclusion_fingerprint(counts):
+    return 'v{}:{}'.format(CONCLUSION_VERSION, ':'.join(str(counts[name]) for name in SUITABILITY_CLASSES))
+
+
+def build_conclusion(counts):
+    """Conclusion text for a report's suitability counts"""
+    highly_automatable = counts['highly_automatable']
+    possibly_automatable = counts['possibly_automatable']
+    not_suitable = counts['not_suitable']
+    total = highly_automatable + possibly_automatable + not_suitable
+
+    if total == 0:
+        return "No processes have been assessed yet."
+
+    return f"""Based on this assessment, {highly_automatable} processes are highly automatable, {possibly_automatable} are partially automatable, and {not_suitable} should remain manual. 
+
+Prioritization should focus on high-impact areas to maximize efficiency and cost savings. 
+
+Key Recommendations:
+- Immediately implement automation for highly automatable processes ({highly_automatable}/{total} = {(highly_automatable/total*100):.1f}%)
+- Consider semi-automation for processes with medium scores
+- Continue manual operations for complex processes requiring human judgment
+
+Expected Benefits:
+- Reduced manual errors and processing time
+- Improved consistency and standardization
+- Cost savings through reduced labor requirements
+- Enhanced employee satisfaction by eliminating repetitive tasks"""
+
+
+def refresh_conclusion(report):
+    """Return the report's conclusion and whether it had to be regenerated"""
+    counts = suitability_counts([report.id])[report.id]
+    fingerprint = conclusion_fingerprint(counts)
+    if report.conclusion_fingerprint == fingerprint and report.ai_conclusion:
+        return report.ai_conclusion, False
+
+    report.ai_conclusion = build_conclusion(counts)
+    report.conclusion_fingerprint = fingerprint
+    # Only the two conclusion columns change; a full save() would rewrite every field
+    AssessmentReport.objects.filter(pk=report.pk).update(
+        ai_conclusion=report.ai_conclusion, conclusion_fingerprint=fingerprint
+    )
+    return report.ai_conclusion, True
+
+
+def refresh_report_conclusions(queryset, chunk_size=REFRESH_CHUNK_SIZE):
+    """Bring the conclusions of every report in the queryset up to date, one grouped query per chunk"""
+    stored = list(queryset.order_by('id').values_list('id', 'conclusion_fingerprint'))
+    updated = 0
+    for start in range(0, len(stored), chunk_size):
+        chunk = stored[start:start + chunk_size]
+        counts = suitability_counts([report_id for report_id, _ in chunk])
+        changed = []
+        for report_id, fingerprint in chunk:
+            current = conclusion_fingerprint(counts[report_id])
+            if current != fingerprint:
+                changed.append(AssessmentReport(
+                    id=report_id, ai_conclusion=build_conclusion(counts[report_id]), conclusion_fingerprint=current
+                ))
+        AssessmentReport.objects.bulk_update(changed, ['ai_conclusion', 'conclusion_fingerprint'])
+        updated += len(changed)
+    return {'reports': len(stored), 'updated': updated}
@@ -0,0 +1,84 @@
+"""
+Per-user dashboard statistics, precomputed into the cache.
+
+The nightly job computes every user's statistics with one grouped query and
+caches them with the fingerprint of the user's assessments. A dashboard
+request checks that fingerprint with one index-only aggregate and reads the
+cached statistics when it matches. Otherwise it computes them with a single
+aggregate and caches the result for the next request. With the default
+per-process locmem cache, precomputed entries only reach the worker that ran
+the job; use a shared cache in production.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Max, Q, Sum
+
+from automation_ai.precompute import contents_fingerprint, fingerprint, precompute_run
+from .models import ProcessAssessment
+
+BATCH_SIZE = 1000
+
+STATS = {
+    'total_processes': Count('id'),
+    'highly_automatable': Count('id', filter=Q(automation_suitability='highly_automatable')),
+    'possibly_automatable': Count('id', filter=Q(automation_suitability='possibly_automatable')),
+    'not_suitable': Count('id', filter=Q(automation_suitability='not_suitable')),
+    'average_score': Avg('total_score'),
+    'total_estimated_savings': Sum('estimated_cost_savings'),
+}
+
+
+def _cache_key(user_id):
+    return f'dashboard_stats:{user_id}'
+
+
+def _stats(row):
+    return {
+        **{name: row[name] for name in STATS},
+        'average_score': row['average_score'] or 0,
+        'total_estimated_savings': row['total_estimated_savings'] or 0,
+    }
+
+
+def user_dashboard_stats(user):
+    """The user's dashboard statistics, from the cache while their assessments are unchanged"""
+    assessments = ProcessAssessment.objects.filter(assessed_by=user)
+    _, digest = contents_fingerprint(assessments)
+    cached = cache.get(_cache_key(user.pk))
+    if cached is not None and cached['fingerprint'] == digest:
+        return cached['stats']
+
+    stats = _stats(assessments.aggregate(**STATS))
+    cache.set(_cache_key(user.pk), {'fingerprint': digest, 'stats': stats}, settings.PRECOMPUTE_CACHE_TTL)
+    return stats
+
+
+def _store(run, rows):
+    cached = cache.get_many([_cache_key(row['assessed_by']) for row in rows])
+    changed = {}
+    for row in rows:
+        key = _cache_key(row['assessed_by'])
+        digest = fingerprint(row['total_processes'], row['last_id'], row['updated'])
+        if cached.get(key, {}).get('fingerprint') != digest:
+            changed[key] = {'fingerprint': digest, 'stats': _stats(row)}
+    cache.set_many(changed, settings.PRECOMPUTE_CACHE_TTL)
+    run.record('refreshed', len(changed))
+    run.record('skipped', len(rows) - len(changed))
+
+
+def precompute_dashboard_stats():
+    """Cache the dashboard statistics of every user with assessments whose assessments changed"""
+    rows = (
+        ProcessAssessment.objects.order_by('assessed_by').values('assessed_by')
+        .annotate(**STATS, last_id=Max('id'), updated=Max('updated_at'))
+    )
+    with precompute_run('dashboard_stats') as run:
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                _store(run, batch)
+                batch = []
+        if batch:
+            _store(run, batch)
+    return run.counts
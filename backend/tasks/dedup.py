@@ -0,0 +1,228 @@
+"""
+Near-duplicate assessment detection with MinHash and locality-sensitive hashing.
+
+Every assessment's name and the start of its description become a set of
+character trigrams, computed for all rows at once over one concatenated byte
+buffer. Each set is summarized by a DEDUP_NUM_PERM-value MinHash signature.
+Signatures are split into DEDUP_BANDS bands, and rows that share any band land
+in the same bucket. Only those candidate pairs are verified, against the
+signature similarity and the factor score distance, so the work grows with the
+number of rows instead of the number of pairs. Buckets larger than
+DEDUP_MAX_BUCKET_SIZE, such as many rows with an identical generic name, are
+linked as a chain rather than all pairs to keep the output linear.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Substr
+
+from .models import DuplicateCandidate, ProcessAssessment
+from .scoring import SCORE_FIELDS
+
+DESCRIPTION_CHARS = 200
+ALPHABET = 37  # space, a-z, 0-9
+SENTINEL = 255
+SEED = 20240601
+# Bounds the (num_perm x shingles) hash matrix built per chunk; small chunks stay in cache
+HASH_CHUNK_CELLS = 8000000
+
+
+def _code_table():
+    import numpy as np
+
+    table = np.zeros(256, dtype=np.uint8)
+    for index, char in enumerate('abcdefghijklmnopqrstuvwxyz0123456789', start=1):
+        table[ord(char)] = index
+    table[0] = SENTINEL
+    return table
+
+
+def trigram_shingles(texts):
+    """Trigram ids and their row index for every text, computed over one buffer"""
+    import numpy as np
+
+    buffer = '\x00'.join(
+        f" {text.lower().replace(chr(0), ' ')} " for text in texts
+    ).encode('ascii', 'replace')
+    codes = _code_table()[np.frombuffer(buffer, dtype=np.uint8)]
+    # Collapse runs of separators so spacing and punctuation differences do not matter
+    previous = np.concatenate(([SENTINEL], codes[:-1]))
+    codes = codes[~((codes == 0) & (previous == 0))]
+
+    first, second, third = codes[:-2], codes[1:-1], codes[2:]
+    valid = (first != SENTINEL) & (second != SENTINEL) & (third != SENTINEL)
+    trigrams = (
+        first.astype(np.int64) * ALPHABET * ALPHABET + second.astype(np.int64) * ALPHABET + third
+    )[valid]
+    rows = np.cumsum(codes == SENTINEL)[:-2][valid]
+    return trigrams, rows
+
+
+def minhash_signatures(trigrams, rows, row_count, num_perm):
+    """(row_count, num_perm) uint32 MinHash signatures"""
+    import numpy as np
+
+    # The trigram universe is small, so each permutation is a table of random
+    # values indexed by trigram id: a gather instead of hash arithmetic
+    table = np.random.default_rng(SEED).integers(
+        0, np.iinfo(np.uint32).max, size=(num_perm, ALPHABET ** 3), dtype=np.uint32, endpoint=True
+    )
+
+    signatures = np.full((row_count, num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    starts = np.flatnonzero(np.concatenate(([True], rows[1:] != rows[:-1]))) if len(rows) else rows
+    per_row = max(1, len(trigrams) // max(1, len(starts)))
+    step = max(1, HASH_CHUNK_CELLS // (num_perm * per_row))
+    for first in range(0, len(starts), step):
+        chunk = starts[first:first + step]
+        begin = chunk[0]
+        end = starts[first + step] if first + step < len(starts) else len(trigrams)
+        hashed = np.take(table, trigrams[begin:end], axis=1)
+        signatures[rows[chunk]] = np.minimum.reduceat(hashed, chunk - begin, axis=1).T
+    return signatures
+
+
+def candidate_pairs(signatures, bands, max_bucket_size):
+    """Row index pairs (i < j) sharing at least one LSH band"""
+    import numpy as np
+
+    row_count, num_perm = signatures.shape
+    width = num_perm // bands
+    multipliers = np.random.default_rng(SEED + 1).integers(1, 2 ** 63, size=width, dtype=np.uint64) | np.uint64(1)
+
+    found = []
+    for band in range(bands):
+        block = signatures[:, band * width:(band + 1) * width].astype(np.uint64)
+        keys = (block * multipliers).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        run_ids = np.cumsum(np.concatenate(([0], sorted_keys[1:] != sorted_keys[:-1])))
+        run_sizes = np.bincount(run_ids)[run_ids]
+        for distance in range(1, max_bucket_size):
+            same = sorted_keys[distance:] == sorted_keys[:-distance]
+            if distance > 1:
+                # Oversized buckets are only chained through neighbours
+                same &= run_sizes[distance:] <= max_bucket_size
+            if not same.any():
+                break
+            left, right = order[:-distance][same], order[distance:][same]
+            found.append(np.minimum(left, right).astype(np.int64) * row_count + np.maximum(left, right))
+    if not found:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    encoded = np.unique(np.concatenate(found))
+    return encoded // row_count, encoded % row_count
+
+
+def find_duplicates(ids, texts, scores, num_perm, bands, threshold, max_score_distance, max_bucket_size):
+    """Verified near-duplicate pairs as (id_a, id_b, similarity, score_distance) arrays"""
+    import numpy as np
+
+    trigrams, rows = trigram_shingles(texts)
+    signatures = minhash_signatures(trigrams, rows, len(ids), num_perm)
+    # Rows without any trigram keep the sentinel signature and must not match each other
+    has_text = np.zeros(len(ids), dtype=bool)
+    has_text[rows] = True
+
+    left, right = candidate_pairs(signatures, bands, max_bucket_size)
+    keep = has_text[left] & has_text[right]
+    left, right = left[keep], right[keep]
+
+    similarity = np.empty(len(left))
+    for start in range(0, len(left), 100000):
+        part = slice(start, start + 100000)
+        similarity[part] = (signatures[left[part]] == signatures[right[part]]).mean(axis=1)
+    distance = np.abs(scores[left] - scores[right]).sum(axis=1)
+
+    keep = (similarity >= threshold) & (distance <= max_score_distance)
+    return ids[left[keep]], ids[right[keep]], similarity[keep], distance[keep]
+
+
+def detect_duplicates(queryset=None):
+    """Replace the open duplicate candidates with a fresh detection pass; dismissed pairs stay dismissed"""
+    import numpy as np
+
+    started = time.perf_counter()
+    queryset = ProcessAssessment.objects.all() if queryset is None else queryset
+    rows = list(
+        queryset.order_by('id')
+        .annotate(description_start=Substr('description', 1, DESCRIPTION_CHARS))
+        .values_list('id', 'process_name', 'description_start', *SCORE_FIELDS)
+        .iterator(chunk_size=20000)
+    )
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    texts = [f'{row[1]} {row[2]}' for row in rows]
+    scores = np.array([row[3:] for row in rows], dtype=np.int64).reshape(len(rows), len(SCORE_FIELDS))
+    del rows
+
+    found = []
+    if len(ids):
+        found = zip(*(values.tolist() for values in find_duplicates(
+            ids, texts, scores,
+            num_perm=settings.DEDUP_NUM_PERM,
+            bands=settings.DEDUP_BANDS,
+            threshold=settings.DEDUP_SIMILARITY_THRESHOLD,
+            max_score_distance=settings.DEDUP_MAX_SCORE_DISTANCE,
+            max_bucket_size=settings.DEDUP_MAX_BUCKET_SIZE,
+        )))
+    candidates = [
+        DuplicateCandidate(
+            assessment_id=assessment_id, duplicate_id=duplicate_id,
+            similarity=round(similarity, 4), score_distance=distance,
+        )
+        for assessment_id, duplicate_id, similarity, distance in found
+    ]
+
+    with transaction.atomic():
+        DuplicateCandidate.objects.filter(status='open').delete()
+        DuplicateCandidate.objects.bulk_create(candidates, batch_size=5000, ignore_conflicts=True)
+
+    return {
+        'assessments': len(ids),
+        'candidates': len(candidates),
+        'open': DuplicateCandidate.objects.filter(status='open').count(),
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+
+@transaction.atomic
+def merge_duplicate(candidate, keep='assessment'):
+    """Fold one assessment of the pair into the other and delete it"""
+    kept, removed = candidate.assessment, candidate.duplicate
+    if keep == 'duplicate':
+        kept, removed = removed, kept
+
+    # Fill gaps in the kept assessment from the removed one
+    for field in ['description', 'department', 'process_owner', 'implementation_effort',
+                  'estimated_cost_savings', 'estimated_time_savings']:
+        if getattr(kept, field) in (None, '') and getattr(removed, field) not in (None, ''):
+            setattr(kept, field, getattr(removed, field))
+    kept.save()
+
+    # Reports that listed the removed assessment now list the kept one
+    Membership = ProcessAssessment.assessmentreport_set.through
+    report_ids = Membership.objects.filter(processassessment=removed).values_list('assessmentreport_id', flat=True)
+    already = set(Membership.objects.filter(processassessment=kept).values_list('assessmentreport_id', flat=True))
+    Membership.objects.bulk_create([
+        Membership(assessmentreport_id=report_id, processassessment_id=kept.id)
+        for report_id in report_ids if report_id not in already
+    ])
+
+    # Other open pairs that involved the removed assessment now point at the kept one
+    related = DuplicateCandidate.objects.filter(status='open').exclude(pk=candidate.pk).filter(
+        Q(assessment_id=removed.id) | Q(duplicate_id=removed.id)
+    )
+    DuplicateCandidate.objects.bulk_create([
+        DuplicateCandidate(
+            assessment_id=min(kept.id, other), duplicate_id=max(kept.id, other),
+            similarity=pair.similarity, score_distance=pair.score_distance,
+        )
+        for pair in related
+        for other in [pair.duplicate_id if pair.assessment_id == removed.id else pair.assessment_id]
+        if other != kept.id
+    ], ignore_conflicts=True)
+
+    # Deleting the removed assessment also deletes this candidate and its other pairs
+    removed_id = removed.id
+    removed.delete()
+    return kept, removed_id
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.models import ScoringRuleSet
+
+
+class Command(BaseCommand):
+    help = 'Activate a scoring rule set version and re-score every assessment'
+
+    def add_arguments(self, parser):
+        parser.add_argument('version', type=int, help='Version of the rule set to activate')
+
+    def handle(self, *args, **options):
+        try:
+            rule_set = ScoringRuleSet.objects.get(version=options['version'])
+        except ScoringRuleSet.DoesNotExist:
+            raise CommandError(f"Scoring rule set version {options['version']} does not exist")
+
+        start = time.perf_counter()
+        updated = rule_set.activate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Activated {rule_set}; re-scored {updated} assessments in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from automation_ai.archival import archive_old_records
+
+
+class Command(BaseCommand):
+    help = 'Move analyses and assessments older than the archive horizons into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Rows moved per transaction (default ARCHIVE_BATCH_SIZE)')
+
+    def handle(self, *args, **options):
+        result = archive_old_records(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {result['analyses']} analyses and {result['assessments']} assessments"
+        ))
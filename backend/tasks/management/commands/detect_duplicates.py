@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tasks.dedup import detect_duplicates
+
+
+class Command(BaseCommand):
+    help = 'Find near-duplicate assessments by name, description and scores'
+
+    def handle(self, *args, **options):
+        result = detect_duplicates()
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {result['assessments']} assessments in {result['seconds']}s; "
+            f"{result['candidates']} candidate pairs found, {result['open']} open"
+        ))
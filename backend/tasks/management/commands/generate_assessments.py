@@ -0,0 +1,238 @@
+import time
+from datetime import date, datetime
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tasks.models import ProcessAssessment, AssessmentReport
+from tasks.scoring import CLASSES, SCORE_FIELDS, get_active_rules, score_matrix
+
+User = get_user_model()
+
+DEPARTMENTS = [
+    'Finance', 'HR', 'IT', 'Operations', 'Sales', 'Marketing',
+    'Procurement', 'Legal', 'Customer Support', 'Supply Chain',
+]
+DEPARTMENT_WEIGHTS = [0.18, 0.1, 0.14, 0.16, 0.1, 0.06, 0.08, 0.04, 0.1, 0.04]
+
+SUBJECTS = [
+    'Invoice', 'Purchase order', 'Expense claim', 'Payroll', 'Vendor onboarding',
+    'Employee onboarding', 'Leave request', 'Customer refund', 'Contract',
+    'Inventory', 'Shipment', 'Ticket', 'Timesheet', 'Credit check', 'Bank statement',
+]
+ACTIONS = [
+    'processing', 'approval', 'reconciliation', 'data entry', 'validation',
+    'reporting', 'archiving', 'triage', 'review', 'follow-up',
+]
+PROCESS_NAMES = np.array([f'{subject} {action}' for subject in SUBJECTS for action in ACTIONS], dtype=object)
+EFFORTS = np.array(['low', 'medium', 'high', ''], dtype=object)
+SUITABILITY = np.array([suitability for suitability, _ in CLASSES], dtype=object)
+PRIORITY = np.array([priority for _, priority in CLASSES], dtype=object)
+
+# Columns written by the batched insert, in order
+INSERT_COLUMNS = [
+    'process_name', 'description', 'department', 'process_owner',
+    *SCORE_FIELDS,
+    *[field.replace('_score', '_remarks') for field in SCORE_FIELDS],
+    'total_score', 'automation_suitability', 'priority',
+    'estimated_cost_savings', 'estimated_time_savings', 'implementation_effort',
+    'savings_per_effort_week', 'assessed_by_id', 'created_at', 'updated_at',
+]
+
+
+def format_timestamps(seconds):
+    """Format UTC epoch seconds as naive 'YYYY-MM-DD HH:MM:SS' strings, which every backend accepts"""
+    return np.char.replace(np.datetime_as_string(seconds.astype('datetime64[s]'), unit='s'), 'T', ' ')
+
+
+def format_decimals(values, present):
+    """Format a float array as two-decimal strings, with None where `present` is False"""
+    return np.where(present, np.char.mod('%.2f', values), None)
+
+
+class Command(BaseCommand):
+    help = 'Generate a large, deterministic synthetic assessment dataset with batched bulk inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--assessments', type=int, default=100000, help='Total assessments to generate')
+        parser.add_argument('--users', type=int, default=200, help='Number of synthetic users owning them')
+        parser.add_argument('--reports-per-user', type=int, default=3, help='Reports generated per user')
+        parser.add_argument('--report-size', type=int, default=40, help='Mean assessments per report')
+        parser.add_argument('--seed', type=int, default=42, help='Seed; the same seed always yields the same data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert transaction')
+        parser.add_argument('--days', type=int, default=730, help='Spread created_at over this many days')
+        parser.add_argument(
+            '--end-date', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date(),
+            default=None, help='Latest created_at date (YYYY-MM-DD, defaults to today)'
+        )
+
+    def handle(self, *args, **options):
+        seed = options['seed']
+        batch_size = options['batch_size']
+        end_date = options['end_date'] or timezone.now().date()
+        self.end = (end_date - date(1970, 1, 1)).days * 86400  # epoch seconds, midnight UTC
+        self.rules = get_active_rules()
+
+        users = self._ensure_users(seed, options['users'])
+        user_ids = np.array([user.id for user in users], dtype=np.int64)
+        # Skewed ownership: a few users assess far more processes than others
+        self.owner_weights = np.random.default_rng([seed, 0]).dirichlet(np.full(len(user_ids), 0.8))
+
+        done = ProcessAssessment.objects.filter(assessed_by_id__in=user_ids.tolist()).count()
+        if done % batch_size:
+            raise CommandError(
+                f'{done} synthetic assessments exist, which is not a multiple of --batch-size {batch_size}; '
+                'resume with the batch size used originally'
+            )
+
+        total = options['assessments']
+        start = time.perf_counter()
+        if done:
+            self.stdout.write(f'Resuming after {done} existing assessments')
+
+        for batch_number in range(done // batch_size, -(-total // batch_size)):
+            count = min(batch_size, total - batch_number * batch_size)
+            rows = self._build_batch(seed, batch_number, count, user_ids, options['days'])
+            with transaction.atomic():
+                self._insert_rows(rows)
+            written = batch_number * batch_size + count
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'  {written}/{total} assessments ({elapsed:.1f}s)')
+
+        self._generate_reports(seed, users, options['reports_per_user'], options['report_size'], batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.perf_counter() - start:.1f}s'))
+
+    def _ensure_users(self, seed, count):
+        emails = [f'synthetic-{seed}-{index}@example.com' for index in range(count)]
+        existing = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+        password = make_password(None)
+        User.objects.bulk_create([
+            User(
+                email=email, username=email.split('@')[0], password=password,
+                first_name='Synthetic', last_name=f'User {index}',
+            )
+            for index, email in enumerate(emails) if email not in existing
+        ])
+        users = {user.email: user for user in User.objects.filter(email__in=emails)}
+        return [users[email] for email in emails]
+
+    def _build_batch(self, seed, batch_number, count, user_ids, days):
+        """Build one batch of unsaved assessments; each batch has its own seeded generator"""
+        rng = np.random.default_rng([seed, 1, batch_number])
+
+        # A latent automatability drives all factor scores so they correlate like real data
+        latent = rng.beta(2.2, 2.0, size=count)
+        scores = np.clip(
+            np.rint(1 + 4 * latent[:, None] + rng.normal(0, 0.9, size=(count, len(SCORE_FIELDS)))),
+            1, 5
+        ).astype(np.int64)
+        totals, classes = score_matrix(scores, self.rules)
+
+        departments = rng.choice(len(DEPARTMENTS), size=count, p=DEPARTMENT_WEIGHTS)
+        subjects = rng.integers(0, len(SUBJECTS), size=count)
+        actions = rng.integers(0, len(ACTIONS), size=count)
+        owners = user_ids[rng.choice(len(user_ids), size=count, p=self.owner_weights)]
+
+        volume = scores[:, 3]
+        cost_savings = np.minimum(
+            np.round(rng.lognormal(8.5 + 0.35 * volume, 0.8), 2), 99999999.99
+        )
+        has_savings = rng.random(count) > 0.08
+        time_savings = np.minimum(np.round(rng.gamma(2.0, 2.0 + volume), 2), 999999.99)
+
+        # Harder processes (low complexity score) need more implementation effort
+        complexity = scores[:, 2]
+        effort_draw = rng.random(count)
+        effort_index = np.where(
+            effort_draw < 0.05, 3,
+            np.digitize(effort_draw + (3 - complexity) * 0.15, [0.45, 0.8])
+        )
+        effort_index = np.clip(effort_index, 0, 3)
+        efforts = EFFORTS[effort_index]
+        effort_weeks = np.array([settings.PORTFOLIO_EFFORT_WEEKS.get(effort, 0) for effort in EFFORTS])[effort_index]
+        has_weeks = has_savings & (effort_weeks > 0)
+        # Half-up rounding on whole cents, like ProcessAssessment.calculate_savings_per_effort
+        cents = np.rint(cost_savings * 100)
+        savings_per_week = np.floor(cents / np.where(has_weeks, effort_weeks, 1) + 0.5) / 100
+
+        created = self.end - rng.integers(0, days * 86400, size=count)
+        updated = np.minimum(self.end, created + rng.integers(0, 30 * 86400, size=count))
+
+        department_names = np.array(DEPARTMENTS, dtype=object)[departments]
+        names = PROCESS_NAMES[subjects * len(ACTIONS) + actions]
+        empty = [''] * count
+        columns = [
+            names.tolist(),
+            (department_names + ' team: ' + names).tolist(),
+            department_names.tolist(),
+            (department_names + ' lead').tolist(),
+            *[scores[:, column].tolist() for column in range(len(SCORE_FIELDS))],
+            *[empty] * len(SCORE_FIELDS),
+            totals.tolist(),
+            SUITABILITY[classes].tolist(),
+            PRIORITY[classes].tolist(),
+            format_decimals(cost_savings, has_savings).tolist(),
+            format_decimals(time_savings, has_savings).tolist(),
+            efforts.tolist(),
+            np.where(has_weeks, savings_per_week, None).tolist(),
+            owners.tolist(),
+            format_timestamps(created).tolist(),
+            format_timestamps(updated).tolist(),
+        ]
+        return list(zip(*columns))
+
+    def _insert_rows(self, rows):
+        """Write one batch with a single executemany, skipping per-value ORM preparation"""
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(ProcessAssessment._meta.db_table),
+            ', '.join(quote(column) for column in INSERT_COLUMNS),
+            ', '.join(['%s'] * len(INSERT_COLUMNS)),
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    def _generate_reports(self, seed, users, reports_per_user, report_size, batch_size):
+        """Create reports per user and write their memberships straight into the through table"""
+        if reports_per_user <= 0:
+            return
+
+        Membership = AssessmentReport.assessments.through
+        users_with_reports = set(
+            AssessmentReport.objects.filter(
+                generated_by__in=users, title__startswith='Synthetic report'
+            ).values_list('generated_by_id', flat=True)
+        )
+
+        created = 0
+        for index, user in enumerate(users):
+            if user.id in users_with_reports:
+                continue
+            ids = np.fromiter(
+                ProcessAssessment.objects.filter(assessed_by=user).order_by('id').values_list('id', flat=True),
+                dtype=np.int64
+            )
+            if not len(ids):
+                continue
+            rng = np.random.default_rng([seed, 2, index])
+            memberships = []
+            with transaction.atomic():
+                for number in range(reports_per_user):
+                    report = AssessmentReport.objects.create(
+                        title=f'Synthetic report {number + 1}', generated_by=user,
+                        description='Generated by generate_assessments',
+                    )
+                    size = int(min(len(ids), max(1, rng.poisson(report_size))))
+                    members = rng.choice(ids, size=size, replace=False)
+                    memberships.extend(
+                        Membership(assessmentreport_id=report.id, processassessment_id=int(assessment_id))
+                        for assessment_id in members
+                    )
+                    created += 1
+                Membership.objects.bulk_create(memberships, batch_size=batch_size)
+        self.stdout.write(f'  {created} reports created')
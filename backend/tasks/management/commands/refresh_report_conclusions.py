@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from tasks.conclusions import refresh_report_conclusions
+from tasks.models import AssessmentReport
+
+
+class Command(BaseCommand):
+    help = 'Regenerate the AI conclusions of reports whose assessments changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only refresh reports generated by this email address')
+
+    def handle(self, *args, **options):
+        queryset = AssessmentReport.objects.all()
+        if options['user']:
+            queryset = queryset.filter(generated_by__email=options['user'])
+        result = refresh_report_conclusions(queryset)
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {result['reports']} reports; {result['updated']} conclusions regenerated"
+        ))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from tasks.models import ProcessAssessment
+from tasks.portfolio import refresh_savings_per_effort_week
+
+
+class Command(BaseCommand):
+    help = 'Recompute savings per effort week for every assessment after changing PORTFOLIO_EFFORT_WEEKS'
+
+    def handle(self, *args, **options):
+        updated = refresh_savings_per_effort_week(ProcessAssessment.objects.all())
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} assessments'))
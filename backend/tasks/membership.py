@@ -0,0 +1,76 @@
+"""
+Report membership writes that never load assessment instances.
+
+``report.assessments.set(queryset)`` builds a model instance for every
+assessment, reads back the existing memberships to diff against, and then
+inserts the new through-rows. For reports with tens of thousands of
+assessments that is slow and memory-heavy. These helpers only handle ids:
+
+- ``owned_assessment_ids`` checks ownership with chunked id-only queries.
+- ``add_report_members`` writes through-rows with one executemany per chunk.
+- ``add_report_members_from_queryset`` copies the ids of a filtered queryset
+  into the through table with one INSERT ... SELECT, so they never leave the
+  database.
+"""
+from django.db import connection
+
+from .models import AssessmentReport, ProcessAssessment
+
+MEMBERSHIP_CHUNK_SIZE = 5000
+
+Membership = AssessmentReport.assessments.through
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _membership_columns():
+    return (
+        _quote(Membership._meta.get_field('assessmentreport').column),
+        _quote(Membership._meta.get_field('processassessment').column),
+    )
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def owned_assessment_ids(user, assessment_ids, chunk_size=MEMBERSHIP_CHUNK_SIZE):
+    """The given ids that belong to assessments of ``user``, deduplicated and sorted"""
+    requested = sorted(set(assessment_ids))
+    owned = []
+    for chunk in _chunks(requested, chunk_size):
+        owned.extend(
+            ProcessAssessment.objects.filter(id__in=chunk, assessed_by=user).values_list('id', flat=True)
+        )
+    return sorted(owned)
+
+
+def add_report_members(report, assessment_ids, chunk_size=MEMBERSHIP_CHUNK_SIZE):
+    """Insert through-rows for ids that are not members yet; returns how many were added"""
+    existing = set(
+        Membership.objects.filter(assessmentreport_id=report.id).values_list('processassessment_id', flat=True)
+    )
+    new_ids = [assessment_id for assessment_id in assessment_ids if assessment_id not in existing]
+    # One executemany per chunk, skipping model instances and per-value ORM preparation
+    sql = 'INSERT INTO {} ({}, {}) VALUES (%s, %s)'.format(
+        _quote(Membership._meta.db_table), *_membership_columns()
+    )
+    with connection.cursor() as cursor:
+        for chunk in _chunks(new_ids, chunk_size):
+            cursor.executemany(sql, [(report.id, assessment_id) for assessment_id in chunk])
+    return len(new_ids)
+
+
+def add_report_members_from_queryset(report, queryset):
+    """Add every assessment in ``queryset`` to the report inside the database; returns the row count"""
+    members = queryset.exclude(assessmentreport=report).order_by().values('id')
+    select_sql, params = members.query.sql_with_params()
+    sql = 'INSERT INTO {} ({}, {}) SELECT %s, {} FROM ({}) {}'.format(
+        _quote(Membership._meta.db_table), *_membership_columns(), _quote('id'), select_sql, _quote('members')
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (report.id, *params))
+        return cursor.rowcount
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['department'], name='tasks_assess_department_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:35
+
+from django.db import migrations, models
+from django.utils import timezone
+import tasks.models
+
+
+def create_default_rule_set(apps, schema_editor):
+    """Version 1 reproduces the original equal-weight scoring and 10/20 thresholds"""
+    ScoringRuleSet = apps.get_model('tasks', 'ScoringRuleSet')
+    ScoringRuleSet.objects.create(
+        version=1,
+        name='Equal weights',
+        weights=tasks.models.default_weights(),
+        success_weights=tasks.models.default_success_weights(),
+        is_active=True,
+        activated_at=timezone.now(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_processassessment_tasks_assess_department_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoringRuleSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(unique=True)),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('weights', models.JSONField(default=tasks.models.default_weights, help_text='Weight per factor score used for the total score')),
+                ('success_weights', models.JSONField(default=tasks.models.default_success_weights, help_text='Weight per factor score used for automation success prediction')),
+                ('not_suitable_max_score', models.IntegerField(default=10)),
+                ('possibly_automatable_max_score', models.IntegerField(default=20)),
+                ('is_active', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('activated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-version'],
+            },
+        ),
+        migrations.RunPython(create_default_rule_set, migrations.RunPython.noop),
+    ]
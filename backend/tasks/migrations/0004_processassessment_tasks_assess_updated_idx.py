@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_scoringruleset'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['updated_at'], name='tasks_assess_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:43
+
+from django.db import migrations, models
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, Round
+
+# Default PORTFOLIO_EFFORT_WEEKS when this migration was written; with other
+# settings, run `manage.py refresh_savings_per_effort` after migrating
+EFFORT_WEEKS = {'low': 2, 'medium': 8, 'high': 13}
+
+
+def backfill_savings_per_effort_week(apps, schema_editor):
+    ProcessAssessment = apps.get_model('tasks', 'ProcessAssessment')
+    savings = Cast(F('estimated_cost_savings'), FloatField())
+    ProcessAssessment.objects.update(savings_per_effort_week=Case(
+        *[
+            When(implementation_effort=tier, then=Round(savings / Value(float(weeks)), 2))
+            for tier, weeks in EFFORT_WEEKS.items()
+        ],
+        default=None,
+        output_field=FloatField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_processassessment_tasks_assess_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processassessment',
+            name='savings_per_effort_week',
+            field=models.FloatField(blank=True, editable=False, help_text='Estimated cost savings per week of implementation effort, kept for ranking', null=True),
+        ),
+        migrations.RunPython(backfill_savings_per_effort_week, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['assessed_by', '-estimated_cost_savings', '-id', 'department', 'priority', 'automation_suitability'], name='tasks_rank_user_cost_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['assessed_by', '-total_score', '-id', 'department', 'priority', 'automation_suitability'], name='tasks_rank_user_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['assessed_by', '-savings_per_effort_week', '-id', 'department', 'priority', 'automation_suitability'], name='tasks_rank_user_spew_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['department', '-estimated_cost_savings', '-id', 'priority', 'automation_suitability'], name='tasks_rank_dept_cost_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['department', '-total_score', '-id', 'priority', 'automation_suitability'], name='tasks_rank_dept_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['department', '-savings_per_effort_week', '-id', 'priority', 'automation_suitability'], name='tasks_rank_dept_spew_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['-estimated_cost_savings', '-id', 'department', 'priority', 'automation_suitability'], name='tasks_rank_org_cost_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['-total_score', '-id', 'department', 'priority', 'automation_suitability'], name='tasks_rank_org_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['-savings_per_effort_week', '-id', 'department', 'priority', 'automation_suitability'], name='tasks_rank_org_spew_idx'),
+        ),
+        # Superseded by the department-led ranking indexes
+        migrations.RemoveIndex(
+            model_name='processassessment',
+            name='tasks_assess_department_idx',
+        ),
+    ]
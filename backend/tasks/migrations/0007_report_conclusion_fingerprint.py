@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_duplicatecandidate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentreport',
+            name='conclusion_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
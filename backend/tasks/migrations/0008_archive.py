@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:09
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0007_report_conclusion_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProcessAssessment',
+            fields=[
+                ('process_name', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('department', models.CharField(blank=True, max_length=100)),
+                ('process_owner', models.CharField(blank=True, max_length=100)),
+                ('repetitiveness_score', models.IntegerField(help_text='How frequently is the process executed? (1=Rarely, 5=Daily)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('repetitiveness_remarks', models.TextField(blank=True)),
+                ('rule_based_score', models.IntegerField(help_text='Is the process deterministic with clear rules? (1=Requires judgment, 5=Rule-based)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('rule_based_remarks', models.TextField(blank=True)),
+                ('complexity_score', models.IntegerField(help_text='Process complexity (1=Very complex, 5=Simple)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('complexity_remarks', models.TextField(blank=True)),
+                ('volume_score', models.IntegerField(help_text='Transaction volume (1=Low volume, 5=High volume)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('volume_remarks', models.TextField(blank=True)),
+                ('standardization_score', models.IntegerField(help_text='Input/output standardization (1=Highly variable, 5=Standardized)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('standardization_remarks', models.TextField(blank=True)),
+                ('current_errors_score', models.IntegerField(help_text='Manual error rate (1=Low errors, 5=High errors)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('current_errors_remarks', models.TextField(blank=True)),
+                ('total_score', models.IntegerField(editable=False)),
+                ('automation_suitability', models.CharField(choices=[('not_suitable', 'Not Suitable for Automation'), ('possibly_automatable', 'Possibly Automatable'), ('highly_automatable', 'Highly Automatable')], editable=False, max_length=25)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], editable=False, max_length=10)),
+                ('estimated_cost_savings', models.DecimalField(blank=True, decimal_places=2, help_text='Estimated annual cost savings in USD', max_digits=10, null=True)),
+                ('estimated_time_savings', models.DecimalField(blank=True, decimal_places=2, help_text='Estimated time savings in hours per week', max_digits=8, null=True)),
+                ('implementation_effort', models.CharField(blank=True, choices=[('low', 'Low (1-2 weeks)'), ('medium', 'Medium (1-2 months)'), ('high', 'High (3+ months)')], max_length=50)),
+                ('savings_per_effort_week', models.FloatField(blank=True, editable=False, help_text='Estimated cost savings per week of implementation effort, kept for ranking', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField()),
+                ('assessed_by', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-total_score', '-created_at'],
+                'indexes': [models.Index(fields=['assessed_by', '-total_score', '-created_at'], name='tasks_archive_user_score_idx')],
+            },
+        ),
+    ]
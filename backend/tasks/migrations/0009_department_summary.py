@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department', models.CharField(blank=True, max_length=100, unique=True)),
+                ('assessment_count', models.PositiveIntegerField()),
+                ('assessor_count', models.PositiveIntegerField()),
+                ('highly_automatable_count', models.PositiveIntegerField()),
+                ('possibly_automatable_count', models.PositiveIntegerField()),
+                ('not_suitable_count', models.PositiveIntegerField()),
+                ('high_priority_count', models.PositiveIntegerField()),
+                ('average_score', models.FloatField()),
+                ('total_cost_savings', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('total_time_savings', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('top_processes', models.JSONField(default=list)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['department'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_department_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedprocessassessment',
+            index=models.Index(fields=['assessed_by', 'updated_at', 'id'], name='tasks_archive_user_export_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedprocessassessment',
+            index=models.Index(fields=['updated_at', 'id'], name='tasks_archive_export_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['assessed_by', 'updated_at', 'id'], name='tasks_assess_user_export_idx'),
+        ),
+    ]
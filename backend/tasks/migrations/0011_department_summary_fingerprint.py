@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_export_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='departmentsummary',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_department_summary_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='scoringruleset',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='tasks_single_active_rule_set'),
+        ),
+    ]
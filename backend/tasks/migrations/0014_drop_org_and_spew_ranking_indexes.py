@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_portfolio_job'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='processassessment',
+            name='tasks_rank_user_spew_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='processassessment',
+            name='tasks_rank_dept_spew_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='processassessment',
+            name='tasks_rank_org_cost_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='processassessment',
+            name='tasks_rank_org_score_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='processassessment',
+            name='tasks_rank_org_spew_idx',
+        ),
+    ]
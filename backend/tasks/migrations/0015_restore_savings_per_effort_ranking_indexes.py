@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0014_drop_org_and_spew_ranking_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['assessed_by', '-savings_per_effort_week', '-id', 'department', 'priority', 'automation_suitability'], name='tasks_rank_user_spew_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processassessment',
+            index=models.Index(fields=['department', '-savings_per_effort_week', '-id', 'priority', 'automation_suitability'], name='tasks_rank_dept_spew_idx'),
+        ),
+    ]
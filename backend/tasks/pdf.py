@@ -0,0 +1,92 @@
+"""
+PDF rendering for assessment reports.
+
+ReportLab is imported at module load, so views import this module lazily
+on first use instead of at URL resolution time.
+"""
+import io
+
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+
+def build_report_pdf(report):
+    """Render an assessment report to PDF and return the document bytes"""
+    # Create PDF
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    elements = []
+    
+    # Styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=colors.darkblue,
+        spaceAfter=30,
+    )
+    
+    # Title
+    elements.append(Paragraph(f"Process Automation Feasibility and Prioritization Report", title_style))
+    elements.append(Paragraph(f"Report: {report.title}", styles['Heading2']))
+    elements.append(Paragraph(f"Generated: {timezone.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
+    elements.append(Spacer(1, 20))
+    
+    # Summary
+    elements.append(Paragraph("Summary", styles['Heading2']))
+    summary_text = f"""
+    Total Processes Assessed: {report.assessments.count()}<br/>
+    Highly Automatable: {report.highly_automatable_count}<br/>
+    Possibly Automatable: {report.possibly_automatable_count}<br/>
+    Not Suitable for Automation: {report.not_suitable_count}
+    """
+    elements.append(Paragraph(summary_text, styles['Normal']))
+    elements.append(Spacer(1, 20))
+    
+    # Assessment Table
+    elements.append(Paragraph("Detailed Assessment", styles['Heading2']))
+    
+    table_data = [
+        ['Process Name', 'Repetitiveness', 'Rule-Based', 'Complexity', 'Volume', 'Standardization', 'Error Rate', 'Total Score', 'Suitability']
+    ]
+    
+    for assessment in report.assessments.all():
+        table_data.append([
+            assessment.process_name,
+            str(assessment.repetitiveness_score),
+            str(assessment.rule_based_score),
+            str(assessment.complexity_score),
+            str(assessment.volume_score),
+            str(assessment.standardization_score),
+            str(assessment.current_errors_score),
+            str(assessment.total_score),
+            assessment.automation_suitability_display
+        ])
+    
+    table = Table(table_data)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    elements.append(table)
+    elements.append(Spacer(1, 20))
+    
+    # AI Conclusion
+    if report.ai_conclusion:
+        elements.append(Paragraph("AI-Generated Conclusion", styles['Heading2']))
+        elements.append(Paragraph(report.ai_conclusion, styles['Normal']))
+    
+    doc.build(elements)
+    
+    return buffer.getvalue()
@@ -0,0 +1,202 @@
+"""
+Budget-constrained automation portfolio optimizer.
+
+Each implementation effort tier costs a fixed number of weeks
+(PORTFOLIO_EFFORT_WEEKS), so every candidate in a tier weighs the same. For a
+fixed number of picks from a tier, the best picks are always that tier's
+highest-savings candidates. The knapsack therefore reduces to choosing how
+many candidates to take from each tier. The solver sorts each tier once,
+takes prefix sums, and evaluates every feasible (high, medium) count pair as a
+NumPy grid; the light tier gets whatever budget remains. That is exact and
+runs in milliseconds for thousands of candidates. When the grid would exceed
+PORTFOLIO_EXACT_GRID_LIMIT cells, a greedy savings-per-week fill is used
+instead, and the LP relaxation bound reports how far from optimal it can be.
+"""
+import math
+
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, Round
+
+from .models import ProcessAssessment
+
+OBJECTIVE_FIELDS = {
+    'cost': 'estimated_cost_savings',
+    'time': 'estimated_time_savings',
+}
+
+GRID_CHUNK_CELLS = 1000000
+
+
+def refresh_savings_per_effort_week(queryset):
+    """Recompute the stored ranking key with one UPDATE, e.g. after PORTFOLIO_EFFORT_WEEKS changes"""
+    savings = Cast(F('estimated_cost_savings'), FloatField())
+    return queryset.update(savings_per_effort_week=Case(
+        *[
+            When(implementation_effort=tier, then=Round(savings / Value(float(weeks)), 2))
+            for tier, weeks in settings.PORTFOLIO_EFFORT_WEEKS.items()
+        ],
+        default=None,
+        output_field=FloatField(),
+    ))
+
+
+def candidate_queryset(queryset, objective='cost', priorities=None):
+    """Assessments with a known effort tier and positive savings for the objective"""
+    queryset = queryset.filter(
+        implementation_effort__in=list(settings.PORTFOLIO_EFFORT_WEEKS),
+        **{f'{OBJECTIVE_FIELDS[objective]}__gt': 0}
+    )
+    if priorities:
+        queryset = queryset.filter(priority__in=priorities)
+    return queryset
+
+
+def load_candidates(queryset, objective='cost', priorities=None):
+    """Per effort tier, (ids, savings) arrays sorted by savings descending then id"""
+    import numpy as np  # imported lazily to keep startup fast
+
+    field = OBJECTIVE_FIELDS[objective]
+    queryset = candidate_queryset(queryset, objective, priorities)
+    dtype = np.dtype([('id', np.int64), ('savings', np.float64)])
+    tiers = {}
+    for tier in settings.PORTFOLIO_EFFORT_WEEKS:
+        rows = np.fromiter(
+            queryset.filter(implementation_effort=tier).values_list('id', field).iterator(chunk_size=20000),
+            dtype=dtype
+        )
+        order = np.lexsort((rows['id'], -rows['savings']))
+        tiers[tier] = (rows['id'][order], rows['savings'][order])
+    return tiers
+
+
+def _prefix_sums(savings):
+    import numpy as np
+
+    return np.concatenate(([0.0], np.cumsum(savings)))
+
+
+def solve_exact(tiers, weeks, budget):
+    """Best pick count per tier, by evaluating every feasible combination of the heavier tiers"""
+    import numpy as np
+
+    order = sorted(tiers, key=lambda tier: weeks[tier], reverse=True)
+    heavy, light = order[:-1], order[-1]
+    prefix = {tier: _prefix_sums(tiers[tier][1]) for tier in order}
+    ranges = [np.arange(min(len(tiers[tier][0]), budget // weeks[tier]) + 1) for tier in heavy]
+
+    best_value, best_counts = -1.0, None
+    inner_cells = math.prod(len(values) for values in ranges[1:])
+    chunk = max(1, GRID_CHUNK_CELLS // max(1, inner_cells))
+    for start in range(0, len(ranges[0]), chunk):
+        grid = np.meshgrid(ranges[0][start:start + chunk], *ranges[1:], indexing='ij')
+        counts = [axis.ravel() for axis in grid]
+        used = sum(weeks[tier] * count for tier, count in zip(heavy, counts))
+        feasible = used <= budget
+        if not feasible.any():
+            continue
+        counts = [count[feasible] for count in counts]
+        light_count = np.minimum(len(tiers[light][0]), (budget - used[feasible]) // weeks[light])
+        value = prefix[light][light_count]
+        for tier, count in zip(heavy, counts):
+            value = value + prefix[tier][count]
+        index = int(np.argmax(value))
+        if value[index] > best_value:
+            best_value = float(value[index])
+            best_counts = {tier: int(count[index]) for tier, count in zip(heavy, counts)}
+            best_counts[light] = int(light_count[index])
+    return best_counts
+
+
+def solve_greedy(tiers, weeks, budget):
+    """Fill the budget by savings per week; returns pick counts and the LP relaxation upper bound"""
+    import numpy as np
+
+    tier_names = list(tiers)
+    ratios = np.concatenate([tiers[tier][1] / weeks[tier] for tier in tier_names])
+    tier_index = np.concatenate([np.full(len(tiers[tier][0]), i) for i, tier in enumerate(tier_names)])
+    item_weeks = np.array([weeks[tier] for tier in tier_names])[tier_index]
+    # Within a tier, ratios follow savings order, so picks stay a prefix of each sorted tier
+    order = np.argsort(-ratios, kind='stable')
+
+    cumulative = np.cumsum(item_weeks[order])
+    fits = int(np.searchsorted(cumulative, budget, side='right'))
+    upper_bound = float(np.sum(ratios[order[:fits]] * item_weeks[order[:fits]]))
+    if fits < len(order):
+        remaining = budget - (cumulative[fits - 1] if fits else 0)
+        upper_bound += float(ratios[order[fits]] * remaining)
+
+    counts = {tier: 0 for tier in tier_names}
+    remaining = budget
+    for position in order:
+        tier = tier_names[tier_index[position]]
+        if weeks[tier] <= remaining and counts[tier] < len(tiers[tier][0]):
+            counts[tier] += 1
+            remaining -= weeks[tier]
+        if remaining < min(weeks.values()):
+            break
+    return counts, upper_bound
+
+
+def _decimal_string(value):
+    # Same representation as the REST API, and safe for Celery's JSON serializer
+    return str(value) if value is not None else None
+
+
+def optimize_portfolio(queryset, budget_weeks, objective='cost', priorities=None, limit=500):
+    """Choose the assessments that maximize savings within an effort budget"""
+    weeks = settings.PORTFOLIO_EFFORT_WEEKS
+    tiers = load_candidates(queryset, objective, priorities)
+
+    heavy = sorted(weeks, key=weeks.get, reverse=True)[:-1]
+    grid_cells = math.prod(
+        min(len(tiers[tier][0]), budget_weeks // weeks[tier]) + 1 for tier in heavy
+    )
+    if grid_cells <= settings.PORTFOLIO_EXACT_GRID_LIMIT:
+        counts = solve_exact(tiers, weeks, budget_weeks)
+        method, upper_bound = 'exact', None
+    else:
+        counts, upper_bound = solve_greedy(tiers, weeks, budget_weeks)
+        method = 'greedy'
+    counts = {tier: counts[tier] for tier in weeks}
+
+    selected = []
+    for tier, count in counts.items():
+        ids, savings = tiers[tier]
+        selected.extend(zip(savings[:count].tolist(), ids[:count].tolist(), [tier] * count))
+    selected.sort(key=lambda item: (-item[0], item[1]))
+    total_savings = round(sum(item[0] for item in selected), 2)
+
+    listed = [assessment_id for _, assessment_id, _ in selected[:limit]]
+    details = ProcessAssessment.objects.in_bulk(listed)
+    processes = [
+        {
+            'id': assessment_id,
+            'process_name': details[assessment_id].process_name,
+            'department': details[assessment_id].department,
+            'implementation_effort': tier,
+            'effort_weeks': weeks[tier],
+            'priority': details[assessment_id].priority,
+            'total_score': details[assessment_id].total_score,
+            'estimated_cost_savings': _decimal_string(details[assessment_id].estimated_cost_savings),
+            'estimated_time_savings': _decimal_string(details[assessment_id].estimated_time_savings),
+        }
+        for _, assessment_id, tier in selected[:limit]
+        if assessment_id in details
+    ]
+
+    return {
+        'budget_weeks': budget_weeks,
+        'objective': objective,
+        'method': method,
+        'candidate_count': sum(len(ids) for ids, _ in tiers.values()),
+        'selected_count': len(selected),
+        'weeks_used': sum(weeks[tier] * count for tier, count in counts.items()),
+        'total_savings': total_savings,
+        'upper_bound': round(upper_bound, 2) if upper_bound is not None else total_savings,
+        'by_effort': {
+            tier: {'selected': count, 'weeks': weeks[tier] * count, 'candidates': len(tiers[tier][0])}
+            for tier, count in counts.items()
+        },
+        'processes': processes,
+    }
@@ -0,0 +1,113 @@
+"""
+Rendered report PDFs kept in private storage.
+
+A PDF is stored as ``<report id>/<fingerprint>.pdf`` under REPORT_PDF_ROOT.
+That directory is outside MEDIA_ROOT, so no static or media URL serves it and
+a PDF is only reachable through the authenticated download endpoint. The
+fingerprint covers the report's title, description and conclusion, the sorted
+ids of its assessments and their latest update, so replacing a member with an
+older assessment changes it as well. A download serves the
+stored file while it matches and otherwise renders and stores a new one. The
+nightly job renders the PDFs of reports created within
+PRECOMPUTE_REPORT_PDF_DAYS whose contents changed, and deletes the PDFs of
+reports that no longer exist.
+"""
+import hashlib
+import posixpath
+from array import array
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Max
+from django.utils import timezone
+
+from automation_ai.precompute import fingerprint, precompute_run
+from monitoring.metrics import EXPORT_SECONDS
+from .models import AssessmentReport
+
+Membership = AssessmentReport.assessments.through
+
+
+def pdf_storage():
+    """Storage of rendered PDFs under REPORT_PDF_ROOT, without a public URL"""
+    return FileSystemStorage(location=settings.REPORT_PDF_ROOT)
+
+
+def report_pdf_fingerprint(report):
+    """Fingerprint of a report, the ids of its assessments and their latest update"""
+    # Read from the (report, assessment) unique index in order, without touching the assessments
+    member_ids = (
+        Membership.objects.filter(assessmentreport_id=report.id)
+        .order_by('processassessment_id').values_list('processassessment_id', flat=True)
+    )
+    members = hashlib.sha256(array('q', member_ids).tobytes()).hexdigest()
+    updated = report.assessments.aggregate(updated=Max('updated_at'))['updated']
+    return fingerprint(report.id, report.title, report.description, report.ai_conclusion, members, updated)
+
+
+def _path(report_id, digest):
+    return posixpath.join(str(report_id), f'{digest}.pdf')
+
+
+def stored_report_pdf(report_id, digest):
+    """The stored PDF bytes for this fingerprint, or None"""
+    path = _path(report_id, digest)
+    storage = pdf_storage()
+    if not storage.exists(path):
+        return None
+    with storage.open(path, 'rb') as fh:
+        return fh.read()
+
+
+def store_report_pdf(report_id, digest, pdf):
+    """Store a rendered PDF and delete the report's older ones"""
+    path = _path(report_id, digest)
+    storage = pdf_storage()
+    if not storage.exists(path):
+        storage.save(path, ContentFile(pdf))
+    directory = posixpath.dirname(path)
+    for name in storage.listdir(directory)[1]:
+        if name != posixpath.basename(path):
+            storage.delete(posixpath.join(directory, name))
+
+
+def render_report_pdf(report):
+    """Render a report to PDF bytes"""
+    # ReportLab is heavy, so the PDF builder is only imported on first use
+    from .pdf import build_report_pdf
+    with EXPORT_SECONDS.time(format='pdf'):
+        return build_report_pdf(report)
+
+
+def _prune(storage):
+    """Delete the stored PDFs of deleted reports"""
+    if not storage.exists(''):
+        return
+    stored = storage.listdir('')[0]
+    existing = {
+        str(report_id) for report_id in
+        AssessmentReport.objects.filter(id__in=[name for name in stored if name.isdigit()]).values_list('id', flat=True)
+    }
+    for name in stored:
+        if name not in existing:
+            for file_name in storage.listdir(name)[1]:
+                storage.delete(posixpath.join(name, file_name))
+
+
+def precompute_report_pdfs():
+    """Render the PDFs of recent reports whose contents changed since their stored PDF"""
+    since = timezone.now() - timedelta(days=settings.PRECOMPUTE_REPORT_PDF_DAYS)
+    reports = AssessmentReport.objects.filter(created_at__gte=since).order_by('id')
+    storage = pdf_storage()
+    with precompute_run('report_pdfs') as run:
+        for report in reports.iterator():
+            digest = report_pdf_fingerprint(report)
+            if storage.exists(_path(report.id, digest)):
+                run.record('skipped')
+                continue
+            with run.item(f'report {report.id}'):
+                store_report_pdf(report.id, digest, render_report_pdf(report))
+        _prune(storage)
+    return run.counts
@@ -0,0 +1,174 @@
+"""
+Scoring rules for process assessments.
+
+The active ScoringRuleSet decides how the six factor scores combine into a
+total score and which suitability/priority class a total falls into. Every
+read checks which version is active with one indexed lookup and keeps the
+rules of that version in memory, so an activation made by any worker applies
+to the next save in every worker. Activating a new rule set re-scores existing
+rows with set-based UPDATEs, one short transaction per chunk.
+"""
+import math
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, FloatField, IntegerField, Max, Min, Value, When
+from django.db.models.functions import Cast, Floor
+from django.db.models.lookups import LessThanOrEqual
+from django.utils import timezone
+
+SCORE_FIELDS = [
+    'repetitiveness_score',
+    'rule_based_score',
+    'complexity_score',
+    'volume_score',
+    'standardization_score',
+    'current_errors_score',
+]
+
+DEFAULT_WEIGHTS = {field: 1 for field in SCORE_FIELDS}
+
+# Weights used by the automation success prediction
+DEFAULT_SUCCESS_WEIGHTS = {
+    'repetitiveness_score': 0.2,
+    'rule_based_score': 0.25,
+    'complexity_score': 0.15,
+    'volume_score': 0.15,
+    'standardization_score': 0.15,
+    'current_errors_score': 0.1,
+}
+
+DEFAULT_RULES = {
+    'version': 0,
+    'weights': DEFAULT_WEIGHTS,
+    'success_weights': DEFAULT_SUCCESS_WEIGHTS,
+    'not_suitable_max_score': 10,
+    'possibly_automatable_max_score': 20,
+}
+
+# (suitability, priority) per class, from lowest to highest total score
+CLASSES = [
+    ('not_suitable', 'low'),
+    ('possibly_automatable', 'medium'),
+    ('highly_automatable', 'high'),
+]
+
+RESCORE_CHUNK_SIZE = 50000
+# Saves that loaded the previous rules up to this long before an activation are re-scored after it
+RESCORE_CATCH_UP = timedelta(seconds=60)
+
+# Rules of the active version this process loaded last, keyed by (id, activated_at) of its rule set
+_loaded_rules = {}
+
+
+def get_active_rules():
+    """Return the active rules as a plain dict, falling back to the built-in defaults"""
+    from .models import ScoringRuleSet
+    active = ScoringRuleSet.objects.filter(is_active=True).values_list('pk', 'activated_at').first()
+    rules = _loaded_rules.get(active)
+    if rules is None:
+        rule_set = ScoringRuleSet.objects.filter(pk=active[0]).first() if active else None
+        rules = rule_set.as_rules() if rule_set else DEFAULT_RULES
+        _loaded_rules.clear()
+        _loaded_rules[active] = rules
+    return rules
+
+
+def invalidate_active_rules():
+    _loaded_rules.clear()
+
+
+def _integral(weights):
+    return all(float(weight).is_integer() for weight in weights.values())
+
+
+def weighted_total(scores, weights):
+    """Weighted sum of factor scores rounded half up, matching the SQL expression"""
+    total = sum(scores[field] * weights[field] for field in SCORE_FIELDS)
+    if _integral(weights):
+        return int(total)
+    return math.floor(total + 0.5)
+
+
+def classify(total, rules):
+    """Return the (suitability, priority) pair for a total score"""
+    if total <= rules['not_suitable_max_score']:
+        return CLASSES[0]
+    if total <= rules['possibly_automatable_max_score']:
+        return CLASSES[1]
+    return CLASSES[2]
+
+
+def score_matrix(scores, rules):
+    """Vectorized weighted totals and class indices (into CLASSES) for an (n, 6) score array"""
+    import numpy as np  # imported lazily to keep startup fast
+
+    weights = np.array([rules['weights'][field] for field in SCORE_FIELDS], dtype=float)
+    if _integral(rules['weights']):
+        totals = np.asarray(scores, dtype=np.int64) @ weights.astype(np.int64)
+    else:
+        totals = np.floor(np.asarray(scores, dtype=float) @ weights + 0.5).astype(np.int64)
+    thresholds = [rules['not_suitable_max_score'], rules['possibly_automatable_max_score']]
+    classes = np.searchsorted(thresholds, totals, side='left')
+    return totals, classes
+
+
+def total_score_expression(weights):
+    """SQL expression computing the weighted total from the factor columns"""
+    if _integral(weights):
+        terms = [F(field) * Value(int(weights[field])) for field in SCORE_FIELDS]
+        return sum(terms[1:], terms[0])
+    terms = [F(field) * Value(float(weights[field]), output_field=FloatField()) for field in SCORE_FIELDS]
+    total = sum(terms[1:], terms[0])
+    return Cast(Floor(total + Value(0.5, output_field=FloatField())), IntegerField())
+
+
+def class_expression(total, rules, column):
+    """CASE expression mapping a total score to column 0 (suitability) or 1 (priority) of CLASSES"""
+    return Case(
+        When(LessThanOrEqual(total, rules['not_suitable_max_score']), then=Value(CLASSES[0][column])),
+        When(LessThanOrEqual(total, rules['possibly_automatable_max_score']), then=Value(CLASSES[1][column])),
+        default=Value(CLASSES[2][column]),
+    )
+
+
+def rescore_assessments(rules, updated_since=None, chunk_size=RESCORE_CHUNK_SIZE, rule_set_id=None):
+    """Recompute derived scores that differ from ``rules`` with chunked UPDATE ... CASE statements
+
+    Each chunk commits on its own. With ``rule_set_id``, each chunk first locks
+    that rule set and the pass stops once it is no longer active, so a
+    superseded activation cannot overwrite rows the newer one re-scored.
+    """
+    from .models import ProcessAssessment, ScoringRuleSet
+
+    total = total_score_expression(rules['weights'])
+    scores = {
+        'total_score': total,
+        'automation_suitability': class_expression(total, rules, 0),
+        'priority': class_expression(total, rules, 1),
+    }
+    queryset = ProcessAssessment.objects.all()
+    if updated_since is not None:
+        queryset = queryset.filter(updated_at__gte=updated_since)
+
+    bounds = queryset.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return 0
+
+    updated = 0
+    for start in range(bounds['low'], bounds['high'] + 1, chunk_size):
+        with transaction.atomic():
+            if rule_set_id is not None and not list(
+                ScoringRuleSet.objects.select_for_update().filter(pk=rule_set_id, is_active=True).values_list('pk')
+            ):
+                break
+            # Rows already scored by these rules keep their updated_at, so exports do not resend them
+            updated += queryset.filter(
+                id__gte=start, id__lt=start + chunk_size
+            ).exclude(**scores).update(
+                **scores,
+                # A Python timestamp is stored like auto_now's; SQLite's Now() keeps only milliseconds,
+                # which then never compare equal to the same instant passed as a parameter
+                updated_at=timezone.now(),
+            )
+    return updated
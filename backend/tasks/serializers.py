@@ -1,8 +1,18 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from rest_framework import serializers
-from .models import ProcessAssessment, AssessmentReport, ProcessCategory
 
+from automation_ai.events import track_job
+from automation_ai.fieldsets import SparseFieldsetMixin
+from automation_ai.rows import Constant, FullName, Label
+from .models import (
+    ProcessAssessment, AssessmentReport, ProcessCategory, ScoringRuleSet, DuplicateCandidate, DepartmentSummary
+)
+from .membership import add_report_members, add_report_members_from_queryset, owned_assessment_ids
+from .scoring import SCORE_FIELDS, get_active_rules
 
-class ProcessAssessmentSerializer(serializers.ModelSerializer):
+
+class ProcessAssessmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     automation_suitability_display = serializers.ReadOnlyField()
     priority_display = serializers.ReadOnlyField()
     recommendation = serializers.ReadOnlyField()
@@ -23,34 +33,121 @@ class ProcessAssessmentSerializer(serializers.ModelSerializer):
             'assessed_by', 'created_at', 'updated_at'
         ]
         read_only_fields = ['total_score', 'automation_suitability', 'priority', 'assessed_by']
+        field_dependencies = {
+            'automation_suitability_display': ['automation_suitability'],
+            'priority_display': ['priority'],
+            'recommendation': ['automation_suitability'],
+        }
+        row_fields = {
+            'automation_suitability_display': Label(
+                'automation_suitability', ProcessAssessment.AUTOMATION_SUITABILITY_CHOICES
+            ),
+            'priority_display': Label('priority', ProcessAssessment.PRIORITY_CHOICES),
+            'recommendation': Label('automation_suitability', [
+                (value, ProcessAssessment(automation_suitability=value).recommendation)
+                for value, _ in ProcessAssessment.AUTOMATION_SUITABILITY_CHOICES
+            ]),
+        }
     
     def create(self, validated_data):
         validated_data['assessed_by'] = self.context['request'].user
         return super().create(validated_data)
 
 
-class ProcessAssessmentListSerializer(serializers.ModelSerializer):
+class ProcessAssessmentListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Simplified serializer for list views"""
     automation_suitability_display = serializers.ReadOnlyField()
     priority_display = serializers.ReadOnlyField()
     assessed_by_name = serializers.CharField(source='assessed_by.get_full_name', read_only=True)
+    archived = serializers.BooleanField(read_only=True, default=False)
     
     class Meta:
         model = ProcessAssessment
         fields = [
             'id', 'process_name', 'department', 'total_score',
             'automation_suitability', 'automation_suitability_display',
-            'priority', 'priority_display', 'assessed_by_name', 'created_at'
+            'priority', 'priority_display', 'assessed_by_name', 'created_at', 'archived'
+        ]
+        field_dependencies = {
+            'automation_suitability_display': ['automation_suitability'],
+            'priority_display': ['priority'],
+            'archived': [],
+        }
+        # How RowSerializer builds the computed fields from values_list() rows
+        row_fields = {
+            'automation_suitability_display': Label(
+                'automation_suitability', ProcessAssessment.AUTOMATION_SUITABILITY_CHOICES
+            ),
+            'priority_display': Label('priority', ProcessAssessment.PRIORITY_CHOICES),
+            'assessed_by_name': FullName('assessed_by'),
+            'archived': Constant(False),
+        }
+
+
+class ProcessAssessmentRankingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Compact rows for top-K rankings"""
+    
+    class Meta:
+        model = ProcessAssessment
+        fields = [
+            'id', 'process_name', 'department', 'total_score',
+            'automation_suitability', 'priority', 'implementation_effort',
+            'estimated_cost_savings', 'estimated_time_savings', 'savings_per_effort_week'
         ]
 
 
-class AssessmentReportSerializer(serializers.ModelSerializer):
+class AssessmentRankingQuerySerializer(serializers.Serializer):
+    """Query parameters of the ranking endpoint"""
+    sort = serializers.ChoiceField(
+        choices=['estimated_cost_savings', 'total_score', 'savings_per_effort_week'],
+        default='estimated_cost_savings'
+    )
+    department = serializers.CharField(required=False)
+    priority = serializers.ChoiceField(choices=ProcessAssessment.PRIORITY_CHOICES, required=False)
+    automation_suitability = serializers.ChoiceField(
+        choices=ProcessAssessment.AUTOMATION_SUITABILITY_CHOICES, required=False
+    )
+    scope = serializers.ChoiceField(choices=['mine', 'organization'], default='mine')
+    limit = serializers.IntegerField(default=50, min_value=1, max_value=500)
+
+
+class ReportAssessmentFilterSerializer(serializers.Serializer):
+    """Selects which of the user's assessments a report is built from"""
+    LOOKUPS = {
+        'department': 'department',
+        'priority': 'priority',
+        'automation_suitability': 'automation_suitability',
+        'implementation_effort': 'implementation_effort',
+        'min_total_score': 'total_score__gte',
+        'max_total_score': 'total_score__lte',
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lt',
+    }
+    
+    department = serializers.CharField(required=False)
+    priority = serializers.ChoiceField(choices=ProcessAssessment.PRIORITY_CHOICES, required=False)
+    automation_suitability = serializers.ChoiceField(
+        choices=ProcessAssessment.AUTOMATION_SUITABILITY_CHOICES, required=False
+    )
+    implementation_effort = serializers.ChoiceField(choices=['low', 'medium', 'high'], required=False)
+    min_total_score = serializers.IntegerField(required=False)
+    max_total_score = serializers.IntegerField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    
+    @classmethod
+    def filter_queryset(cls, queryset, criteria):
+        return queryset.filter(**{cls.LOOKUPS[name]: value for name, value in criteria.items()})
+
+
+class AssessmentReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     assessments = ProcessAssessmentListSerializer(many=True, read_only=True)
     assessment_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True,
         required=False
     )
+    assessment_filter = ReportAssessmentFilterSerializer(write_only=True, required=False)
     highly_automatable_count = serializers.ReadOnlyField()
     possibly_automatable_count = serializers.ReadOnlyField()
     not_suitable_count = serializers.ReadOnlyField()
@@ -59,35 +156,53 @@ class AssessmentReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = AssessmentReport
         fields = [
-            'id', 'title', 'description', 'assessments', 'assessment_ids',
+            'id', 'title', 'description', 'assessments', 'assessment_ids', 'assessment_filter',
             'generated_by', 'generated_by_name', 'ai_conclusion',
             'highly_automatable_count', 'possibly_automatable_count', 'not_suitable_count',
             'created_at'
         ]
         read_only_fields = ['generated_by', 'ai_conclusion']
+        expandable_fields = ['assessments']
+        # The counts run their own queries over the report's assessments
+        field_dependencies = {
+            'highly_automatable_count': [],
+            'possibly_automatable_count': [],
+            'not_suitable_count': [],
+        }
+    
+    def validate(self, attrs):
+        if attrs.get('assessment_ids') and attrs.get('assessment_filter') is not None:
+            raise serializers.ValidationError('Provide either assessment_ids or assessment_filter, not both')
+        return attrs
     
     def create(self, validated_data):
         assessment_ids = validated_data.pop('assessment_ids', [])
-        validated_data['generated_by'] = self.context['request'].user
+        assessment_filter = validated_data.pop('assessment_filter', None)
+        user = self.context['request'].user
+        validated_data['generated_by'] = user
         
-        report = super().create(validated_data)
-        
-        if assessment_ids:
-            assessments = ProcessAssessment.objects.filter(
-                id__in=assessment_ids,
-                assessed_by=self.context['request'].user
-            )
-            report.assessments.set(assessments)
+        with transaction.atomic():
+            report = super().create(validated_data)
+            
+            # Membership is written from ids only, without loading assessments
+            if assessment_ids:
+                add_report_members(report, owned_assessment_ids(user, assessment_ids))
+            elif assessment_filter is not None:
+                assessments = ReportAssessmentFilterSerializer.filter_queryset(
+                    ProcessAssessment.objects.filter(assessed_by=user), assessment_filter
+                )
+                add_report_members_from_queryset(report, assessments)
         
         return report
 
 
-class ProcessCategorySerializer(serializers.ModelSerializer):
+class ProcessCategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     process_count = serializers.SerializerMethodField()
     
     class Meta:
         model = ProcessCategory
         fields = ['id', 'name', 'description', 'color', 'process_count', 'created_at']
+        field_dependencies = {'process_count': []}
     
     def get_process_count(self, obj):
         # This would require adding a category field to ProcessAssessment model
@@ -95,6 +210,84 @@ class ProcessCategorySerializer(serializers.ModelSerializer):
         return 0
 
 
+class ScoringRuleSetSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ScoringRuleSet
+        fields = [
+            'id', 'version', 'name', 'weights', 'success_weights',
+            'not_suitable_max_score', 'possibly_automatable_max_score',
+            'is_active', 'created_at', 'activated_at'
+        ]
+        read_only_fields = ['is_active', 'created_at', 'activated_at']
+    
+    def validate(self, attrs):
+        rule_set = ScoringRuleSet(**attrs)
+        try:
+            rule_set.clean()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(serializers.as_serializer_error(exc))
+        return attrs
+
+
+class ScoringSimulationSerializer(serializers.Serializer):
+    """Candidate rules for a what-if simulation; omitted values fall back to the active rules"""
+    scope = serializers.ChoiceField(choices=['mine', 'organization'], default='mine')
+    weights = serializers.DictField(child=serializers.FloatField(min_value=0), required=False)
+    not_suitable_max_score = serializers.IntegerField(required=False)
+    possibly_automatable_max_score = serializers.IntegerField(required=False)
+    changed_limit = serializers.IntegerField(default=100, min_value=0, max_value=1000)
+    
+    def validate_weights(self, value):
+        unknown = set(value) - set(SCORE_FIELDS)
+        if unknown:
+            raise serializers.ValidationError(f"Unknown factors: {', '.join(sorted(unknown))}")
+        return value
+    
+    def validate(self, attrs):
+        active = get_active_rules()
+        rules = {
+            'version': None,
+            'weights': {**active['weights'], **attrs.get('weights', {})},
+            'success_weights': active['success_weights'],
+            'not_suitable_max_score': attrs.get('not_suitable_max_score', active['not_suitable_max_score']),
+            'possibly_automatable_max_score': attrs.get(
+                'possibly_automatable_max_score', active['possibly_automatable_max_score']
+            ),
+        }
+        if rules['not_suitable_max_score'] >= rules['possibly_automatable_max_score']:
+            raise serializers.ValidationError(
+                "The not-suitable threshold must be below the possibly-automatable threshold"
+            )
+        attrs['rules'] = rules
+        return attrs
+
+
+class PortfolioOptimizationSerializer(serializers.Serializer):
+    """Budget and options for the automation portfolio optimizer"""
+    budget_weeks = serializers.IntegerField(min_value=1, max_value=100000)
+    objective = serializers.ChoiceField(choices=['cost', 'time'], default='cost')
+    priorities = serializers.ListField(
+        child=serializers.ChoiceField(choices=ProcessAssessment.PRIORITY_CHOICES),
+        required=False
+    )
+    scope = serializers.ChoiceField(choices=['mine', 'organization'], default='mine')
+    limit = serializers.IntegerField(default=500, min_value=0, max_value=10000)
+    background = serializers.BooleanField(default=False)
+
+
+class DuplicateCandidateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    assessment = ProcessAssessmentListSerializer(read_only=True)
+    duplicate = ProcessAssessmentListSerializer(read_only=True)
+    
+    class Meta:
+        model = DuplicateCandidate
+        fields = [
+            'id', 'assessment', 'duplicate', 'similarity', 'score_distance',
+            'status', 'detected_at', 'resolved_by', 'resolved_at'
+        ]
+        expandable_fields = ['assessment', 'duplicate']
+
+
 class ProcessAssessmentStatsSerializer(serializers.Serializer):
     """Serializer for dashboard statistics"""
     total_processes = serializers.IntegerField()
@@ -105,6 +298,35 @@ class ProcessAssessmentStatsSerializer(serializers.Serializer):
     total_estimated_savings = serializers.DecimalField(max_digits=15, decimal_places=2)
     
     
+class DepartmentSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Aggregates of one department's assessments"""
+    
+    class Meta:
+        model = DepartmentSummary
+        fields = [
+            'department', 'assessment_count', 'assessor_count',
+            'highly_automatable_count', 'possibly_automatable_count', 'not_suitable_count',
+            'high_priority_count', 'average_score', 'total_cost_savings', 'total_time_savings',
+            'top_processes', 'refreshed_at'
+        ]
+
+
+class OrganizationSummarySerializer(SparseFieldsetMixin, serializers.Serializer):
+    """Organization-wide totals combined from the department summaries"""
+    department_count = serializers.IntegerField()
+    assessment_count = serializers.IntegerField()
+    highly_automatable_count = serializers.IntegerField()
+    possibly_automatable_count = serializers.IntegerField()
+    not_suitable_count = serializers.IntegerField()
+    high_priority_count = serializers.IntegerField()
+    average_score = serializers.FloatField()
+    total_cost_savings = serializers.DecimalField(max_digits=18, decimal_places=2)
+    total_time_savings = serializers.DecimalField(max_digits=16, decimal_places=2)
+    top_processes = serializers.ListField(child=serializers.DictField())
+    refreshed_at = serializers.DateTimeField(allow_null=True)
+    departments = DepartmentSummarySerializer(many=True)
+
+
 class BulkAssessmentSerializer(serializers.Serializer):
     """Serializer for bulk assessment operations"""
     processes = ProcessAssessmentSerializer(many=True)
@@ -114,9 +336,12 @@ class BulkAssessmentSerializer(serializers.Serializer):
         user = self.context['request'].user
         
         created_processes = []
-        for process_data in processes_data:
-            process_data['assessed_by'] = user
-            process = ProcessAssessment.objects.create(**process_data)
-            created_processes.append(process)
+        with track_job(user.id, 'bulk_import', total=len(processes_data)) as job:
+            for process_data in processes_data:
+                process_data['assessed_by'] = user
+                process = ProcessAssessment.objects.create(**process_data)
+                created_processes.append(process)
+                job.progress(len(created_processes), len(processes_data))
+            job.result = {'created': len(created_processes)}
         
         return {'processes': created_processes}
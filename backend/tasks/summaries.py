@@ -0,0 +1,138 @@
+"""
+Organization and department aggregates for manager and admin dashboards.
+
+Computing cross-user statistics on every dashboard load would scan all
+assessments. ``refresh_department_summaries`` materializes them instead into
+one DepartmentSummary row per department:
+
+- the counts, averages and totals come from one grouped query, and
+- each department's top processes come from a LIMIT query that walks the
+  department cost-savings ranking index.
+
+Organization totals are combined from the department rows. The org-wide top
+processes are the best of the departments' top lists, which always contain
+them.
+
+The summaries record the fingerprint of the assessments they were built from.
+A refresh first compares it with the current one, and when nothing changed only
+marks the summaries as current instead of rebuilding them. The Celery beat
+schedule runs such a refresh every few minutes. When the summaries are older
+than ORGANIZATION_SUMMARY_MAX_AGE seconds, the first dashboard request
+refreshes them, coalesced so concurrent requests share one refresh.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from automation_ai.precompute import contents_fingerprint
+from automation_ai.singleflight import single_flight
+from .models import DepartmentSummary, ProcessAssessment
+
+TOP_PROCESS_FIELDS = [
+    'id', 'process_name', 'estimated_cost_savings', 'total_score', 'automation_suitability', 'priority',
+]
+
+
+def _top_processes(department, limit):
+    rows = (
+        ProcessAssessment.objects.filter(department=department, estimated_cost_savings__isnull=False)
+        .order_by('-estimated_cost_savings', '-id')
+        .values(*TOP_PROCESS_FIELDS)[:limit]
+    )
+    return [{**row, 'estimated_cost_savings': str(row['estimated_cost_savings'])} for row in rows]
+
+
+def assessments_fingerprint():
+    return contents_fingerprint(ProcessAssessment.objects.all())[1]
+
+
+def refresh_department_summaries(fingerprint=None):
+    """Rebuild every department summary from the live assessments; returns the number of departments"""
+    fingerprint = fingerprint or assessments_fingerprint()
+    rows = (
+        ProcessAssessment.objects.order_by().values('department').annotate(
+            assessment_count=Count('id'),
+            assessor_count=Count('assessed_by', distinct=True),
+            highly_automatable_count=Count('id', filter=Q(automation_suitability='highly_automatable')),
+            possibly_automatable_count=Count('id', filter=Q(automation_suitability='possibly_automatable')),
+            not_suitable_count=Count('id', filter=Q(automation_suitability='not_suitable')),
+            high_priority_count=Count('id', filter=Q(priority='high')),
+            average_score=Avg('total_score'),
+            total_cost_savings=Sum('estimated_cost_savings'),
+            total_time_savings=Sum('estimated_time_savings'),
+        )
+    )
+    now = timezone.now()
+    summaries = [
+        DepartmentSummary(
+            **{
+                **row,
+                'total_cost_savings': row['total_cost_savings'] or 0,
+                'total_time_savings': row['total_time_savings'] or 0,
+            },
+            top_processes=_top_processes(row['department'], settings.ORGANIZATION_TOP_PROCESSES),
+            fingerprint=fingerprint,
+            refreshed_at=now,
+        )
+        for row in rows
+    ]
+    # Upsert, so a refresh racing another one cannot trip the unique department.
+    # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target, and Django
+    # rejects unique_fields on backends that cannot name one.
+    update_fields = [field.name for field in DepartmentSummary._meta.concrete_fields if field.name not in ('id', 'department')]
+    unique_fields = ['department'] if connection.features.supports_update_conflicts_with_target else None
+    with transaction.atomic():
+        DepartmentSummary.objects.bulk_create(
+            summaries, update_conflicts=True, unique_fields=unique_fields, update_fields=update_fields
+        )
+        DepartmentSummary.objects.exclude(department__in=[summary.department for summary in summaries]).delete()
+    return len(summaries)
+
+
+def refresh_department_summaries_if_changed():
+    """Rebuild the summaries when assessments changed since they were built; returns whether they were rebuilt"""
+    fingerprint = assessments_fingerprint()
+    summaries = DepartmentSummary.objects.all()
+    if summaries.exists() and not summaries.exclude(fingerprint=fingerprint).exists():
+        summaries.update(refreshed_at=timezone.now())
+        return False
+    refresh_department_summaries(fingerprint)
+    return True
+
+
+def department_summaries():
+    """All department summaries, refreshed first when they are missing or older than the max age"""
+    summaries = list(DepartmentSummary.objects.all())
+    max_age = settings.ORGANIZATION_SUMMARY_MAX_AGE
+    if not summaries or any((timezone.now() - summary.refreshed_at).total_seconds() > max_age for summary in summaries):
+        single_flight('department_summaries', (), refresh_department_summaries_if_changed)
+        summaries = list(DepartmentSummary.objects.all())
+    return summaries
+
+
+def organization_summary(summaries):
+    """Organization-wide totals combined from the department summaries"""
+    assessment_count = sum(summary.assessment_count for summary in summaries)
+    top_processes = sorted(
+        (process for summary in summaries for process in summary.top_processes),
+        key=lambda process: (-Decimal(process['estimated_cost_savings']), -process['id']),
+    )[:settings.ORGANIZATION_TOP_PROCESSES]
+    return {
+        'department_count': len(summaries),
+        'assessment_count': assessment_count,
+        'highly_automatable_count': sum(summary.highly_automatable_count for summary in summaries),
+        'possibly_automatable_count': sum(summary.possibly_automatable_count for summary in summaries),
+        'not_suitable_count': sum(summary.not_suitable_count for summary in summaries),
+        'high_priority_count': sum(summary.high_priority_count for summary in summaries),
+        'average_score': (
+            sum(summary.average_score * summary.assessment_count for summary in summaries) / assessment_count
+            if assessment_count else 0
+        ),
+        'total_cost_savings': sum((summary.total_cost_savings for summary in summaries), Decimal('0')),
+        'total_time_savings': sum((summary.total_time_savings for summary in summaries), Decimal('0')),
+        'top_processes': top_processes,
+        'refreshed_at': min((summary.refreshed_at for summary in summaries), default=None),
+    }
@@ -0,0 +1,68 @@
+from automation_ai.archival import archive_old_records
+from automation_ai.celery import app
+from automation_ai.events import track_job
+from automation_ai.precompute import precompute_run
+from .models import AssessmentReport, ProcessAssessment
+from .conclusions import refresh_report_conclusions
+from .dashboards import precompute_dashboard_stats
+from .dedup import detect_duplicates
+from .portfolio import optimize_portfolio
+from .report_pdfs import precompute_report_pdfs
+from .summaries import refresh_department_summaries_if_changed
+
+
+@app.task(bind=True)
+def optimize_portfolio_task(self, user_id, scope, budget_weeks, objective, priorities, limit):
+    """Background portfolio optimization for candidate sets too large to solve in a request"""
+    from django.contrib.auth import get_user_model
+    user = get_user_model().objects.get(pk=user_id)
+    queryset = ProcessAssessment.objects.for_scope(user, scope)
+    with track_job(user_id, 'portfolio_optimization', job_id=self.request.id) as job:
+        result = optimize_portfolio(queryset, budget_weeks, objective, priorities, limit)
+        job.result = {'selected_count': result['selected_count'], 'total_savings': result['total_savings']}
+    return result
+
+
+@app.task(bind=True)
+def detect_duplicates_task(self, user_id=None):
+    """Rebuild the open duplicate candidates across all assessments, notifying the requesting user"""
+    if user_id is None:
+        return detect_duplicates()
+    with track_job(user_id, 'duplicate_detection', job_id=self.request.id) as job:
+        job.result = detect_duplicates()
+    return job.result
+
+
+@app.task
+def refresh_report_conclusions_task(user_id=None):
+    """Refresh stale report conclusions, for one user or for every report"""
+    queryset = AssessmentReport.objects.all()
+    if user_id is not None:
+        queryset = queryset.filter(generated_by_id=user_id)
+    return refresh_report_conclusions(queryset)
+
+
+@app.task
+def archive_old_records_task():
+    """Move analyses and assessments past the archive horizons into the archive tables"""
+    return archive_old_records()
+
+
+@app.task
+def refresh_department_summaries_task():
+    """Rebuild the materialized department summaries behind the organization dashboards, if assessments changed"""
+    with precompute_run('department_summaries') as run:
+        run.record('refreshed' if refresh_department_summaries_if_changed() else 'skipped')
+    return run.counts
+
+
+@app.task
+def precompute_dashboard_stats_task():
+    """Cache every user's dashboard statistics whose assessments changed"""
+    return precompute_dashboard_stats()
+
+
+@app.task
+def precompute_report_pdfs_task():
+    """Render the PDFs of recent reports whose contents changed"""
+    return precompute_report_pdfs()
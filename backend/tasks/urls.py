@@ -6,17 +6,37 @@ urlpatterns = [
     path('assessments/', views.ProcessAssessmentListCreateView.as_view(), name='assessment-list-create'),
     path('assessments/<int:pk>/', views.ProcessAssessmentDetailView.as_view(), name='assessment-detail'),
     path('assessments/bulk/', views.bulk_assessment, name='bulk-assessment'),
+    path('assessments/ranking/', views.assessment_ranking, name='assessment-ranking'),
+    path('assessments/export/', views.export_assessments, name='export-assessments'),
     
     # Reports
     path('reports/', views.AssessmentReportListCreateView.as_view(), name='report-list-create'),
     path('reports/<int:pk>/', views.AssessmentReportDetailView.as_view(), name='report-detail'),
+    path('reports/ai-conclusions/refresh/', views.refresh_ai_conclusions, name='refresh-ai-conclusions'),
     path('reports/<int:report_id>/ai-conclusion/', views.generate_ai_conclusion, name='generate-ai-conclusion'),
     path('reports/<int:report_id>/download/csv/', views.download_report_csv, name='download-report-csv'),
     path('reports/<int:report_id>/download/pdf/', views.download_report_pdf, name='download-report-pdf'),
     
     # Dashboard
     path('dashboard/stats/', views.dashboard_stats, name='dashboard-stats'),
+    path('dashboard/organization/', views.organization_stats, name='organization-stats'),
+    path('dashboard/department/', views.department_stats, name='department-stats'),
     
     # Categories
     path('categories/', views.ProcessCategoryListCreateView.as_view(), name='category-list-create'),
+    
+    # Duplicate detection
+    path('duplicates/', views.DuplicateCandidateListView.as_view(), name='duplicate-list'),
+    path('duplicates/detect/', views.detect_duplicates, name='detect-duplicates'),
+    path('duplicates/<int:candidate_id>/merge/', views.merge_duplicate_candidate, name='merge-duplicate'),
+    path('duplicates/<int:candidate_id>/dismiss/', views.dismiss_duplicate_candidate, name='dismiss-duplicate'),
+    
+    # Portfolio optimizer
+    path('portfolio/optimize/', views.optimize_automation_portfolio, name='optimize-portfolio'),
+    path('portfolio/optimize/<str:task_id>/', views.portfolio_job_status, name='portfolio-job-status'),
+    
+    # Scoring rules
+    path('scoring-rules/', views.ScoringRuleSetListCreateView.as_view(), name='scoring-rules-list-create'),
+    path('scoring-rules/simulate/', views.simulate_scoring_rules, name='simulate-scoring-rules'),
+    path('scoring-rules/<int:version>/activate/', views.activate_scoring_rules, name='activate-scoring-rules'),
 ]
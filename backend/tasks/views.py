@@ -1,45 +1,98 @@
 from rest_framework import generics, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
-from django.db.models import Avg, Sum, Count
+from django.conf import settings
+from django.db.models import Q
 from django.http import HttpResponse
 from django.template.loader import get_template
 from django.utils import timezone
+from datetime import timedelta
 import csv
-import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-
-from .models import ProcessAssessment, AssessmentReport, ProcessCategory
+
+from accounts.permissions import IsAdminRole, has_organization_access
+from automation_ai.archival import as_instances, include_archived, with_archived
+from automation_ai.events import track_job
+from automation_ai.exports import export_serializer, export_state, stream_export
+from automation_ai.fieldsets import SparseFieldsetViewMixin, optimize_queryset
+from automation_ai.pagination import LargePagePagination
+from automation_ai.renderers import FastJSONRenderer, NDJSONRenderer
+from automation_ai.rows import RowSerializer
+from automation_ai.singleflight import single_flight
+from monitoring.metrics import EXPORT_SECONDS
+from .models import (
+    ProcessAssessment, ArchivedProcessAssessment, AssessmentReport, ProcessCategory, ScoringRuleSet, DuplicateCandidate,
+    PortfolioJob,
+)
 from .serializers import (
     ProcessAssessmentSerializer,
     ProcessAssessmentListSerializer,
     AssessmentReportSerializer,
     ProcessCategorySerializer,
     ProcessAssessmentStatsSerializer,
-    BulkAssessmentSerializer
+    DepartmentSummarySerializer,
+    OrganizationSummarySerializer,
+    BulkAssessmentSerializer,
+    ScoringRuleSetSerializer,
+    ScoringSimulationSerializer,
+    PortfolioOptimizationSerializer,
+    ProcessAssessmentRankingSerializer,
+    AssessmentRankingQuerySerializer,
+    DuplicateCandidateSerializer
 )
+from .conclusions import refresh_conclusion, refresh_report_conclusions
+from .dashboards import user_dashboard_stats
+from .dedup import merge_duplicate
+from .portfolio import candidate_queryset, optimize_portfolio
+from .report_pdfs import render_report_pdf, report_pdf_fingerprint, store_report_pdf, stored_report_pdf
+from .simulation import simulate
+from .summaries import department_summaries, organization_summary
 
 
-class ProcessAssessmentListCreateView(generics.ListCreateAPIView):
+class ProcessAssessmentListCreateView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     """List all process assessments or create a new one"""
     serializer_class = ProcessAssessmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = LargePagePagination
+    
+    # Columns read from both tables when archived assessments are included
+    archive_fields = [
+        'id', 'process_name', 'department', 'total_score',
+        'automation_suitability', 'priority', 'assessed_by_id', 'created_at',
+    ]
     
     def get_queryset(self):
-        return ProcessAssessment.objects.filter(assessed_by=self.request.user)
+        queryset = ProcessAssessment.objects.filter(assessed_by=self.request.user)
+        if self.request.method == 'GET' and include_archived(self.request):
+            archived = ArchivedProcessAssessment.objects.filter(assessed_by=self.request.user)
+            return with_archived(queryset, archived, self.archive_fields).order_by('-total_score', '-created_at')
+        return queryset
+    
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and include_archived(self.request):
+            page = as_instances(ProcessAssessment, page)
+            for assessment in page:
+                assessment.assessed_by = self.request.user
+        return page
     
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return ProcessAssessmentListSerializer
         return ProcessAssessmentSerializer
+    
+    def list(self, request, *args, **kwargs):
+        rows = None
+        if settings.FAST_LIST_ENABLED and not include_archived(request):
+            rows = RowSerializer.compile(self.get_serializer())
+        if rows is None:
+            return super().list(request, *args, **kwargs)
+        
+        # Same output as the list serializer, built from tuples without model instances
+        page = self.paginate_queryset(rows.rows(self.filter_queryset(self.get_queryset())))
+        return self.get_paginated_response(rows.serialize(page))
 
 
-class ProcessAssessmentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProcessAssessmentDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a process assessment"""
     serializer_class = ProcessAssessmentSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -48,16 +101,85 @@ class ProcessAssessmentDetailView(generics.RetrieveUpdateDestroyAPIView):
         return ProcessAssessment.objects.filter(assessed_by=self.request.user)
 
 
-class AssessmentReportListCreateView(generics.ListCreateAPIView):
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def assessment_ranking(request):
+    """Top-K assessments by savings, score or savings per effort week"""
+    query = AssessmentRankingQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    params = query.validated_data
+    
+    if params['scope'] == 'organization' and not has_organization_access(request.user):
+        return Response(
+            {'error': 'Only managers and admins can rank across the organization'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    sort = params['sort']
+    queryset = ProcessAssessment.objects.for_scope(request.user, params['scope']).filter(
+        **{f'{sort}__isnull': False}
+    )
+    for field in ['department', 'priority', 'automation_suitability']:
+        if field in params:
+            queryset = queryset.filter(**{field: params[field]})
+    
+    # Pick the ids from the ranking index alone, then load just those rows and the columns rendered
+    ids = list(queryset.order_by(f'-{sort}', '-id').values_list('id', flat=True)[:params['limit']])
+    serializer = ProcessAssessmentRankingSerializer(context={'request': request})
+    rows = optimize_queryset(ProcessAssessment.objects.all(), serializer).in_bulk(ids)
+    ranked = [rows[assessment_id] for assessment_id in ids if assessment_id in rows]
+    
+    data = ProcessAssessmentRankingSerializer(ranked, many=True, context={'request': request}).data
+    for rank, row in enumerate(data, start=1):
+        row['rank'] = rank
+    return Response({'sort': sort, 'count': len(data), 'results': data})
+
+
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, NDJSONRenderer])
+@permission_classes([permissions.IsAuthenticated])
+def export_assessments(request):
+    """NDJSON stream of assessments by (updated_at, id), filtered by ?updated_since= and resumable with ?cursor="""
+    state = export_state(request, 'assessments')
+    if state['scope'] == 'organization' and not has_organization_access(request.user):
+        return Response(
+            {'error': 'Only managers and admins can export the organization'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    sources = [(ProcessAssessment.objects.for_scope(request.user, state['scope']), False)]
+    if state['archived']:
+        archived = ArchivedProcessAssessment.objects.all()
+        if state['scope'] == 'mine':
+            archived = archived.filter(assessed_by=request.user)
+        sources.append((archived, True))
+    serializer = export_serializer(ProcessAssessmentSerializer, request, state)
+    return stream_export('assessments', sources, serializer, 'updated_at', state)
+
+
+class AssessmentReportListCreateView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     """List all reports or create a new one"""
     serializer_class = AssessmentReportSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         return AssessmentReport.objects.filter(generated_by=self.request.user)
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        # Members come back as ids, as with ?expand= on the detail endpoint: rendering each of a
+        # 100,000-assessment report's members would cost far more than writing the membership
+        context = {**self.get_serializer_context(), 'fieldset': {'expand': []}}
+        report = optimize_queryset(
+            AssessmentReport.objects.filter(pk=serializer.instance.pk), self.get_serializer(context=context)
+        ).get()
+        data = self.get_serializer(report, context=context).data
+        return Response(data, status=status.HTTP_201_CREATED, headers=self.get_success_headers(data))
 
 
-class AssessmentReportDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AssessmentReportDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a report"""
     serializer_class = AssessmentReportSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -70,23 +192,51 @@ class AssessmentReportDetailView(generics.RetrieveUpdateDestroyAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def dashboard_stats(request):
     """Get dashboard statistics"""
-    user_assessments = ProcessAssessment.objects.filter(assessed_by=request.user)
-    
-    stats = {
-        'total_processes': user_assessments.count(),
-        'highly_automatable': user_assessments.filter(automation_suitability='highly_automatable').count(),
-        'possibly_automatable': user_assessments.filter(automation_suitability='possibly_automatable').count(),
-        'not_suitable': user_assessments.filter(automation_suitability='not_suitable').count(),
-        'average_score': user_assessments.aggregate(avg_score=Avg('total_score'))['avg_score'] or 0,
-        'total_estimated_savings': user_assessments.aggregate(
-            total_savings=Sum('estimated_cost_savings')
-        )['total_savings'] or 0,
-    }
+    # Precomputed overnight and cached while the user's assessments are unchanged
+    stats = user_dashboard_stats(request.user)
     
     serializer = ProcessAssessmentStatsSerializer(stats)
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def organization_stats(request):
+    """Organization-wide totals with a row per department, for managers and admins"""
+    if not has_organization_access(request.user):
+        return Response(
+            {'error': 'Only managers and admins can view organization statistics'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    summaries = department_summaries()
+    data = {**organization_summary(summaries), 'departments': summaries}
+    return Response(OrganizationSummarySerializer(data, context={'request': request}).data)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def department_stats(request):
+    """One department's aggregates (?department=, default the user's profile department), for managers and admins"""
+    if not has_organization_access(request.user):
+        return Response(
+            {'error': 'Only managers and admins can view department statistics'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    department = request.query_params.get('department')
+    if department is None:
+        profile = getattr(request.user, 'userprofile', None)
+        department = profile.department if profile else None
+    if not department:
+        return Response({'error': 'department is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    summary = next((summary for summary in department_summaries() if summary.department == department), None)
+    if summary is None:
+        return Response({'error': 'No assessments for this department'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(DepartmentSummarySerializer(summary, context={'request': request}).data)
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def bulk_assessment(request):
@@ -108,39 +258,23 @@ def generate_ai_conclusion(request, report_id):
     try:
         report = AssessmentReport.objects.get(id=report_id, generated_by=request.user)
         
-        # Simple AI conclusion generation based on statistics
-        highly_automatable = report.highly_automatable_count
-        possibly_automatable = report.possibly_automatable_count
-        not_suitable = report.not_suitable_count
-        total = highly_automatable + possibly_automatable + not_suitable
+        # Rebuilt only when the report's suitability counts changed since the last run
+        conclusion, regenerated = refresh_conclusion(report)
         
-        if total == 0:
-            conclusion = "No processes have been assessed yet."
-        else:
-            conclusion = f"""Based on this assessment, {highly_automatable} processes are highly automatable, {possibly_automatable} are partially automatable, and {not_suitable} should remain manual. 
-
-Prioritization should focus on high-impact areas to maximize efficiency and cost savings. 
-
-Key Recommendations:
-- Immediately implement automation for highly automatable processes ({highly_automatable}/{total} = {(highly_automatable/total*100):.1f}%)
-- Consider semi-automation for processes with medium scores
-- Continue manual operations for complex processes requiring human judgment
-
-Expected Benefits:
-- Reduced manual errors and processing time
-- Improved consistency and standardization
-- Cost savings through reduced labor requirements
-- Enhanced employee satisfaction by eliminating repetitive tasks"""
-        
-        report.ai_conclusion = conclusion
-        report.save()
-        
-        return Response({'ai_conclusion': conclusion})
+        return Response({'ai_conclusion': conclusion, 'regenerated': regenerated})
     
     except AssessmentReport.DoesNotExist:
         return Response({'error': 'Report not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def refresh_ai_conclusions(request):
+    """Bring the AI conclusions of all the user's reports up to date"""
+    result = refresh_report_conclusions(AssessmentReport.objects.filter(generated_by=request.user))
+    return Response(result)
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def download_report_csv(request, report_id):
@@ -151,29 +285,31 @@ def download_report_csv(request, report_id):
         response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = f'attachment; filename="{report.title}_report.csv"'
         
-        writer = csv.writer(response)
-        writer.writerow([
-            'Process Name', 'Department', 'Repetitiveness', 'Rule-Based', 'Complexity',
-            'Volume', 'Standardization', 'Error Rate', 'Total Score',
-            'Automation Suitability', 'Priority', 'Recommendation'
-        ])
-        
-        for assessment in report.assessments.all():
+        with EXPORT_SECONDS.time(format='csv'):
+            writer = csv.writer(response)
             writer.writerow([
-                assessment.process_name,
-                assessment.department,
-                assessment.repetitiveness_score,
-                assessment.rule_based_score,
-                assessment.complexity_score,
-                assessment.volume_score,
-                assessment.standardization_score,
-                assessment.current_errors_score,
-                assessment.total_score,
-                assessment.automation_suitability_display,
-                assessment.priority_display,
-                assessment.recommendation
+                'Process Name', 'Department', 'Repetitiveness', 'Rule-Based', 'Complexity',
+                'Volume', 'Standardization', 'Error Rate', 'Total Score',
+                'Automation Suitability', 'Priority', 'Recommendation'
             ])
         
+            for assessment in report.assessments.all():
+                writer.writerow([
+                    assessment.process_name,
+                    assessment.department,
+                    assessment.repetitiveness_score,
+                    assessment.rule_based_score,
+                    assessment.complexity_score,
+                    assessment.volume_score,
+                    assessment.standardization_score,
+                    assessment.current_errors_score,
+                    assessment.total_score,
+                    assessment.automation_suitability_display,
+                    assessment.priority_display,
+                    assessment.recommendation
+                ])
+        
+        
         return response
     
     except AssessmentReport.DoesNotExist:
@@ -187,81 +323,22 @@ def download_report_pdf(request, report_id):
     try:
         report = AssessmentReport.objects.get(id=report_id, generated_by=request.user)
         
-        # Create PDF
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        elements = []
-        
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.darkblue,
-            spaceAfter=30,
-        )
-        
-        # Title
-        elements.append(Paragraph(f"Process Automation Feasibility and Prioritization Report", title_style))
-        elements.append(Paragraph(f"Report: {report.title}", styles['Heading2']))
-        elements.append(Paragraph(f"Generated: {timezone.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
-        elements.append(Spacer(1, 20))
-        
-        # Summary
-        elements.append(Paragraph("Summary", styles['Heading2']))
-        summary_text = f"""
-        Total Processes Assessed: {report.assessments.count()}<br/>
-        Highly Automatable: {report.highly_automatable_count}<br/>
-        Possibly Automatable: {report.possibly_automatable_count}<br/>
-        Not Suitable for Automation: {report.not_suitable_count}
-        """
-        elements.append(Paragraph(summary_text, styles['Normal']))
-        elements.append(Spacer(1, 20))
-        
-        # Assessment Table
-        elements.append(Paragraph("Detailed Assessment", styles['Heading2']))
+        # Serve the stored PDF while the report is unchanged (see tasks.report_pdfs)
+        digest = report_pdf_fingerprint(report)
+        pdf = stored_report_pdf(report.id, digest)
         
-        table_data = [
-            ['Process Name', 'Repetitiveness', 'Rule-Based', 'Complexity', 'Volume', 'Standardization', 'Error Rate', 'Total Score', 'Suitability']
-        ]
+        def render():
+            with track_job(request.user.id, 'report_pdf', report_id=report.id) as job:
+                pdf = render_report_pdf(report)
+                store_report_pdf(report.id, digest, pdf)
+                job.result = {'bytes': len(pdf)}
+                return pdf
         
-        for assessment in report.assessments.all():
-            table_data.append([
-                assessment.process_name,
-                str(assessment.repetitiveness_score),
-                str(assessment.rule_based_score),
-                str(assessment.complexity_score),
-                str(assessment.volume_score),
-                str(assessment.standardization_score),
-                str(assessment.current_errors_score),
-                str(assessment.total_score),
-                assessment.automation_suitability_display
-            ])
-        
-        table = Table(table_data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 20))
-        
-        # AI Conclusion
-        if report.ai_conclusion:
-            elements.append(Paragraph("AI-Generated Conclusion", styles['Heading2']))
-            elements.append(Paragraph(report.ai_conclusion, styles['Normal']))
+        # Identical concurrent downloads share one render
+        if pdf is None:
+            pdf = single_flight('report_pdf', (digest,), render)
         
-        doc.build(elements)
-        
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(pdf, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="{report.title}_report.pdf"'
         
         return response
@@ -270,8 +347,202 @@ def download_report_pdf(request, report_id):
         return Response({'error': 'Report not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class ProcessCategoryListCreateView(generics.ListCreateAPIView):
+class ProcessCategoryListCreateView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     """List all categories or create a new one"""
     queryset = ProcessCategory.objects.all()
     serializer_class = ProcessCategorySerializer
     permission_classes = [permissions.IsAuthenticated]
+
+
+class ScoringRuleSetListCreateView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
+    """List scoring rule set versions or add a new (inactive) one"""
+    queryset = ScoringRuleSet.objects.all()
+    serializer_class = ScoringRuleSetSerializer
+    permission_classes = [IsAdminRole]
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminRole])
+def activate_scoring_rules(request, version):
+    """Activate a scoring rule set version and re-score every assessment"""
+    try:
+        rule_set = ScoringRuleSet.objects.get(version=version)
+    except ScoringRuleSet.DoesNotExist:
+        return Response({'error': 'Scoring rule set not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    updated = rule_set.activate()
+    return Response({
+        'rule_set': ScoringRuleSetSerializer(rule_set).data,
+        'rescored_assessments': updated
+    })
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def simulate_scoring_rules(request):
+    """Preview how candidate weights and thresholds would reclassify assessments, without saving"""
+    serializer = ScoringSimulationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    
+    if data['scope'] == 'organization' and not has_organization_access(request.user):
+        return Response(
+            {'error': 'Only managers and admins can simulate across the organization'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    scope_key = 'organization' if data['scope'] == 'organization' else f'user:{request.user.id}'
+    queryset = ProcessAssessment.objects.for_scope(request.user, data['scope'])
+    return Response(simulate(scope_key, queryset, data['rules'], data['changed_limit']))
+
+
+def _portfolio_job_horizon():
+    """Jobs queued before this are forgotten"""
+    return timezone.now() - timedelta(seconds=settings.PORTFOLIO_JOB_TIMEOUT)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def optimize_automation_portfolio(request):
+    """Pick the assessments that maximize savings within an implementation effort budget"""
+    serializer = PortfolioOptimizationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    
+    if data['scope'] == 'organization' and not has_organization_access(request.user):
+        return Response(
+            {'error': 'Only managers and admins can optimize across the organization'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    options = [data['budget_weeks'], data['objective'], data.get('priorities'), data['limit']]
+    
+    if data['background']:
+        # Imported here so web workers only load Celery when a job is queued
+        from kombu.exceptions import OperationalError
+        from .tasks import optimize_portfolio_task
+        try:
+            result = optimize_portfolio_task.delay(request.user.id, data['scope'], *options)
+        except OperationalError:
+            return Response(
+                {'error': 'Background processing is unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        # Recorded in the database, so whichever worker serves the poll can check ownership
+        PortfolioJob.objects.create(task_id=result.id, user=request.user)
+        PortfolioJob.objects.filter(created_at__lt=_portfolio_job_horizon()).delete()
+        return Response({'task_id': result.id, 'status': result.status}, status=status.HTTP_202_ACCEPTED)
+    
+    queryset = ProcessAssessment.objects.for_scope(request.user, data['scope'])
+    candidates = candidate_queryset(queryset, data['objective'], data.get('priorities')).count()
+    if candidates > settings.PORTFOLIO_SYNC_MAX_CANDIDATES:
+        return Response(
+            {'error': f'{candidates} candidates exceed the interactive limit of '
+                      f'{settings.PORTFOLIO_SYNC_MAX_CANDIDATES}; resubmit with "background": true'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(optimize_portfolio(queryset, *options))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def portfolio_job_status(request, task_id):
+    """Status and, once finished, result of a background portfolio optimization"""
+    jobs = PortfolioJob.objects.filter(task_id=task_id, user=request.user, created_at__gte=_portfolio_job_horizon())
+    if not jobs.exists():
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    from automation_ai.celery import app
+    result = app.AsyncResult(task_id)
+    data = {'task_id': task_id, 'status': result.status}
+    if result.successful():
+        data['result'] = result.result
+    elif result.failed():
+        data['error'] = 'Portfolio optimization failed'
+    return Response(data)
+
+
+class DuplicateCandidateListView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """Near-duplicate assessment pairs; managers and admins see the whole organization"""
+    serializer_class = DuplicateCandidateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        user = self.request.user
+        # The assessments and their assessors are joined by SparseFieldsetViewMixin when they are rendered
+        queryset = DuplicateCandidate.objects.filter(status=self.request.query_params.get('status', 'open'))
+        if not has_organization_access(user):
+            queryset = queryset.filter(Q(assessment__assessed_by=user) | Q(duplicate__assessed_by=user))
+        return queryset
+
+
+def _get_resolvable_candidate(request, candidate_id):
+    """The open candidate, if the user may resolve it: managers/admins, or the owner of both assessments"""
+    candidate = DuplicateCandidate.objects.select_related('assessment', 'duplicate').filter(
+        pk=candidate_id, status='open'
+    ).first()
+    if candidate is None:
+        return None
+    owners = {candidate.assessment.assessed_by_id, candidate.duplicate.assessed_by_id}
+    if has_organization_access(request.user) or owners == {request.user.id}:
+        return candidate
+    return None
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def detect_duplicates(request):
+    """Queue a duplicate detection pass over all assessments"""
+    if not has_organization_access(request.user):
+        return Response(
+            {'error': 'Only managers and admins can run duplicate detection'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    from kombu.exceptions import OperationalError
+    from .tasks import detect_duplicates_task
+    try:
+        result = detect_duplicates_task.delay(request.user.id)
+    except OperationalError:
+        return Response(
+            {'error': 'Background processing is unavailable'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    return Response({'task_id': result.id, 'status': result.status}, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def merge_duplicate_candidate(request, candidate_id):
+    """Merge one assessment of a duplicate pair into the other"""
+    candidate = _get_resolvable_candidate(request, candidate_id)
+    if candidate is None:
+        return Response({'error': 'Duplicate candidate not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    keep = request.data.get('keep', 'assessment')
+    if keep not in ('assessment', 'duplicate'):
+        return Response(
+            {'error': "keep must be 'assessment' or 'duplicate'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    kept, removed_id = merge_duplicate(candidate, keep)
+    return Response({
+        'assessment': ProcessAssessmentSerializer(kept).data,
+        'removed_assessment_id': removed_id
+    })
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def dismiss_duplicate_candidate(request, candidate_id):
+    """Mark a pair as not duplicates; later detection passes keep it dismissed"""
+    candidate = _get_resolvable_candidate(request, candidate_id)
+    if candidate is None:
+        return Response({'error': 'Duplicate candidate not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    candidate.status = 'dismissed'
+    candidate.resolved_by = request.user
+    candidate.resolved_at = timezone.now()
+    candidate.save(update_fields=['status', 'resolved_by', 'resolved_at'])
+    return Response(DuplicateCandidateSerializer(candidate).data)